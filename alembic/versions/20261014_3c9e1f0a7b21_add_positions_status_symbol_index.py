@@ -0,0 +1,27 @@
+"""add positions (status, symbol) index
+
+Revision ID: 3c9e1f0a7b21
+Revises:
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "3c9e1f0a7b21"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables created by create_tables() already carry the index
+    op.create_index(
+        "ix_positions_status_symbol",
+        "positions",
+        ["status", "symbol"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_positions_status_symbol", table_name="positions", if_exists=True)
@@ -0,0 +1,29 @@
+"""add positions (status, updated_at) index
+
+Revision ID: 5f7a9c1e3b42
+Revises: 8d2b4e6f1a90
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "5f7a9c1e3b42"
+down_revision = "8d2b4e6f1a90"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables created by create_tables() already carry the index
+    op.create_index(
+        "ix_positions_status_updated_at",
+        "positions",
+        ["status", "updated_at"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_positions_status_updated_at", table_name="positions", if_exists=True
+    )
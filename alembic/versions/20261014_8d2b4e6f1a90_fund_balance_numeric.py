@@ -0,0 +1,32 @@
+"""store daily_journal.fund_balance_inr as numeric(12, 2)
+
+Revision ID: 8d2b4e6f1a90
+Revises: 3c9e1f0a7b21
+Create Date: 2026-10-14
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "8d2b4e6f1a90"
+down_revision = "3c9e1f0a7b21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("daily_journal") as batch:
+        batch.alter_column(
+            "fund_balance_inr",
+            existing_type=sa.Float(),
+            type_=sa.Numeric(12, 2),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("daily_journal") as batch:
+        batch.alter_column(
+            "fund_balance_inr",
+            existing_type=sa.Numeric(12, 2),
+            type_=sa.Float(),
+        )
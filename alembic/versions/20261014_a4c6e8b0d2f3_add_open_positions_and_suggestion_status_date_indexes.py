@@ -0,0 +1,40 @@
+"""add partial open-positions index and trade_suggestions (status, date) index
+
+Revision ID: a4c6e8b0d2f3
+Revises: 5f7a9c1e3b42
+Create Date: 2026-10-14
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a4c6e8b0d2f3"
+down_revision = "5f7a9c1e3b42"
+branch_labels = None
+depends_on = None
+
+# SQLAlchemy's Enum stores member names
+_OPEN_ONLY = sa.text("status = 'OPEN'")
+
+
+def upgrade() -> None:
+    # Tables created by create_tables() already carry both indexes
+    op.create_index(
+        "ix_positions_open",
+        "positions",
+        ["status"],
+        postgresql_where=_OPEN_ONLY,
+        sqlite_where=_OPEN_ONLY,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_sugg_status_date",
+        "trade_suggestions",
+        ["status", "date"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sugg_status_date", table_name="trade_suggestions", if_exists=True)
+    op.drop_index("ix_positions_open", table_name="positions", if_exists=True)
@@ -0,0 +1,58 @@
+"""add generated positions.is_open and index the open set on it
+
+Revision ID: a5c7e9b1d3f6
+Revises: f3a5b7c9d1e4
+Create Date: 2026-10-14
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a5c7e9b1d3f6"
+down_revision = "f3a5b7c9d1e4"
+branch_labels = None
+depends_on = None
+
+
+def _is_open_index() -> None:
+    # Same predicate `.where(Position.is_open)` renders on each dialect
+    op.create_index(
+        "ix_positions_open",
+        "positions",
+        ["is_open"],
+        postgresql_where=sa.text("is_open"),
+        sqlite_where=sa.text("is_open = 1"),
+    )
+
+
+def _has_is_open() -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns("positions")
+    return any(c["name"] == "is_open" for c in columns)
+
+
+def upgrade() -> None:
+    op.drop_index("ix_positions_open", table_name="positions", if_exists=True)
+    # Tables created by create_tables() already carry the column
+    if not _has_is_open():
+        # SQLite cannot ADD a stored generated column; batch mode rebuilds the table
+        with op.batch_alter_table("positions", recreate="auto") as batch:
+            batch.add_column(
+                sa.Column(
+                    "is_open",
+                    sa.Boolean(),
+                    sa.Computed("status = 'open'", persisted=True),
+                )
+            )
+    _is_open_index()
+
+
+def downgrade() -> None:
+    op.drop_index("ix_positions_open", table_name="positions", if_exists=True)
+    if _has_is_open():
+        with op.batch_alter_table("positions") as batch:
+            batch.drop_column("is_open")
+    where = sa.text("status = 'open'")
+    op.create_index(
+        "ix_positions_open", "positions", ["status"],
+        postgresql_where=where, sqlite_where=where,
+    )
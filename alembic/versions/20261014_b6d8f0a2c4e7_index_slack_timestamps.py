@@ -0,0 +1,38 @@
+"""index positions.slack_thread_ts, make trade_suggestions.slack_ts unique
+
+Revision ID: b6d8f0a2c4e7
+Revises: a5c7e9b1d3f6
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "b6d8f0a2c4e7"
+down_revision = "a5c7e9b1d3f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_positions_slack_thread_ts",
+        "positions",
+        ["slack_thread_ts"],
+        if_not_exists=True,
+    )
+    # Each suggestion is its own Slack message; the lookup index becomes unique
+    op.drop_index("ix_trade_suggestions_slack_ts", table_name="trade_suggestions")
+    op.create_index(
+        "ix_trade_suggestions_slack_ts",
+        "trade_suggestions",
+        ["slack_ts"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trade_suggestions_slack_ts", table_name="trade_suggestions")
+    op.create_index(
+        "ix_trade_suggestions_slack_ts", "trade_suggestions", ["slack_ts"]
+    )
+    op.drop_index("ix_positions_slack_thread_ts", table_name="positions", if_exists=True)
@@ -0,0 +1,45 @@
+"""server-side defaults for created_at / updated_at
+
+Revision ID: c1e3a5b7d9f2
+Revises: a4c6e8b0d2f3
+Create Date: 2026-10-14
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "c1e3a5b7d9f2"
+down_revision = "a4c6e8b0d2f3"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = {
+    "trade_suggestions": ["created_at"],
+    "positions": ["created_at", "updated_at"],
+    "signal_performance": ["updated_at"],
+    "daily_journal": ["created_at", "updated_at"],
+}
+
+
+def _utcnow() -> sa.TextClause:
+    # Same SQL as src.db.models.utcnow, frozen here for the migration
+    if op.get_bind().dialect.name == "postgresql":
+        return sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)")
+    return sa.text("CURRENT_TIMESTAMP")
+
+
+def _set_defaults(default) -> None:
+    for table, columns in _COLUMNS.items():
+        with op.batch_alter_table(table) as batch:
+            for column in columns:
+                batch.alter_column(
+                    column, existing_type=sa.DateTime(), server_default=default
+                )
+
+
+def upgrade() -> None:
+    _set_defaults(_utcnow())
+
+
+def downgrade() -> None:
+    _set_defaults(None)
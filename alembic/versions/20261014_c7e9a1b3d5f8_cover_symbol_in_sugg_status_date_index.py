@@ -0,0 +1,26 @@
+"""add symbol to ix_sugg_status_date so the pending-symbols lookup is index-only
+
+Revision ID: c7e9a1b3d5f8
+Revises: b6d8f0a2c4e7
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "c7e9a1b3d5f8"
+down_revision = "b6d8f0a2c4e7"
+branch_labels = None
+depends_on = None
+
+
+def _recreate(columns: list[str]) -> None:
+    op.drop_index("ix_sugg_status_date", table_name="trade_suggestions", if_exists=True)
+    op.create_index("ix_sugg_status_date", "trade_suggestions", columns)
+
+
+def upgrade() -> None:
+    _recreate(["status", "date", "symbol"])
+
+
+def downgrade() -> None:
+    _recreate(["status", "date"])
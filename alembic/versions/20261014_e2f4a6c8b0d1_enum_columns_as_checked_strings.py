@@ -0,0 +1,85 @@
+"""store status / exit_reason enums as checked strings
+
+Revision ID: e2f4a6c8b0d1
+Revises: c1e3a5b7d9f2
+Create Date: 2026-10-14
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "e2f4a6c8b0d1"
+down_revision = "c1e3a5b7d9f2"
+branch_labels = None
+depends_on = None
+
+# (table, column, PostgreSQL enum type, allowed values) — frozen from src.db.models.
+# Every member's name is its value upper-cased, so upper()/lower() converts the data.
+_COLUMNS = [
+    ("trade_suggestions", "status", "suggestionstatus",
+     ("pending", "executed", "skipped", "expired")),
+    ("positions", "status", "positionstatus", ("open", "closed")),
+    ("positions", "exit_reason", "exitreason",
+     ("target_hit", "stop_hit", "manual", "trailing", "expired")),
+]
+
+
+def _open_index(value: str) -> None:
+    where = sa.text(f"status = '{value}'")
+    op.create_index(
+        "ix_positions_open", "positions", ["status"],
+        postgresql_where=where, sqlite_where=where,
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    postgres = bind.dialect.name == "postgresql"
+    insp = sa.inspect(bind)
+    op.drop_index("ix_positions_open", table_name="positions", if_exists=True)
+
+    for table, column, enum_type, values in _COLUMNS:
+        # Tables created by create_tables() already carry the checked string
+        checks = {c["name"] for c in insp.get_check_constraints(table)}
+        if f"ck_{table}_{column}" in checks:
+            continue
+        types = {c["name"]: c["type"] for c in insp.get_columns(table)}
+        if not postgres:
+            op.execute(f"UPDATE {table} SET {column} = lower({column})")
+        allowed = ", ".join(f"'{v}'" for v in values)
+        with op.batch_alter_table(table) as batch:
+            if not postgres or isinstance(types[column], sa.Enum):
+                batch.alter_column(
+                    column,
+                    type_=sa.String(16),
+                    postgresql_using=f"lower({column}::text)",
+                )
+            batch.create_check_constraint(
+                f"ck_{table}_{column}", f"{column} IN ({allowed})"
+            )
+        if postgres:
+            op.execute(f"DROP TYPE IF EXISTS {enum_type}")
+
+    _open_index("open")
+
+
+def downgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    op.drop_index("ix_positions_open", table_name="positions", if_exists=True)
+
+    for table, column, enum_type, values in reversed(_COLUMNS):
+        names = tuple(v.upper() for v in values)
+        if postgres:
+            sa.Enum(*names, name=enum_type).create(op.get_bind())
+        with op.batch_alter_table(table) as batch:
+            batch.drop_constraint(f"ck_{table}_{column}", type_="check")
+            batch.alter_column(
+                column,
+                type_=sa.Enum(*names, name=enum_type, create_type=False),
+                existing_type=sa.String(16),
+                postgresql_using=f"upper({column})::{enum_type}",
+            )
+        if not postgres:
+            op.execute(f"UPDATE {table} SET {column} = upper({column})")
+
+    _open_index("OPEN")
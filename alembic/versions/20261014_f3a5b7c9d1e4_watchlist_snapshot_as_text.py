@@ -0,0 +1,58 @@
+"""store daily_journal.watchlist_snapshot as comma-separated text
+
+Revision ID: f3a5b7c9d1e4
+Revises: e2f4a6c8b0d1
+Create Date: 2026-10-14
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "f3a5b7c9d1e4"
+down_revision = "e2f4a6c8b0d1"
+branch_labels = None
+depends_on = None
+
+_JOURNAL = sa.table(
+    "daily_journal", sa.column("id", sa.Integer), sa.column("watchlist_snapshot", sa.Text)
+)
+
+
+def _rewrite(convert) -> None:
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(_JOURNAL.c.id, _JOURNAL.c.watchlist_snapshot).where(
+            _JOURNAL.c.watchlist_snapshot.is_not(None)
+        )
+    ).all()
+    for row in rows:
+        bind.execute(
+            _JOURNAL.update()
+            .where(_JOURNAL.c.id == row.id)
+            .values(watchlist_snapshot=convert(row.watchlist_snapshot))
+        )
+
+
+def upgrade() -> None:
+    # JSON → its text form, then '["A", "B"]' → 'A,B'
+    with op.batch_alter_table("daily_journal") as batch:
+        batch.alter_column(
+            "watchlist_snapshot",
+            type_=sa.Text(),
+            existing_type=sa.JSON(),
+            postgresql_using="watchlist_snapshot::text",
+        )
+    _rewrite(lambda text: ",".join(json.loads(text) or []))
+
+
+def downgrade() -> None:
+    _rewrite(lambda text: json.dumps(text.split(",") if text else []))
+    with op.batch_alter_table("daily_journal") as batch:
+        batch.alter_column(
+            "watchlist_snapshot",
+            type_=sa.JSON(),
+            existing_type=sa.Text(),
+            postgresql_using="watchlist_snapshot::json",
+        )
@@ -0,0 +1,107 @@
+"""
+Whole-watchlist indicator pass on Polars.
+
+Stacks every symbol's bars into one long frame and computes each indicator
+as a windowed expression `.over("symbol")`, so the work runs on Polars'
+multithreaded engine instead of one kernel call per symbol. Seeding matches
+`signals._kernels` (and therefore pandas_ta): EMA/ATR start from the SMA of
+their first `n` values, RSI's Wilder smoothing starts from the first diff,
+and series too short for an indicator come back all-NaN.
+
+Signal rules still run per symbol: the arrays computed here are handed to
+the existing signals through a pre-filled `IndicatorBundle`. Enabled with
+`settings.screener_engine = "polars"`.
+"""
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+_EPSILON = float(np.finfo(float).eps)
+_OHLCV = ("open", "high", "low", "close", "volume")
+
+
+def _stack(frames: dict[str, pd.DataFrame]) -> pl.LazyFrame:
+    parts = [
+        pl.DataFrame(
+            {"symbol": symbol}
+            | {c: df[c].to_numpy(dtype=np.float64) for c in _OHLCV}
+        )
+        for symbol, df in frames.items()
+    ]
+    return pl.concat(parts).lazy()
+
+
+def _sma_seeded(x: pl.Expr, n: int) -> pl.Expr:
+    """pandas_ta seeding: null before n-1, SMA of the first n at n-1, raw after."""
+    idx = pl.int_range(pl.len())
+    return (
+        pl.when(idx < n - 1).then(None)
+        .when(idx == n - 1).then(x.head(n).mean())
+        .otherwise(x)
+    )
+
+
+def _expr(name: str) -> pl.Expr:
+    kind, _, length = name.rpartition("_")
+    n = int(length)
+    close = pl.col("close")
+
+    if kind == "ema":
+        expr = _sma_seeded(close, n).ewm_mean(alpha=2.0 / (n + 1), adjust=False)
+        return expr.over("symbol").alias(name)
+
+    if kind == "vol_ma":
+        return pl.col("volume").rolling_mean(n).over("symbol").alias(name)
+
+    if kind == "rsi":
+        diff = close.diff()
+        gain = diff.clip(lower_bound=0.0).ewm_mean(alpha=1.0 / n, adjust=False)
+        loss = (-diff).clip(lower_bound=0.0).ewm_mean(alpha=1.0 / n, adjust=False)
+        expr = pl.when(pl.len() > n).then(100.0 * gain / (gain + loss))
+        return expr.over("symbol").alias(name)
+
+    if kind == "atr":
+        high, low = pl.col("high"), pl.col("low")
+        hl = high - low
+        # pandas_ta nudges the whole high-low range by epsilon if any bar is flat
+        hl = pl.when((hl == 0).any()).then(hl + _EPSILON).otherwise(hl)
+        prev_close = close.shift(1)
+        tr = pl.max_horizontal(
+            hl.abs(), (high - prev_close).abs(), (prev_close - low).abs()
+        )
+        smoothed = _sma_seeded(tr, n).ewm_mean(alpha=1.0 / n, adjust=False)
+        return pl.when(pl.len() > n).then(smoothed).over("symbol").alias(name)
+
+    raise KeyError(f"Unknown indicator kind: {kind}")
+
+
+def compute_indicators(
+    frames: dict[str, pd.DataFrame], names: Iterable[str]
+) -> dict[str, dict[str, np.ndarray]]:
+    """
+    Indicator arrays for every symbol in one pass, keyed symbol → name.
+    Arrays are float32 aligned with each frame's rows (nulls become NaN),
+    matching what the kernels return for `Bars`; the pass itself runs in float64.
+    Empty frames are skipped.
+    """
+    frames = {s: df for s, df in frames.items() if not df.empty}
+    names = sorted(set(names))
+    if not frames or not names:
+        return {}
+
+    out = _stack(frames).select([_expr(name) for name in names]).collect()
+    columns = {
+        name: out[name].cast(pl.Float32).fill_null(np.nan).to_numpy()
+        for name in names
+    }
+
+    result: dict[str, dict[str, np.ndarray]] = {}
+    offset = 0
+    for symbol, df in frames.items():
+        end = offset + len(df)
+        result[symbol] = {name: col[offset:end] for name, col in columns.items()}
+        offset = end
+    return result
@@ -6,21 +6,29 @@ returns ranked candidates with composite scores.
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence
 
+import numpy as np
+import pandas as pd
 
+from src.analysis.signals.bars import Bars
 from src.analysis.signals.base import BaseSignal, SignalResult
 from src.analysis.signals.ema_crossover import EMACrossoverSignal
+from src.analysis.signals.indicators import IndicatorBundle
 from src.analysis.signals.rsi import RSIDivergenceSignal
 from src.analysis.signals.support_resistance import SupportResistanceSignal
 from src.analysis.signals.volume import VolumeBreakoutSignal
 from src.broker.base import BrokerBase
 from src.config import get_settings
+from src.market.ohlcv_cache import CachedOHLCVProvider
+
+__all__ = ["Screener", "ScreenerResult", "reload_settings"]
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScreenerResult:
     symbol: str
     direction: str
@@ -34,19 +42,142 @@ class ScreenerResult:
 
 
 def _build_signals() -> list[BaseSignal]:
+    # Cheapest first: a direction conflict stops evaluation early (see _screen_one)
     return [
+        VolumeBreakoutSignal(),
         EMACrossoverSignal(),
-        RSIDivergenceSignal(),
         SupportResistanceSignal(),
-        VolumeBreakoutSignal(),
+        RSIDivergenceSignal(),
     ]
 
 
+# Which signal's price levels win a strength tie: the order signals were
+# evaluated in before they ran cheapest first. Unlisted signals rank last.
+_LEVEL_PRIORITY = {
+    name: rank
+    for rank, name in enumerate(
+        (
+            EMACrossoverSignal.name,
+            RSIDivergenceSignal.name,
+            SupportResistanceSignal.name,
+            VolumeBreakoutSignal.name,
+        )
+    )
+}
+
+
+def _level_rank(result: SignalResult) -> tuple[float, int]:
+    """Sort key for the signal that sets entry/target/stop: strongest, then priority."""
+    return result.strength, -_LEVEL_PRIORITY.get(result.signal_name, len(_LEVEL_PRIORITY))
+
+
+# Signals hold only their parameters, so every Screener shares one set.
+_SIGNALS: tuple[BaseSignal, ...] = tuple(_build_signals())
+_SETTINGS = get_settings()
+
+
+def reload_settings() -> None:
+    """Re-read settings from the environment; Screeners built afterwards see them."""
+    global _SETTINGS
+    get_settings.cache_clear()
+    _SETTINGS = get_settings()
+
+
+# Per-symbol outcome codes returned by _screen_one — drive the run summary log.
+_OK = "ok"
+_INSUFFICIENT = "insufficient"
+_NO_SIGNAL = "no_signal"
+_CONSENSUS = "consensus"
+
+
+def _screen_one(
+    signals: Sequence[BaseSignal],
+    weights: Mapping[str, float],
+    symbol: str,
+    df: pd.DataFrame,
+    precomputed: Optional[dict[str, np.ndarray]] = None,
+) -> tuple[Optional[ScreenerResult], str, list[str]]:
+    """
+    Run every signal against one symbol's history. `weights` must have an
+    entry for every signal's name (see Screener._weight_by_name).
+    `precomputed` seeds the indicator bundle (see polars_pipeline).
+    Returns (result, reason_code, signals_that_failed_rr_validation).
+    """
+    rr_failed: list[str] = []
+    if df.empty or len(df) < 80:
+        logger.debug(f"{symbol}: insufficient data ({len(df)} bars, need 80), skipping")
+        return None, _INSUFFICIENT, rr_failed
+
+    # One array conversion per symbol; indicators are computed on first use
+    # and shared by every signal
+    bars = Bars.from_frame(df)
+    indicators = IndicatorBundle(bars, precomputed)
+    # Consensus, weighted composite and best signal are tracked as signals fire
+    fired: list[SignalResult] = []
+    best: Optional[SignalResult] = None
+    weight_sum = 0.0
+    weighted_strength = 0.0
+    for signal in signals:
+        try:
+            result = signal.analyze(bars, symbol, indicators)
+            if result is None:
+                continue
+            if signal.is_valid(result):
+                # All fired signals must agree on direction — stop at the first conflict
+                if best is not None and result.direction != best.direction:
+                    logger.info(
+                        f"{symbol}: conflicting signal directions "
+                        f"{{'{best.direction}', '{result.direction}'}}, skipping"
+                    )
+                    return None, _CONSENSUS, rr_failed
+                fired.append(result)
+                weight = weights[signal.name]
+                weight_sum += weight
+                weighted_strength += result.strength * weight
+                # Highest strength sets the price levels; _LEVEL_PRIORITY breaks ties
+                if best is None or _level_rank(result) > _level_rank(best):
+                    best = result
+            else:
+                logger.debug(
+                    f"{symbol} [{signal.name}]: fired but failed validation "
+                    f"(R:R={result.risk_reward:.2f}, strength={result.strength:.2f})"
+                )
+                rr_failed.append(signal.name)
+        except Exception as e:
+            logger.warning(f"Signal {signal.name} failed for {symbol}: {e}")
+
+    if best is None:
+        return None, _NO_SIGNAL, rr_failed
+
+    composite = weighted_strength / max(weight_sum, 1)
+
+    return (
+        ScreenerResult(
+            symbol=symbol,
+            direction=best.direction,
+            composite_score=round(composite, 3),
+            entry=best.entry,
+            target=best.target,
+            stop_loss=best.stop_loss,
+            risk_reward=best.risk_reward,
+            signals_fired=[s.to_dict() for s in fired],
+            timeframe=best.timeframe,
+        ),
+        _OK,
+        rr_failed,
+    )
+
+
 class Screener:
     def __init__(self, broker: BrokerBase):
         self.broker = broker
-        self.signals = _build_signals()
-        self.settings = get_settings()
+        self.signals = _SIGNALS
+        self.settings = _SETTINGS
+        self.history = CachedOHLCVProvider(broker)
+        # Resolved once so the per-symbol loop needs no .get() fallbacks
+        self._weight_by_name: Mapping[str, float] = MappingProxyType({
+            s.name: self.settings.signal_weights.get(s.name, 1.0) for s in self.signals
+        })
 
     def run(
         self,
@@ -57,6 +188,9 @@ class Screener:
         Screen all symbols, run signals, compute weighted composite score,
         and return results sorted by score descending.
 
+        History for the whole watchlist is fetched up front (see
+        `_fetch_history`) so broker latency is paid once, not per symbol.
+
         `to_date` defaults to now. Pass `datetime.combine(date.today(),
         datetime.min.time())` when calling during market hours to exclude
         today's incomplete candle from signal calculations.
@@ -64,8 +198,6 @@ class Screener:
         symbols = self.settings.watchlist if symbols is None else symbols
         if not symbols:
             return []
-        weights = self.settings.signal_weights
-        results: list[ScreenerResult] = []
 
         to_date = to_date or datetime.now()
         from_date = to_date - timedelta(days=120)
@@ -75,89 +207,71 @@ class Screener:
         if hasattr(self.broker, "warm_instrument_cache"):
             self.broker.warm_instrument_cache(symbols)
 
+        frames = self._fetch_history(symbols, from_date, to_date)
+        if hasattr(self.broker, "get_stats"):
+            logger.debug(f"Broker historical limiter: {self.broker.get_stats()}")
+        precomputed = self._precompute_indicators(frames)
+
         n_fetch_error = 0
-        n_insufficient = 0
-        n_no_signal = 0
+        counts = {_INSUFFICIENT: 0, _NO_SIGNAL: 0, _CONSENSUS: 0}
         n_rr_fail: dict[str, int] = {}
-        n_consensus = 0
+        results: list[ScreenerResult] = []
 
         for symbol in symbols:
-            try:
-                df = self.broker.get_historical_data(
-                    symbol,
-                    interval="day",
-                    from_date=from_date,
-                    to_date=to_date,
-                )
-                if df.empty or len(df) < 80:
-                    logger.debug(f"{symbol}: insufficient data ({len(df)} bars, need 80), skipping")
-                    n_insufficient += 1
-                    continue
-            except Exception as e:
-                logger.warning(f"Failed to fetch data for {symbol}: {e}")
+            df = frames.get(symbol)
+            if df is None:
                 n_fetch_error += 1
                 continue
-
-            fired: list[SignalResult] = []
-            for signal in self.signals:
-                try:
-                    result = signal.analyze(df, symbol)
-                    if result is None:
-                        continue
-                    if signal.is_valid(result):
-                        fired.append(result)
-                    else:
-                        logger.debug(
-                            f"{symbol} [{signal.name}]: fired but failed validation "
-                            f"(R:R={result.risk_reward:.2f}, strength={result.strength:.2f})"
-                        )
-                        n_rr_fail[signal.name] = n_rr_fail.get(signal.name, 0) + 1
-                except Exception as e:
-                    logger.warning(f"Signal {signal.name} failed for {symbol}: {e}")
-
-            if not fired:
-                n_no_signal += 1
-                continue
-
-            # All fired signals must agree on direction (no conflicting signals)
-            directions = {s.direction for s in fired}
-            if len(directions) > 1:
-                logger.info(
-                    f"{symbol}: conflicting signal directions {directions}, skipping"
-                )
-                n_consensus += 1
-                continue
-
-            direction = fired[0].direction
-
-            # Weighted composite score
-            total_weight = sum(weights.get(s.signal_name, 1.0) for s in fired)
-            composite = sum(
-                s.strength * weights.get(s.signal_name, 1.0) for s in fired
-            ) / max(total_weight, 1)
-
-            # Use the signal with highest strength for price levels
-            best = max(fired, key=lambda s: s.strength)
-
-            results.append(
-                ScreenerResult(
-                    symbol=symbol,
-                    direction=direction,
-                    composite_score=round(composite, 3),
-                    entry=best.entry,
-                    target=best.target,
-                    stop_loss=best.stop_loss,
-                    risk_reward=best.risk_reward,
-                    signals_fired=[s.to_dict() for s in fired],
-                    timeframe=best.timeframe,
-                )
+            result, reason, rr_failed = _screen_one(
+                self.signals, self._weight_by_name, symbol, df, precomputed.get(symbol)
             )
+            for name in rr_failed:
+                n_rr_fail[name] = n_rr_fail.get(name, 0) + 1
+            if result is None:
+                counts[reason] += 1
+            else:
+                results.append(result)
 
         results.sort(key=lambda r: r.composite_score, reverse=True)
         rr_summary = ", ".join(f"{k}={v}" for k, v in n_rr_fail.items()) or "0"
         logger.info(
             f"Screener found {len(results)} setups from {len(symbols)} symbols — "
-            f"fetch_errors={n_fetch_error}, insufficient_bars={n_insufficient}, "
-            f"no_signal={n_no_signal}, rr_fail={rr_summary}, consensus_conflict={n_consensus}"
+            f"fetch_errors={n_fetch_error}, insufficient_bars={counts[_INSUFFICIENT]}, "
+            f"no_signal={counts[_NO_SIGNAL]}, rr_fail={rr_summary}, "
+            f"consensus_conflict={counts[_CONSENSUS]}"
         )
         return results
+
+    def _fetch_history(
+        self, symbols: list[str], from_date: datetime, to_date: datetime
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Daily history for every symbol in one pass. Warm symbols come from the
+        on-disk cache; only their missing tail is requested from the broker.
+        Symbols that could not be fetched are absent from the result.
+        """
+        return self.history.get_historical_data_bulk(
+            symbols,
+            interval="day",
+            from_date=from_date,
+            to_date=to_date,
+        )
+
+    def _precompute_indicators(
+        self, frames: dict[str, pd.DataFrame]
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """
+        With `screener_engine = "polars"`, compute every signal's indicators
+        for the whole watchlist in one Polars pass. Otherwise (or if that
+        fails) return nothing and let each symbol's bundle compute lazily.
+        """
+        if self.settings.screener_engine != "polars":
+            return {}
+        names = set().union(*(s.required_indicators() for s in self.signals))
+        try:
+            from src.analysis.polars_pipeline import compute_indicators
+
+            return compute_indicators(frames, names)
+        except Exception as e:
+            logger.warning(f"Polars indicator pass failed ({e}); computing per symbol")
+            return {}
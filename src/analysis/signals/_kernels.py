@@ -0,0 +1,135 @@
+"""
+Compiled indicator kernels.
+
+Scalar loops over float arrays, compiled with numba when it is available.
+Without numba the recursive smoothing runs through pandas' C `ewm` instead
+of an interpreted loop; everything else runs as plain Python. Seeding
+mirrors pandas_ta exactly (SMA warm-up at index `n - 1` for EMA/ATR, Wilder
+smoothing from the first diff for RSI) so results match `ta.ema` /
+`ta.rsi` / `ta.atr` to float precision.
+
+Outputs take the input's dtype (float32 from `Bars`, float64 elsewhere);
+the recursive state is carried in float64 either way so rounding does not
+accumulate. Inputs are assumed free of NaNs (broker candles always are).
+Frames shorter than an indicator needs come back all-NaN, where pandas_ta
+returns None.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover — numba ships with pandas-ta
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+
+_EPSILON = np.finfo(float).eps
+
+
+@njit(cache=True)
+def _smoothed(x: np.ndarray, start: int, alpha: float, out: np.ndarray) -> None:
+    """ewm(alpha, adjust=False) of x[start:], seeded with out[start] = x[start]."""
+    prev = x[start]
+    out[start] = prev
+    for i in range(start + 1, len(x)):
+        prev = (1.0 - alpha) * prev + alpha * x[i]
+        out[i] = prev
+
+
+if not HAVE_NUMBA:
+    import pandas as pd
+
+    def _smoothed(  # noqa: F811
+        x: np.ndarray, start: int, alpha: float, out: np.ndarray
+    ) -> None:
+        smoothed = pd.Series(x[start:]).ewm(alpha=alpha, adjust=False).mean()
+        out[start:] = smoothed.to_numpy()
+
+
+@njit(cache=True)
+def ema(x: np.ndarray, n: int) -> np.ndarray:
+    """pandas_ta EMA: SMA of the first `n` values, then alpha = 2 / (n + 1)."""
+    out = np.full_like(x, np.nan)
+    if n < 1 or len(x) < n:
+        return out
+    seeded = x.copy()
+    seeded[n - 1] = x[:n].mean()
+    _smoothed(seeded, n - 1, 2.0 / (n + 1), out)
+    return out
+
+
+@njit(cache=True)
+def wilder_ema(x: np.ndarray, n: int) -> np.ndarray:
+    """pandas_ta RMA: ewm(alpha = 1 / n, adjust=False), seeded with x[0]."""
+    out = np.full_like(x, np.nan)
+    if n < 1 or len(x) < n:
+        return out
+    _smoothed(x, 0, 1.0 / n, out)
+    return out
+
+
+@njit(cache=True)
+def rsi(close: np.ndarray, n: int) -> np.ndarray:
+    out = np.full_like(close, np.nan)
+    if n < 1 or len(close) < n + 1:
+        return out
+    m = len(close) - 1
+    gain = np.empty(m)
+    loss = np.empty(m)
+    for i in range(m):
+        d = close[i + 1] - close[i]
+        gain[i] = d if d > 0 else 0.0
+        loss[i] = -d if d < 0 else 0.0
+    avg_gain = wilder_ema(gain, n)
+    avg_loss = wilder_ema(loss, n)
+    for i in range(m):
+        denom = avg_gain[i] + avg_loss[i]
+        out[i + 1] = 100.0 * avg_gain[i] / denom if denom != 0 else np.nan
+    return out
+
+
+@njit(cache=True)
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    hl = high - low
+    # pandas_ta nudges the whole high-low range by epsilon if any bar is flat
+    for i in range(len(hl)):
+        if hl[i] == 0:
+            hl += _EPSILON
+            break
+    out = np.empty(len(hl))
+    if len(hl) == 0:
+        return out
+    out[0] = abs(hl[0])
+    for i in range(1, len(hl)):
+        pc = close[i - 1]
+        out[i] = max(abs(hl[i]), abs(high[i] - pc), abs(pc - low[i]))
+    return out
+
+
+@njit(cache=True)
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, n: int) -> np.ndarray:
+    """pandas_ta ATR: true range, SMA-seeded at index n - 1, then Wilder smoothing."""
+    out = np.full_like(close, np.nan)
+    if n < 1 or len(close) < n + 1:
+        return out
+    tr = true_range(high, low, close)
+    tr[n - 1] = tr[:n].mean()
+    _smoothed(tr, n - 1, 1.0 / n, out)
+    return out
+
+
+@njit(cache=True)
+def rolling_mean(x: np.ndarray, n: int) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    if n < 1:
+        return out
+    for i in range(n - 1, len(x)):
+        out[i] = x[i - n + 1 : i + 1].sum() / n
+    return out
@@ -0,0 +1,54 @@
+"""
+Struct-of-arrays view of an OHLCV frame.
+
+The screener converts each symbol's DataFrame once; signals and indicator
+kernels then read contiguous float32 arrays instead of going through
+pandas indexing for every scalar.
+"""
+
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Bars:
+    ts: np.ndarray  # int64 epoch nanoseconds (UTC), ascending
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dtype: type = np.float32) -> "Bars":
+        """
+        Prices are stored as float32 by default: the indicator passes are
+        memory-bound and signal outputs are rounded to paise anyway.
+        """
+
+        def col(name: str) -> np.ndarray:
+            return np.ascontiguousarray(df[name].to_numpy(dtype=dtype))
+
+        return cls(
+            ts=df.index.to_numpy(dtype="datetime64[ns]").view(np.int64),
+            open=col("open"),
+            high=col("high"),
+            low=col("low"),
+            close=col("close"),
+            volume=col("volume"),
+        )
+
+    @classmethod
+    def coerce(cls, data: Union["Bars", pd.DataFrame]) -> "Bars":
+        """Accept either form so callers holding a DataFrame keep working."""
+        return data if isinstance(data, cls) else cls.from_frame(data)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+# Signals accept either; DataFrames are converted with Bars.coerce
+BarsLike = Union[Bars, pd.DataFrame]
@@ -1,16 +1,19 @@
 """
 Base signal contract.  Every signal returns a SignalResult or None.
-Signals never talk to a broker or DB — they only consume a DataFrame.
+Signals never talk to a broker or DB — they only consume OHLCV bars.
 """
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Optional
 
-import pandas as pd
+import numpy as np
 
+from src.analysis.signals.bars import BarsLike
+from src.analysis.signals.indicators import IndicatorBundle
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SignalResult:
     signal_name: str
     direction: str  # "BUY" | "SELL"
@@ -20,16 +23,26 @@ class SignalResult:
     stop_loss: float
     timeframe: str  # "daily" | "weekly"
     details: dict = field(default_factory=dict)  # Signal-specific metadata
+    # Derived once in __post_init__ (read by is_valid, to_dict and logging)
+    risk_reward: float = field(init=False, repr=False, compare=False)
+    _sign: int = field(init=False, repr=False, compare=False)  # +1 BUY, -1 SELL
 
-    @property
-    def risk_reward(self) -> float:
-        if self.direction == "BUY":
-            reward = self.target - self.entry
-            risk = self.entry - self.stop_loss
-        else:
-            reward = self.entry - self.target
-            risk = self.stop_loss - self.entry
-        return round(reward / risk, 2) if risk > 0 else 0.0
+    def __post_init__(self) -> None:
+        # Signals compute on float32 bars; store plain floats so results stay
+        # JSON-serialisable (signals_fired is a JSON column)
+        for name in ("strength", "entry", "target", "stop_loss"):
+            object.__setattr__(self, name, float(getattr(self, name)))
+        object.__setattr__(self, "details", {
+            k: v.item() if isinstance(v, np.generic) else v
+            for k, v in self.details.items()
+        })
+        sign = 1 if self.direction == "BUY" else -1
+        reward = sign * (self.target - self.entry)
+        risk = sign * (self.entry - self.stop_loss)
+        object.__setattr__(self, "_sign", sign)
+        object.__setattr__(
+            self, "risk_reward", round(reward / risk, 2) if risk > 0 else 0.0
+        )
 
     def to_dict(self) -> dict:
         return {
@@ -54,13 +67,27 @@ class BaseSignal(ABC):
     name: str
     min_risk_reward: float = 2.0
 
+    def required_indicators(self) -> set[str]:
+        """
+        Indicator names (see `IndicatorBundle`) this signal reads, so the
+        screener can compute the union once per symbol.
+        """
+        return set()
+
     @abstractmethod
-    def analyze(self, df: pd.DataFrame, symbol: str) -> Optional[SignalResult]:
+    def analyze(
+        self,
+        bars: BarsLike,
+        symbol: str,
+        indicators: Optional[IndicatorBundle] = None,
+    ) -> Optional[SignalResult]:
         """
         Analyze OHLCV data and return a SignalResult if conditions are met.
         Return None if no valid setup exists.
-        `df` is expected to have columns: open, high, low, close, volume
-        indexed by datetime, sorted ascending.
+        `bars` is a Bars bundle, or a DataFrame with columns open, high, low,
+        close, volume indexed by datetime, sorted ascending.
+        `indicators` must have been built from the same bars; a private
+        bundle is created when omitted.
         """
 
     def is_valid(self, result: Optional[SignalResult]) -> bool:
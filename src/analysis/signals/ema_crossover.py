@@ -11,10 +11,10 @@ Stop   : Below/above the swing low/high before crossover
 
 from typing import Optional
 
-import pandas as pd
-import pandas_ta as ta
 
+from src.analysis.signals.bars import Bars, BarsLike
 from src.analysis.signals.base import BaseSignal, SignalResult
+from src.analysis.signals.indicators import IndicatorBundle
 
 
 class EMACrossoverSignal(BaseSignal):
@@ -32,51 +32,58 @@ class EMACrossoverSignal(BaseSignal):
         self.atr_period = atr_period
         self.atr_target_mult = atr_target_multiplier
 
-    def analyze(self, df: pd.DataFrame, symbol: str) -> Optional[SignalResult]:
-        if len(df) < self.slow + 5:
-            return None
+    def required_indicators(self) -> set[str]:
+        return {f"ema_{self.fast}", f"ema_{self.slow}", f"atr_{self.atr_period}"}
 
-        df = df.copy()
-        df["ema_fast"] = ta.ema(df["close"], length=self.fast)
-        df["ema_slow"] = ta.ema(df["close"], length=self.slow)
-        df["atr"] = ta.atr(df["high"], df["low"], df["close"], length=self.atr_period)
+    def analyze(
+        self,
+        bars: BarsLike,
+        symbol: str,
+        indicators: Optional[IndicatorBundle] = None,
+    ) -> Optional[SignalResult]:
+        bars = Bars.coerce(bars)
+        if len(bars) < self.slow + 5:
+            return None
 
-        last = df.iloc[-1]
-        prev = df.iloc[-2]
+        indicators = indicators or IndicatorBundle(bars)
+        ema_fast = indicators[f"ema_{self.fast}"]
+        ema_slow = indicators[f"ema_{self.slow}"]
 
         # Detect crossover in the last candle
         bullish_cross = (
-            prev["ema_fast"] <= prev["ema_slow"]
-            and last["ema_fast"] > last["ema_slow"]
-            and last["close"] > last["ema_fast"]
+            ema_fast[-2] <= ema_slow[-2]
+            and ema_fast[-1] > ema_slow[-1]
+            and bars.close[-1] > ema_fast[-1]
         )
 
         bearish_cross = (
-            prev["ema_fast"] >= prev["ema_slow"]
-            and last["ema_fast"] < last["ema_slow"]
-            and last["close"] < last["ema_fast"]
+            ema_fast[-2] >= ema_slow[-2]
+            and ema_fast[-1] < ema_slow[-1]
+            and bars.close[-1] < ema_fast[-1]
         )
 
         if not bullish_cross and not bearish_cross:
             return None
 
-        atr = last["atr"]
-        close = last["close"]
+        # Scalars as Python floats: bars and indicators are float32
+        atr = float(indicators[f"atr_{self.atr_period}"][-1])
+        close = float(bars.close[-1])
+        fast, slow = float(ema_fast[-1]), float(ema_slow[-1])
 
         if bullish_cross:
             # Swing low = lowest low of last 5 candles before signal
-            swing_low = df["low"].iloc[-6:-1].min()
+            swing_low = float(bars.low[-6:-1].min())
             stop_loss = round(swing_low - 0.5 * atr, 2)
             target = round(close + self.atr_target_mult * atr, 2)
             direction = "BUY"
         else:
-            swing_high = df["high"].iloc[-6:-1].max()
+            swing_high = float(bars.high[-6:-1].max())
             stop_loss = round(swing_high + 0.5 * atr, 2)
             target = round(close - self.atr_target_mult * atr, 2)
             direction = "SELL"
 
         # Strength: how clean is the crossover gap?
-        gap_pct = abs(last["ema_fast"] - last["ema_slow"]) / last["ema_slow"]
+        gap_pct = abs(fast - slow) / slow
         strength = min(
             1.0, gap_pct * 50
         )  # Normalised; crossovers >2% gap → strength 1.0
@@ -90,8 +97,8 @@ class EMACrossoverSignal(BaseSignal):
             stop_loss=stop_loss,
             timeframe="daily",
             details={
-                "ema_fast": round(last["ema_fast"], 2),
-                "ema_slow": round(last["ema_slow"], 2),
+                "ema_fast": round(fast, 2),
+                "ema_slow": round(slow, 2),
                 "atr": round(atr, 2),
                 "gap_pct": round(gap_pct * 100, 2),
             },
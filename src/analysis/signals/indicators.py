@@ -0,0 +1,84 @@
+"""
+Per-symbol indicator bundle shared by all signals.
+
+Several signals need the same series (ATR(14) is used by three of them),
+so the screener builds one bundle per symbol and hands it to each signal
+instead of letting every signal recompute its own. Indicators are named
+`<kind>_<length>` — e.g. "ema_20", "atr_14", "rsi_14", "vol_ma_20" — and
+stored as float arrays aligned with the bars. The arithmetic
+lives in `_kernels` (numba, pandas_ta-compatible seeding).
+"""
+
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.analysis.signals import _kernels
+from src.analysis.signals.bars import Bars, BarsLike
+
+logger = logging.getLogger(__name__)
+
+
+def _warmup(kind: str, length: int) -> int:
+    """Index of the first non-NaN value each kernel produces."""
+    if kind == "rsi":
+        return 1  # Wilder smoothing starts from the first diff
+    return length - 1
+
+
+def _compute(bars: Bars, kind: str, length: int) -> np.ndarray:
+    if kind == "ema":
+        return _kernels.ema(bars.close, length)
+    if kind == "rsi":
+        return _kernels.rsi(bars.close, length)
+    if kind == "atr":
+        return _kernels.atr(bars.high, bars.low, bars.close, length)
+    if kind == "vol_ma":
+        return _kernels.rolling_mean(bars.volume, length)
+    raise KeyError(f"Unknown indicator kind: {kind}")
+
+
+class IndicatorBundle:
+    """
+    Lazily computed, memoised indicator arrays for one symbol's bars.
+    `prepare()` computes a batch up front; `bundle[name]` computes on first access.
+    """
+
+    def __init__(
+        self, bars: BarsLike, values: Optional[dict[str, np.ndarray]] = None
+    ):
+        """`values` pre-fills indicators computed elsewhere (e.g. the Polars pass)."""
+        self.bars = Bars.coerce(bars)
+        self._values: dict[str, np.ndarray] = dict(values or {})
+
+    def prepare(self, names: Iterable[str]) -> "IndicatorBundle":
+        for name in names:
+            self[name]
+        return self
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        values = self._values.get(name)
+        if values is None:
+            kind, _, length = name.rpartition("_")
+            values = _compute(self.bars, kind, int(length))
+            self._values[name] = values
+        return values
+
+    def first_valid(self, *names: str) -> int:
+        """
+        First row where every named indicator is defined — the rows a
+        `dropna()` would keep are `[first_valid:]`, given NaN-free bars.
+        """
+        start = 0
+        for name in names:
+            kind, _, length = name.rpartition("_")
+            start = max(start, _warmup(kind, int(length)))
+        if logger.isEnabledFor(logging.DEBUG):
+            for name in names:
+                if np.isnan(self[name][start:]).any():
+                    logger.debug(f"{name} has NaNs past warm-up index {start}")
+        return start
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
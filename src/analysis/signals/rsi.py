@@ -9,19 +9,29 @@ Uses 14-period RSI on daily chart.  Checks last 20 candles for swing pivots.
 
 from typing import Optional
 
-import pandas as pd
-import pandas_ta as ta
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+from src.analysis.signals.bars import Bars, BarsLike
 from src.analysis.signals.base import BaseSignal, SignalResult
+from src.analysis.signals.indicators import IndicatorBundle
 
 
-def _find_swing_lows(series: pd.Series, window: int = 3) -> pd.Series:
-    """Return boolean mask of swing low candles."""
-    return series == series.rolling(2 * window + 1, center=True).min()
+def _find_swing_lows(arr: np.ndarray, window: int = 3) -> np.ndarray:
+    """Return boolean mask of swing low candles (lowest of the centred window)."""
+    mask = np.zeros(len(arr), dtype=bool)
+    if len(arr) >= 2 * window + 1:
+        mins = sliding_window_view(arr, 2 * window + 1).min(axis=1)
+        mask[window : len(arr) - window] = arr[window : len(arr) - window] == mins
+    return mask
 
 
-def _find_swing_highs(series: pd.Series, window: int = 3) -> pd.Series:
-    return series == series.rolling(2 * window + 1, center=True).max()
+def _find_swing_highs(arr: np.ndarray, window: int = 3) -> np.ndarray:
+    mask = np.zeros(len(arr), dtype=bool)
+    if len(arr) >= 2 * window + 1:
+        maxs = sliding_window_view(arr, 2 * window + 1).max(axis=1)
+        mask[window : len(arr) - window] = arr[window : len(arr) - window] == maxs
+    return mask
 
 
 class RSIDivergenceSignal(BaseSignal):
@@ -41,36 +51,52 @@ class RSIDivergenceSignal(BaseSignal):
         self.overbought = overbought  # RSI above this = potential bearish div zone
         self.atr_mult = atr_target_multiplier
 
-    def analyze(self, df: pd.DataFrame, symbol: str) -> Optional[SignalResult]:
-        if len(df) < self.lookback + self.rsi_period:
+    def required_indicators(self) -> set[str]:
+        return {f"rsi_{self.rsi_period}", "atr_14"}
+
+    def analyze(
+        self,
+        bars: BarsLike,
+        symbol: str,
+        indicators: Optional[IndicatorBundle] = None,
+    ) -> Optional[SignalResult]:
+        bars = Bars.coerce(bars)
+        if len(bars) < self.lookback + self.rsi_period:
             return None
 
-        df = df.copy()
-        df["rsi"] = ta.rsi(df["close"], length=self.rsi_period)
-        df["atr"] = ta.atr(df["high"], df["low"], df["close"], length=14)
-        df = df.dropna()
+        indicators = indicators or IndicatorBundle(bars)
+        rsi = indicators[f"rsi_{self.rsi_period}"]
+        atr_arr = indicators["atr_14"]
+
+        # Scan the last `lookback` rows past the indicator warm-up
+        n = len(bars)
+        start = indicators.first_valid(f"rsi_{self.rsi_period}", "atr_14")
+        if start >= n:
+            return None
+        recent = slice(max(start, n - self.lookback), n)
+        i = n - 1
 
-        recent = df.iloc[-self.lookback :]
+        # Widen the small scan window so prices and RSI read back as float64
+        lows = bars.low[recent].astype(np.float64)
+        highs = bars.high[recent].astype(np.float64)
+        rsi_vals = rsi[recent].astype(np.float64)
 
         # ── Bullish divergence ─────────────────────────────────────────────
-        price_lows = _find_swing_lows(recent["low"])
-        rsi_vals = recent["rsi"]
-        low_idx = recent[price_lows].index.tolist()
+        low_idx = np.flatnonzero(_find_swing_lows(lows))
 
         if len(low_idx) >= 2:
             p1, p2 = low_idx[-2], low_idx[-1]
-            price_made_lower_low = recent.loc[p2, "low"] < recent.loc[p1, "low"]
-            rsi_made_higher_low = rsi_vals.loc[p2] > rsi_vals.loc[p1]
-            rsi_in_zone = rsi_vals.loc[p2] < self.oversold + 15
+            price_made_lower_low = lows[p2] < lows[p1]
+            rsi_made_higher_low = rsi_vals[p2] > rsi_vals[p1]
+            rsi_in_zone = rsi_vals[p2] < self.oversold + 15
 
             if price_made_lower_low and rsi_made_higher_low and rsi_in_zone:
-                last = df.iloc[-1]
-                atr = last["atr"]
-                close = last["close"]
-                stop_loss = round(recent.loc[p2, "low"] - 0.3 * atr, 2)
+                atr = float(atr_arr[i])
+                close = float(bars.close[i])
+                stop_loss = round(lows[p2] - 0.3 * atr, 2)
                 target = round(close + self.atr_mult * atr, 2)
                 # Strength proportional to RSI divergence magnitude
-                rsi_div = rsi_vals.loc[p2] - rsi_vals.loc[p1]
+                rsi_div = rsi_vals[p2] - rsi_vals[p1]
                 strength = min(1.0, rsi_div / 15)
                 return SignalResult(
                     signal_name=self.name,
@@ -81,30 +107,28 @@ class RSIDivergenceSignal(BaseSignal):
                     stop_loss=stop_loss,
                     timeframe="daily",
                     details={
-                        "rsi_current": round(rsi_vals.iloc[-1], 1),
-                        "rsi_p1": round(rsi_vals.loc[p1], 1),
-                        "rsi_p2": round(rsi_vals.loc[p2], 1),
+                        "rsi_current": round(rsi_vals[-1], 1),
+                        "rsi_p1": round(rsi_vals[p1], 1),
+                        "rsi_p2": round(rsi_vals[p2], 1),
                         "type": "bullish_divergence",
                     },
                 )
 
         # ── Bearish divergence ─────────────────────────────────────────────
-        price_highs = _find_swing_highs(recent["high"])
-        high_idx = recent[price_highs].index.tolist()
+        high_idx = np.flatnonzero(_find_swing_highs(highs))
 
         if len(high_idx) >= 2:
             p1, p2 = high_idx[-2], high_idx[-1]
-            price_made_higher_high = recent.loc[p2, "high"] > recent.loc[p1, "high"]
-            rsi_made_lower_high = rsi_vals.loc[p2] < rsi_vals.loc[p1]
-            rsi_in_zone = rsi_vals.loc[p2] > self.overbought - 15
+            price_made_higher_high = highs[p2] > highs[p1]
+            rsi_made_lower_high = rsi_vals[p2] < rsi_vals[p1]
+            rsi_in_zone = rsi_vals[p2] > self.overbought - 15
 
             if price_made_higher_high and rsi_made_lower_high and rsi_in_zone:
-                last = df.iloc[-1]
-                atr = last["atr"]
-                close = last["close"]
-                stop_loss = round(recent.loc[p2, "high"] + 0.3 * atr, 2)
+                atr = float(atr_arr[i])
+                close = float(bars.close[i])
+                stop_loss = round(highs[p2] + 0.3 * atr, 2)
                 target = round(close - self.atr_mult * atr, 2)
-                rsi_div = rsi_vals.loc[p1] - rsi_vals.loc[p2]
+                rsi_div = rsi_vals[p1] - rsi_vals[p2]
                 strength = min(1.0, rsi_div / 15)
                 return SignalResult(
                     signal_name=self.name,
@@ -115,9 +139,9 @@ class RSIDivergenceSignal(BaseSignal):
                     stop_loss=stop_loss,
                     timeframe="daily",
                     details={
-                        "rsi_current": round(rsi_vals.iloc[-1], 1),
-                        "rsi_p1": round(rsi_vals.loc[p1], 1),
-                        "rsi_p2": round(rsi_vals.loc[p2], 1),
+                        "rsi_current": round(rsi_vals[-1], 1),
+                        "rsi_p1": round(rsi_vals[p1], 1),
+                        "rsi_p2": round(rsi_vals[p2], 1),
                         "type": "bearish_divergence",
                     },
                 )
@@ -12,10 +12,12 @@ Stop   : Just below broken resistance (or above broken support)
 
 from typing import Optional
 
-import pandas as pd
-import pandas_ta as ta
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+from src.analysis.signals.bars import Bars, BarsLike
 from src.analysis.signals.base import BaseSignal, SignalResult
+from src.analysis.signals.indicators import IndicatorBundle
 
 # Two levels within this % are merged into one
 _LEVEL_MERGE_THRESHOLD = 0.005  # 0.5%
@@ -26,17 +28,20 @@ _MIN_VOLUME_RATIO = 1.3
 
 
 def _cluster_levels(levels: list[float], threshold: float) -> list[float]:
-    """Merge nearby price levels into clusters."""
-    if not levels:
+    """
+    Merge nearby price levels into clusters, returned ascending.
+
+    Sorted levels start a new cluster wherever the gap to the previous level
+    exceeds `threshold` (relative); each cluster is the mean of its members.
+    """
+    a = np.sort(np.asarray(levels, dtype=np.float64))
+    if a.size == 0:
         return []
-    levels = sorted(levels)
-    clusters = [levels[0]]
-    for level in levels[1:]:
-        if (level - clusters[-1]) / clusters[-1] > threshold:
-            clusters.append(level)
-        else:
-            clusters[-1] = (clusters[-1] + level) / 2  # Average
-    return clusters
+    new_cluster = np.empty(a.size, dtype=bool)
+    new_cluster[0] = True
+    new_cluster[1:] = (a[1:] - a[:-1]) / a[:-1] > threshold
+    group = np.cumsum(new_cluster) - 1
+    return (np.bincount(group, weights=a) / np.bincount(group)).tolist()
 
 
 class SupportResistanceSignal(BaseSignal):
@@ -52,94 +57,109 @@ class SupportResistanceSignal(BaseSignal):
         self.pivot_win = pivot_window
         self.atr_mult = atr_target_multiplier
 
-    def analyze(self, df: pd.DataFrame, symbol: str) -> Optional[SignalResult]:
-        if len(df) < self.lookback + 20:
+    def required_indicators(self) -> set[str]:
+        return {"atr_14", "vol_ma_20"}
+
+    def analyze(
+        self,
+        bars: BarsLike,
+        symbol: str,
+        indicators: Optional[IndicatorBundle] = None,
+    ) -> Optional[SignalResult]:
+        bars = Bars.coerce(bars)
+        if len(bars) < self.lookback + 20:
             return None
 
-        df = df.copy()
-        df["atr"] = ta.atr(df["high"], df["low"], df["close"], length=14)
-        df["vol_ma20"] = df["volume"].rolling(20).mean()
-        df = df.dropna()
+        indicators = indicators or IndicatorBundle(bars)
+        atr_arr = indicators["atr_14"]
+        vol_ma = indicators["vol_ma_20"]
 
-        recent = df.iloc[-self.lookback :]
-        last = df.iloc[-1]
-        close = last["close"]
-        atr = last["atr"]
-        vol_ratio = last["volume"] / last["vol_ma20"] if last["vol_ma20"] > 0 else 0
+        # Pivots come from the last `lookback` rows past the indicator warm-up
+        n = len(bars)
+        start = indicators.first_valid("atr_14", "vol_ma_20")
+        if start >= n:
+            return None
+        recent = slice(max(start, n - self.lookback), n)
+        i = n - 1
+        # Scalars as Python floats: bars and indicators are float32
+        close = float(bars.close[i])
+        atr = float(atr_arr[i])
+        vol_ratio = float(bars.volume[i] / vol_ma[i]) if vol_ma[i] > 0 else 0
+        # Both breakout directions need volume confirmation
+        if vol_ratio < _MIN_VOLUME_RATIO:
+            return None
 
         # ── Gather pivot highs and lows ─────────────────────────────────────
         w = self.pivot_win
-        swing_highs = [
-            recent["high"].iloc[i]
-            for i in range(w, len(recent) - w)
-            if recent["high"].iloc[i] == recent["high"].iloc[i - w : i + w + 1].max()
-        ]
-        swing_lows = [
-            recent["low"].iloc[i]
-            for i in range(w, len(recent) - w)
-            if recent["low"].iloc[i] == recent["low"].iloc[i - w : i + w + 1].min()
-        ]
-
-        resistance_levels = _cluster_levels(swing_highs, _LEVEL_MERGE_THRESHOLD)
-        support_levels = _cluster_levels(swing_lows, _LEVEL_MERGE_THRESHOLD)
+        hi = bars.high[recent]
+        lo = bars.low[recent]
+        swing_highs: list[float] = []
+        swing_lows: list[float] = []
+        if len(hi) >= 2 * w + 1:
+            hi_c, lo_c = hi[w : len(hi) - w], lo[w : len(lo) - w]
+            is_pivot_high = hi_c == sliding_window_view(hi, 2 * w + 1).max(axis=1)
+            is_pivot_low = lo_c == sliding_window_view(lo, 2 * w + 1).min(axis=1)
+            swing_highs = hi_c[is_pivot_high].tolist()
+            swing_lows = lo_c[is_pivot_low].tolist()
+
+        resistance_levels = np.asarray(_cluster_levels(swing_highs, _LEVEL_MERGE_THRESHOLD))
+        support_levels = np.asarray(_cluster_levels(swing_lows, _LEVEL_MERGE_THRESHOLD))
 
         # ── Breakout above resistance ───────────────────────────────────────
-        for resistance in reversed(resistance_levels):
-            if (
-                close > resistance * (1 + _BREAKOUT_THRESHOLD)
-                and vol_ratio >= _MIN_VOLUME_RATIO
-            ):
-                # Target = next resistance level above, or ATR-based
-                next_targets = [r for r in resistance_levels if r > close]
-                target = (
-                    min(next_targets)
-                    if next_targets
-                    else round(close + self.atr_mult * atr, 2)
-                )
-                stop = round(resistance - 0.5 * atr, 2)
-                strength = min(1.0, (vol_ratio - _MIN_VOLUME_RATIO) / 2 + 0.5)
-                return SignalResult(
-                    signal_name=self.name,
-                    direction="BUY",
-                    strength=round(strength, 3),
-                    entry=round(close, 2),
-                    target=round(target, 2),
-                    stop_loss=stop,
-                    timeframe="daily",
-                    details={
-                        "broken_level": round(resistance, 2),
-                        "vol_ratio": round(vol_ratio, 2),
-                        "type": "resistance_breakout",
-                    },
-                )
+        # Levels are ascending: break the highest resistance below the close
+        broken = np.flatnonzero(close > resistance_levels * (1 + _BREAKOUT_THRESHOLD))
+        if broken.size:
+            resistance = float(resistance_levels[broken[-1]])
+            # Target = next resistance level above, or ATR-based
+            next_targets = resistance_levels[resistance_levels > close]
+            target = (
+                float(next_targets.min())
+                if next_targets.size
+                else round(close + self.atr_mult * atr, 2)
+            )
+            stop = round(resistance - 0.5 * atr, 2)
+            strength = min(1.0, (vol_ratio - _MIN_VOLUME_RATIO) / 2 + 0.5)
+            return SignalResult(
+                signal_name=self.name,
+                direction="BUY",
+                strength=round(strength, 3),
+                entry=round(close, 2),
+                target=round(target, 2),
+                stop_loss=stop,
+                timeframe="daily",
+                details={
+                    "broken_level": round(resistance, 2),
+                    "vol_ratio": round(vol_ratio, 2),
+                    "type": "resistance_breakout",
+                },
+            )
 
         # ── Breakdown below support ────────────────────────────────────────
-        for support in support_levels:
-            if (
-                close < support * (1 - _BREAKOUT_THRESHOLD)
-                and vol_ratio >= _MIN_VOLUME_RATIO
-            ):
-                next_targets = [s for s in support_levels if s < close]
-                target = (
-                    max(next_targets)
-                    if next_targets
-                    else round(close - self.atr_mult * atr, 2)
-                )
-                stop = round(support + 0.5 * atr, 2)
-                strength = min(1.0, (vol_ratio - _MIN_VOLUME_RATIO) / 2 + 0.5)
-                return SignalResult(
-                    signal_name=self.name,
-                    direction="SELL",
-                    strength=round(strength, 3),
-                    entry=round(close, 2),
-                    target=round(target, 2),
-                    stop_loss=stop,
-                    timeframe="daily",
-                    details={
-                        "broken_level": round(support, 2),
-                        "vol_ratio": round(vol_ratio, 2),
-                        "type": "support_breakdown",
-                    },
-                )
+        # Lowest support above the close, matching the ascending scan it replaces
+        broken = np.flatnonzero(close < support_levels * (1 - _BREAKOUT_THRESHOLD))
+        if broken.size:
+            support = float(support_levels[broken[0]])
+            next_targets = support_levels[support_levels < close]
+            target = (
+                float(next_targets.max())
+                if next_targets.size
+                else round(close - self.atr_mult * atr, 2)
+            )
+            stop = round(support + 0.5 * atr, 2)
+            strength = min(1.0, (vol_ratio - _MIN_VOLUME_RATIO) / 2 + 0.5)
+            return SignalResult(
+                signal_name=self.name,
+                direction="SELL",
+                strength=round(strength, 3),
+                entry=round(close, 2),
+                target=round(target, 2),
+                stop_loss=stop,
+                timeframe="daily",
+                details={
+                    "broken_level": round(support, 2),
+                    "vol_ratio": round(vol_ratio, 2),
+                    "type": "support_breakdown",
+                },
+            )
 
         return None
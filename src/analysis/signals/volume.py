@@ -12,10 +12,9 @@ Stop   : Low of the signal candle (BUY) / High of signal candle (SELL)
 
 from typing import Optional
 
-import pandas as pd
-import pandas_ta as ta
-
+from src.analysis.signals.bars import Bars, BarsLike
 from src.analysis.signals.base import BaseSignal, SignalResult
+from src.analysis.signals.indicators import IndicatorBundle
 
 _MIN_VOLUME_MULTIPLIER = 2.0
 _MIN_BODY_RATIO = 0.60  # Body must be 60%+ of (high - low)
@@ -34,41 +33,54 @@ class VolumeBreakoutSignal(BaseSignal):
         self.atr_per = atr_period
         self.atr_mult = atr_target_multiplier
 
-    def analyze(self, df: pd.DataFrame, symbol: str) -> Optional[SignalResult]:
-        if len(df) < self.vol_ma + 5:
+    def required_indicators(self) -> set[str]:
+        return {f"vol_ma_{self.vol_ma}", f"atr_{self.atr_per}"}
+
+    def analyze(
+        self,
+        bars: BarsLike,
+        symbol: str,
+        indicators: Optional[IndicatorBundle] = None,
+    ) -> Optional[SignalResult]:
+        bars = Bars.coerce(bars)
+        if len(bars) < self.vol_ma + 5:
             return None
 
-        df = df.copy()
-        df["vol_ma"] = df["volume"].rolling(self.vol_ma).mean()
-        df["atr"] = ta.atr(df["high"], df["low"], df["close"], length=self.atr_per)
-        df = df.dropna()
+        indicators = indicators or IndicatorBundle(bars)
+        vol_ma = indicators[f"vol_ma_{self.vol_ma}"]
+        atr_arr = indicators[f"atr_{self.atr_per}"]
 
-        last = df.iloc[-1]
-        vol_ratio = last["volume"] / last["vol_ma"] if last["vol_ma"] > 0 else 0
+        i = len(bars) - 1
+        if indicators.first_valid(f"vol_ma_{self.vol_ma}", f"atr_{self.atr_per}") > i:
+            return None
+        # Scalars as Python floats: bars and indicators are float32
+        vol_ratio = float(bars.volume[i] / vol_ma[i]) if vol_ma[i] > 0 else 0
 
         if vol_ratio < _MIN_VOLUME_MULTIPLIER:
             return None
 
-        candle_range = last["high"] - last["low"]
+        high, low, open_, close = (
+            float(bars.high[i]), float(bars.low[i]), float(bars.open[i]), float(bars.close[i])
+        )
+        candle_range = high - low
         if candle_range <= 0:
             return None
 
-        body = abs(last["close"] - last["open"])
+        body = abs(close - open_)
         body_pct = body / candle_range
 
         if body_pct < _MIN_BODY_RATIO:
             return None  # Indecisive candle (doji / hammer-like) — skip
 
-        is_bullish = last["close"] > last["open"]
-        close = last["close"]
-        atr = last["atr"]
+        is_bullish = close > open_
+        atr = float(atr_arr[i])
 
         if is_bullish:
-            stop_loss = round(last["low"] - 0.2 * atr, 2)
+            stop_loss = round(low - 0.2 * atr, 2)
             target = round(close + self.atr_mult * atr, 2)
             direction = "BUY"
         else:
-            stop_loss = round(last["high"] + 0.2 * atr, 2)
+            stop_loss = round(high + 0.2 * atr, 2)
             target = round(close - self.atr_mult * atr, 2)
             direction = "SELL"
 
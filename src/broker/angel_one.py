@@ -12,19 +12,46 @@ you scan into Google Authenticator / any TOTP app when enabling 2FA on your
 Angel One account.
 """
 
+import functools
 import logging
+import os
+import threading
 import time
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Iterator, Optional
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 import pyotp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.broker.base import BrokerBase, Instrument, Quote
 from src.config import get_settings
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover — stdlib fallback, ~2-3x slower on the master
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover — falls back to parsing the whole body
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
 # ── Interval mapping ──────────────────────────────────────────────────────────
@@ -38,9 +65,143 @@ _INTERVAL_MAP = {
     "week": "ONE_DAY",  # SmartAPI has no weekly interval; use daily
 }
 
+# getCandleData's fromdate/todate format
+_CANDLE_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+_IST = ZoneInfo("Asia/Kolkata")
+_MARKET_OPEN = dt_time(9, 15)
+_MARKET_CLOSE = dt_time(15, 30)
+
 # Angel One publishes a full instrument master at this URL (refreshed nightly).
 _INSTRUMENT_MASTER_URL = "https://margincalculator.angelbroking.com/OpenAPI_File/files/OpenAPIScripMaster.json"
 
+# The master is regenerated overnight; a cache written after this IST hour
+# today is trusted without revalidating.
+_MASTER_REFRESH_HOUR_IST = 8
+# Fields get_instrument reads; the on-disk cache keeps only these.
+_MASTER_FIELDS = ("exch_seg", "symbol", "token", "lotsize", "tick_size")
+
+# (connect, read) seconds for every Angel One HTTP call.
+_HTTP_TIMEOUT = (5, 30)
+
+# getCandleData allows 3 calls/second, so more workers than that only queue
+# on the rate limiter.
+_HIST_WORKERS = 3
+
+# getMarketData accepts at most 50 tokens per exchange in one request, and
+# allows 10 requests/second — a few batches in flight stay well inside that.
+_MARKET_DATA_BATCH = 50
+_MARKET_DATA_WORKERS = 4
+
+
+def _http_session() -> requests.Session:
+    """
+    Keep-alive session with a connection pool and retries on transient errors.
+
+    This stays on `requests` rather than an HTTP/2 `httpx.Client`: SmartConnect
+    expects `reqsession` to speak the `requests.Session` API, and the only
+    call made here directly is the single master GET, which has nothing to
+    multiplex with.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]
+        ),
+    )
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+class _TokenBucket:
+    """
+    `limit` calls per `period` seconds, refilled continuously, holding at
+    most `burst` tokens (default `limit`). Not thread-safe.
+    """
+
+    def __init__(self, limit: int, period: float, burst: Optional[int] = None):
+        self.capacity = limit if burst is None else burst
+        self.rate = limit / period
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """Refill up to `now`; seconds until a token is available (0 if one is)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        """Refill up to `now` and spend one token."""
+        self.wait_time(now)
+        self.tokens -= 1
+
+
+def _iter_master(resp: requests.Response) -> Iterator[dict]:
+    """
+    Master entries from a streamed response. With ijson the body is parsed
+    incrementally, so peak memory is one entry rather than the ~60MB payload
+    plus its parsed list.
+    """
+    if ijson is None:
+        return iter(_loads(resp.content))
+    resp.raw.decode_content = True  # undo gzip transfer encoding
+    return ijson.items(resp.raw, "item", use_float=True)
+
+
+def _master_cache_fresh(path: Path) -> bool:
+    """True if the cache file was written today (IST) after the nightly refresh."""
+    refreshed = datetime.now(_IST).replace(
+        hour=_MASTER_REFRESH_HOUR_IST, minute=0, second=0, microsecond=0
+    )
+    return datetime.fromtimestamp(path.stat().st_mtime, _IST) >= refreshed
+
+
+def _candles_frame(candles: list[list]) -> pd.DataFrame:
+    """
+    getCandleData rows `[timestamp, open, high, low, close, volume]` as an
+    OHLCV frame indexed by date. Columns are built as typed arrays rather
+    than letting pandas infer dtypes from a list of rows.
+    """
+    stamps = [c[0] for c in candles]
+    # Timestamps are ISO-8601 with one UTC offset ("2024-01-01T09:15:00+05:30");
+    # parse the local part as datetime64 and attach the offset once.
+    if len({s[19:] for s in stamps}) == 1:
+        local = np.array([s[:19] for s in stamps], dtype="datetime64[ns]")
+        index = pd.DatetimeIndex(local, name="date").tz_localize(
+            pd.Timestamp(stamps[0]).tzinfo
+        )
+    else:
+        index = pd.DatetimeIndex(pd.to_datetime(stamps, format="ISO8601"), name="date")
+
+    df = pd.DataFrame(
+        np.array([c[1:5] for c in candles], dtype=np.float64),
+        index=index,
+        columns=["open", "high", "low", "close"],
+    )
+    df["volume"] = np.fromiter((c[5] for c in candles), dtype=np.int64, count=len(candles))
+    # Candles arrive in order; only sort if they ever don't
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    return df
+
+
+def _quote_from(symbol: str, d: dict) -> Quote:
+    """Build a Quote from a getMarketData (OHLC) or ltpData payload."""
+    return Quote(
+        symbol=symbol,
+        last_price=float(d.get("ltp", 0)),
+        open=float(d.get("open", 0)),
+        high=float(d.get("high", 0)),
+        low=float(d.get("low", 0)),
+        close=float(d.get("close", 0)),
+        volume=0,  # neither OHLC mode nor ltpData returns volume
+        timestamp=datetime.now(),
+    )
+
 
 class AngelOneAdapter(BrokerBase):
     """
@@ -61,39 +222,91 @@ class AngelOneAdapter(BrokerBase):
         settings = get_settings()
         self._client_id = settings.angel_one_client_id
         self._password = settings.angel_one_password
-        self._totp_secret = settings.angel_one_totp_secret
+        # Built once; .now() per auth avoids re-decoding the base32 secret
+        self._totp = (
+            pyotp.TOTP(settings.angel_one_totp_secret)
+            if settings.angel_one_totp_secret
+            else None
+        )
         self._api_key = settings.angel_one_api_key
 
-        self._obj = SmartConnect(api_key=self._api_key)
+        # Pooled keep-alive session so TCP/TLS handshakes are paid once. The
+        # master download always uses it; SmartConnect only does through
+        # `reqsession` (1.3.8's `_request` still calls `requests.request`).
+        self._session = _http_session()
+        self._obj = SmartConnect(api_key=self._api_key, timeout=_HTTP_TIMEOUT)
+        self._obj.reqsession = self._session
         self._jwt_token: str = ""
         self._feed_token: str = ""
 
-        # In-memory instrument cache: symbol → Instrument
-        self._instruments_cache: dict[str, Instrument] = {}
-        # Full master list + O(1) index, loaded lazily
-        self._master: Optional[list[dict]] = None
+        # Bounded in-memory instrument cache keyed on (exchange, symbol).
+        # Lookups that raise (unknown symbols) are not cached.
+        self._instrument_lookup = functools.lru_cache(maxsize=4096)(self._resolve_instrument)
+        # (exchange, symbol) → token snapshot of the warmed universe, read by
+        # the candle/quote paths that only need the token
+        self._token_map: dict[tuple[str, str], int] = {}
+        # O(1) index over the instrument master, loaded lazily. The master
+        # list itself is not kept once indexed.
+        self._master_loaded: bool = False
+        cache_path = settings.angel_master_cache
+        self._master_cache_path = Path(cache_path).expanduser() if cache_path else None
         # Index: (exch_seg_upper, symbol_upper) → master entry
         self._master_index: dict[tuple[str, str], dict] = {}
-        # Guard: attempt re-auth at most once per adapter instance lifetime
-        self._reauth_attempted: bool = False
-        # Sliding-window rate limiter for historical data: Angel One allows
-        # max 3 getCandleData calls/second, 180/minute, 5000/hour.
-        self._hist_call_times: deque = deque()
-        self._hist_call_times_minute: deque = deque()
+        # Single-flight re-auth: the generation bumps on every new session, so
+        # a thread whose call failed on an older token reuses a newer one
+        # instead of logging in again (loginByPassword allows 1 call/second).
+        # Re-entrant because SmartAPI's session-expiry hook can fire mid-login.
+        self._auth_lock = threading.RLock()
+        self._auth_generation = 0
+        # Token buckets for historical data: Angel One allows max 3
+        # getCandleData calls/second, 180/minute, 5000/hour. The per-second
+        # bucket has no burst so no 1-second window ever sees more than 3.
+        self._hist_buckets = (
+            _TokenBucket(3, 1.0, burst=1),
+            _TokenBucket(180, 60.0),
+            _TokenBucket(5000, 3600.0),
+        )
+        self._hist_stats = {"calls": 0, "throttled": 0, "throttled_seconds": 0.0}
+        # The screener fetches from a thread pool; serialise the limiter so
+        # concurrent callers queue behind each other instead of overshooting.
+        self._hist_lock = threading.Lock()
 
         # Auto-authenticate if a stored token exists
         if settings.angel_one_jwt_token:
             self.set_access_token(settings.angel_one_jwt_token)
 
+        # Start loading the master now so startup work overlaps the download;
+        # the first lookup waits on _master_lock only if it is still running.
+        self._master_lock = threading.Lock()
+        threading.Thread(
+            target=self._load_instrument_master, name="angel-master", daemon=True
+        ).start()
+
     # ── Auth ──────────────────────────────────────────────────────────────────
 
     def authenticate(self, request_token: str = "") -> str:
         """
         Generate a new session using client credentials + TOTP.
         `request_token` is unused for Angel One (kept for interface compat).
-        Returns the JWT access token.
+        Returns the JWT access token. Concurrent callers share one login.
         """
-        totp = pyotp.TOTP(self._totp_secret).now()
+        return self._authenticate_since(self._auth_generation)
+
+    def _authenticate_since(self, generation: int) -> str:
+        """Log in unless a session newer than `generation` already exists."""
+        with self._auth_lock:
+            if self._auth_generation != generation:
+                return self._jwt_token
+            jwt_token = self._login()
+            self._auth_generation += 1
+            return jwt_token
+
+    def _login(self) -> str:
+        if self._totp is None:
+            raise RuntimeError(
+                "ANGEL_ONE_TOTP_SECRET is not set — cannot generate a session."
+            )
+        totp = self._totp.now()
         try:
             data = self._obj.generateSession(self._client_id, self._password, totp)
         except Exception as e:
@@ -129,33 +342,28 @@ class AngelOneAdapter(BrokerBase):
         self.authenticate()
 
     def _throttle_historical(self) -> None:
-        """Enforce ≤3 getCandleData calls/second and ≤180 calls/minute (Angel One limits)."""
-        # Per-second cap: loop until fewer than 3 calls in the last 1 second
-        while True:
-            now = time.monotonic()
-            while self._hist_call_times and now - self._hist_call_times[0] >= 1.0:
-                self._hist_call_times.popleft()
-            if len(self._hist_call_times) < 3:
-                break
-            sleep_for = 1.0 - (now - self._hist_call_times[0]) + 0.02
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-
-        # Per-minute cap: loop until fewer than 180 calls in the last 60 seconds
-        while True:
+        """Block until every getCandleData bucket (3/s, 180/min, 5000/hr) has a token."""
+        with self._hist_lock:
             now = time.monotonic()
-            while self._hist_call_times_minute and now - self._hist_call_times_minute[0] >= 60.0:
-                self._hist_call_times_minute.popleft()
-            if len(self._hist_call_times_minute) < 180:
-                break
-            sleep_for = 60.0 - (now - self._hist_call_times_minute[0]) + 0.1
-            logger.info(f"Per-minute rate limit reached (180/min); sleeping {sleep_for:.1f}s")
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-
-        now = time.monotonic()
-        self._hist_call_times.append(now)
-        self._hist_call_times_minute.append(now)
+            wait = max(bucket.wait_time(now) for bucket in self._hist_buckets)
+            if wait > 0:
+                wait += 0.02  # margin against clock skew with the server's window
+                if wait > 1.0:
+                    logger.info(f"Historical rate limit reached; sleeping {wait:.1f}s")
+                time.sleep(wait)
+                # Every bucket's deficit is at most `wait`, so all of them hold
+                # a token by the deadline; no need to re-read the clock.
+                now += wait
+                self._hist_stats["throttled"] += 1
+                self._hist_stats["throttled_seconds"] += wait
+            for bucket in self._hist_buckets:
+                bucket.take(now)
+            self._hist_stats["calls"] += 1
+
+    def get_stats(self) -> dict:
+        """getCandleData limiter counters: calls, how many blocked, total seconds blocked."""
+        with self._hist_lock:
+            return dict(self._hist_stats)
 
     # ── Market data ───────────────────────────────────────────────────────────
 
@@ -166,24 +374,40 @@ class AngelOneAdapter(BrokerBase):
         from_date: datetime,
         to_date: datetime,
         exchange: str = "NSE",
-        _retries: int = 2,
     ) -> pd.DataFrame:
-        instrument = self.get_instrument(symbol, exchange)
-        smartapi_interval = _INTERVAL_MAP.get(interval, "ONE_DAY")
+        return self._get_historical_data_raw(
+            symbol,
+            _INTERVAL_MAP.get(interval, "ONE_DAY"),
+            from_date.strftime(_CANDLE_DATE_FORMAT),
+            to_date.strftime(_CANDLE_DATE_FORMAT),
+            exchange,
+        )
 
+    def _get_historical_data_raw(
+        self,
+        symbol: str,
+        smartapi_interval: str,
+        from_str: str,
+        to_str: str,
+        exchange: str,
+        _retries: int = 2,
+        _reauthed: bool = False,
+    ) -> pd.DataFrame:
+        """getCandleData with the interval and dates already in SmartAPI form."""
+        token = self.get_token(symbol, exchange)
         historic_param = {
             "exchange": exchange,
-            "symboltoken": str(instrument.token),
+            "symboltoken": str(token),
             "interval": smartapi_interval,
-            "fromdate": from_date.strftime("%Y-%m-%d %H:%M"),
-            "todate": to_date.strftime("%Y-%m-%d %H:%M"),
+            "fromdate": from_str,
+            "todate": to_str,
         }
 
         logger.debug(
-            f"getCandleData {symbol} token={instrument.token} "
-            f"{historic_param['fromdate']} → {historic_param['todate']}"
+            f"getCandleData {symbol} token={token} {from_str} → {to_str}"
         )
         self._throttle_historical()
+        generation = self._auth_generation
         try:
             response = self._obj.getCandleData(historic_param)
         except Exception as e:
@@ -192,12 +416,12 @@ class AngelOneAdapter(BrokerBase):
 
         if not response.get("status"):
             msg = response.get("message", "unknown error")
-            if "Invalid Token" in msg and not self._reauth_attempted:
-                self._reauth_attempted = True
+            if "Invalid Token" in msg and not _reauthed:
                 logger.warning("Angel One token invalid; re-authenticating (once).")
-                self.authenticate()  # raises on failure — propagates as fetch_error
-                self._reauth_attempted = False  # reset so future expiries in same session are handled
-                return self.get_historical_data(symbol, interval, from_date, to_date, exchange)
+                self._authenticate_since(generation)  # raises on failure — propagates as fetch_error
+                return self._get_historical_data_raw(
+                    symbol, smartapi_interval, from_str, to_str, exchange, _reauthed=True
+                )
             if "TooManyRequests" in msg and _retries > 0:
                 backoff = 2.0 * (3 - _retries)  # 0s, 2s on successive retries
                 logger.warning(
@@ -206,8 +430,9 @@ class AngelOneAdapter(BrokerBase):
                 )
                 if backoff > 0:
                     time.sleep(backoff)
-                return self.get_historical_data(
-                    symbol, interval, from_date, to_date, exchange, _retries=_retries - 1
+                return self._get_historical_data_raw(
+                    symbol, smartapi_interval, from_str, to_str, exchange,
+                    _retries=_retries - 1, _reauthed=_reauthed,
                 )
             raise RuntimeError(f"getCandleData failed for {symbol}: {msg}")
 
@@ -215,52 +440,133 @@ class AngelOneAdapter(BrokerBase):
         if not candles:
             return pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
 
-        df = pd.DataFrame(
-            candles, columns=["date", "open", "high", "low", "close", "volume"]
-        )
-        df["date"] = pd.to_datetime(df["date"])
-        df = df.set_index("date").sort_index()
-        return df
+        return _candles_frame(candles)
+
+    def get_historical_data_bulk(
+        self,
+        symbols: list[str],
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+        exchange: str = "NSE",
+    ) -> dict[str, pd.DataFrame]:
+        """
+        History for many symbols, fetched by a small pool that shares the
+        getCandleData rate limiter. Failed symbols are logged and omitted.
+        """
+        frames: dict[str, pd.DataFrame] = {}
+        if not symbols:
+            return frames
+        # Load the master once here rather than racing to load it in each worker
+        self._load_instrument_master()
+        # Same window for every symbol: format it once
+        smartapi_interval = _INTERVAL_MAP.get(interval, "ONE_DAY")
+        from_str = from_date.strftime(_CANDLE_DATE_FORMAT)
+        to_str = to_date.strftime(_CANDLE_DATE_FORMAT)
+        with ThreadPoolExecutor(max_workers=min(_HIST_WORKERS, len(symbols))) as pool:
+            futures = {
+                pool.submit(
+                    self._get_historical_data_raw,
+                    symbol, smartapi_interval, from_str, to_str, exchange,
+                ): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    frames[symbol] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to fetch data for {symbol}: {e}")
+        return frames
 
     def get_quote(self, symbols: list[str], exchange: str = "NSE") -> dict[str, Quote]:
-        result = {}
+        """
+        Quotes via getMarketData, up to 50 tokens per call. Symbols a batch
+        does not return (or a failed batch) fall back to one ltpData call each.
+        """
+        by_token: dict[str, str] = {}
         for symbol in symbols:
             try:
-                instrument = self.get_instrument(symbol, exchange)
-                raw = self._obj.ltpData(
-                    exchange=exchange,
-                    tradingsymbol=symbol,
-                    symboltoken=str(instrument.token),
-                )
-                if not raw.get("status"):
-                    msg = raw.get("message", "ltpData failed")
-                    if "Invalid Token" in msg and not self._reauth_attempted:
-                        self._reauth_attempted = True
-                        logger.warning("Angel One token invalid; re-authenticating (once).")
-                        self.authenticate()
-                        self._reauth_attempted = False
-                        return self.get_quote(symbols, exchange)
-                    raise RuntimeError(msg)
-                d = raw.get("data") or {}
-                result[symbol] = Quote(
-                    symbol=symbol,
-                    last_price=float(d.get("ltp", 0)),
-                    open=float(d.get("open", 0)),
-                    high=float(d.get("high", 0)),
-                    low=float(d.get("low", 0)),
-                    close=float(d.get("close", 0)),
-                    volume=0,  # ltpData does not return volume
-                    timestamp=datetime.now(),
-                )
+                by_token[str(self.get_token(symbol, exchange))] = symbol
             except Exception as e:
                 logger.warning(f"Failed to get quote for {symbol}: {e}")
+
+        def fetch(batch: list[str]) -> list[dict]:
+            try:
+                return self._get_market_data(exchange, batch)
+            except Exception as e:
+                logger.warning(f"getMarketData failed for {len(batch)} symbols: {e}")
+                return []
+
+        tokens = list(by_token)
+        batches = [
+            tokens[i : i + _MARKET_DATA_BATCH]
+            for i in range(0, len(tokens), _MARKET_DATA_BATCH)
+        ]
+        if len(batches) > 1:
+            # Batches go out concurrently over the keep-alive session pool
+            with ThreadPoolExecutor(
+                max_workers=min(_MARKET_DATA_WORKERS, len(batches))
+            ) as pool:
+                fetched_batches = list(pool.map(fetch, batches))
+        else:
+            fetched_batches = [fetch(batch) for batch in batches]
+
+        result: dict[str, Quote] = {}
+        for fetched in fetched_batches:
+            for d in fetched:
+                matched = by_token.get(str(d.get("symbolToken")))
+                if matched is not None:
+                    result[matched] = _quote_from(matched, d)
+
+        for symbol in by_token.values():
+            if symbol not in result:
+                try:
+                    result[symbol] = self._get_ltp_quote(symbol, exchange)
+                except Exception as e:
+                    logger.warning(f"Failed to get quote for {symbol}: {e}")
         return result
 
+    def _get_market_data(
+        self, exchange: str, tokens: list[str], _reauthed: bool = False
+    ) -> list[dict]:
+        """One getMarketData (OHLC mode) call; returns the `fetched` entries."""
+        generation = self._auth_generation
+        raw = self._obj.getMarketData("OHLC", {exchange: tokens})
+        if not raw.get("status"):
+            msg = raw.get("message", "getMarketData failed")
+            if "Invalid Token" in msg and not _reauthed:
+                logger.warning("Angel One token invalid; re-authenticating (once).")
+                self._authenticate_since(generation)
+                return self._get_market_data(exchange, tokens, _reauthed=True)
+            raise RuntimeError(msg)
+        data = raw.get("data") or {}
+        unfetched = data.get("unfetched") or []
+        if unfetched:
+            logger.debug(f"getMarketData left {len(unfetched)} tokens unfetched")
+        return data.get("fetched") or []
+
+    def _get_ltp_quote(self, symbol: str, exchange: str, _reauthed: bool = False) -> Quote:
+        token = self.get_token(symbol, exchange)
+        generation = self._auth_generation
+        raw = self._obj.ltpData(
+            exchange=exchange,
+            tradingsymbol=symbol,
+            symboltoken=str(token),
+        )
+        if not raw.get("status"):
+            msg = raw.get("message", "ltpData failed")
+            if "Invalid Token" in msg and not _reauthed:
+                logger.warning("Angel One token invalid; re-authenticating (once).")
+                self._authenticate_since(generation)
+                return self._get_ltp_quote(symbol, exchange, _reauthed=True)
+            raise RuntimeError(msg)
+        return _quote_from(symbol, raw.get("data") or {})
+
     def get_instrument(self, symbol: str, exchange: str = "NSE") -> Instrument:
-        cache_key = f"{exchange}:{symbol}"
-        if cache_key in self._instruments_cache:
-            return self._instruments_cache[cache_key]
+        return self._instrument_lookup(exchange, symbol)
 
+    def _resolve_instrument(self, exchange: str, symbol: str) -> Instrument:
         self._load_instrument_master()
         symbol_upper = symbol.upper()
         # Angel One naming conventions:
@@ -289,15 +595,22 @@ class AngelOneAdapter(BrokerBase):
         logger.debug(
             f"Token resolved: {exchange}:{symbol} → {matched_name} token={instrument.token}"
         )
-        self._instruments_cache[cache_key] = instrument
         return instrument
 
+    def get_token(self, symbol: str, exchange: str = "NSE") -> int:
+        """Just the token: a dict hit for warmed symbols, else via get_instrument."""
+        token = self._token_map.get((exchange, symbol))
+        if token is None:
+            token = self.get_instrument(symbol, exchange).token
+        return token
+
     def warm_instrument_cache(self, symbols: list[str], exchange: str = "NSE") -> None:
         """
         Pre-resolve and cache symbol tokens for all given symbols.
         Logs the full symbol→token map at INFO level so tokens can be audited,
         and warns about any symbols not found in the master.
-        Call this once before a screener run to catch bad tokens early.
+        Call this once before a screener run to catch bad tokens early; the
+        resolved tokens also feed `get_token`'s fast path.
         """
         self._load_instrument_master()
         token_map: dict[str, int] = {}
@@ -309,6 +622,8 @@ class AngelOneAdapter(BrokerBase):
             except ValueError:
                 missing.append(symbol)
 
+        # Swap in a new snapshot rather than mutating one other threads read
+        self._token_map = self._token_map | {(exchange, s): t for s, t in token_map.items()}
         logger.info(
             f"Symbol tokens resolved: {len(token_map)}/{len(symbols)} found. "
             + (f"Missing: {missing}" if missing else "All symbols found.")
@@ -318,43 +633,106 @@ class AngelOneAdapter(BrokerBase):
             logger.debug(f"Token map: {token_list}")
 
     def _load_instrument_master(self) -> None:
-        """Fetch and cache the Angel One instrument master JSON, building an O(1) index."""
-        if self._master is not None:
+        """
+        Load the Angel One instrument master into an O(1) index.
+
+        A copy of the index is kept on disk (`settings.angel_master_cache`).
+        A copy written after today's refresh is used as is. An older one is
+        revalidated with a conditional GET, so a 304 skips the download.
+        Safe to call from several threads; only the first one loads.
+        """
+        if self._master_loaded:
+            return
+        with self._master_lock:
+            if not self._master_loaded:
+                self._fetch_instrument_master()
+
+    def _fetch_instrument_master(self) -> None:
+        cached = self._read_master_cache()
+        if cached is not None and _master_cache_fresh(self._master_cache_path):
+            self._set_master(cached["entries"])
             return
+
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
         try:
-            resp = requests.get(_INSTRUMENT_MASTER_URL, timeout=30)
-            resp.raise_for_status()
-            self._master = resp.json()
-            # Build index: (exch_seg_upper, symbol_upper) → entry
-            # For any duplicate keys, prefer the -EQ entry over -BE.
-            for entry in self._master:
-                key = (
-                    entry.get("exch_seg", "").upper(),
-                    entry.get("symbol", "").upper(),
-                )
-                existing = self._master_index.get(key)
-                if existing is None or entry.get("symbol", "").upper().endswith("-EQ"):
-                    self._master_index[key] = entry
-            logger.info(
-                f"Loaded {len(self._master)} instruments from Angel One master "
-                f"({len(self._master_index)} unique keys indexed)."
-            )
+            with self._session.get(
+                _INSTRUMENT_MASTER_URL, headers=headers, timeout=_HTTP_TIMEOUT, stream=True
+            ) as resp:
+                if resp.status_code == 304 and cached is not None:
+                    self._master_cache_path.touch()
+                    self._set_master(cached["entries"])
+                    return
+                resp.raise_for_status()
+                entries = [
+                    {f: e[f] for f in _MASTER_FIELDS if f in e} for e in _iter_master(resp)
+                ]
         except Exception as e:
             logger.error(f"Failed to load Angel One instrument master: {e}")
-            self._master = []
+            # A stale index beats none at all
+            self._set_master(cached["entries"] if cached is not None else [])
+            return
+        self._set_master(entries)
+        self._write_master_cache({
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "entries": entries,
+        })
+
+    def _set_master(self, master: list[dict]) -> None:
+        # Index: (exch_seg_upper, symbol_upper) → entry. For a duplicated key
+        # the first entry is kept, unless a later one is an -EQ symbol.
+        index: dict[tuple[str, str], dict] = {}
+        for entry in master:
+            key = (entry.get("exch_seg", "").upper(), entry.get("symbol", "").upper())
+            if key not in index or key[1].endswith("-EQ"):
+                index[key] = entry
+        self._master_index = index
+        # Set the flag last: other threads treat it as "loaded"
+        self._master_loaded = True
+        logger.info(
+            f"Loaded {len(master)} instruments from Angel One master "
+            f"({len(self._master_index)} unique keys indexed)."
+        )
+
+    def _read_master_cache(self) -> Optional[dict]:
+        path = self._master_cache_path
+        if path is None:
+            return None
+        try:
+            return _loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable instrument master cache: {e}")
+            return None
+
+    def _write_master_cache(self, payload: dict) -> None:
+        """Written to a temp file, then renamed into place."""
+        path = self._master_cache_path
+        if path is None:
+            return
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(_dumps(payload))
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Failed to write instrument master cache: {e}")
+            tmp.unlink(missing_ok=True)
 
     # ── Portfolio ─────────────────────────────────────────────────────────────
 
     def is_market_open(self) -> bool:
         """Use time-based check (IST 09:15–15:30) — avoids an extra API call."""
-        import pytz
-
-        now = datetime.now(pytz.timezone("Asia/Kolkata"))
+        now = datetime.now(_IST)
         if now.weekday() >= 5:  # Saturday / Sunday
             return False
-        market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
-        market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
-        return market_open <= now <= market_close
+        return _MARKET_OPEN <= now.time() <= _MARKET_CLOSE
 
     def get_holdings(self) -> list[dict]:
         try:
@@ -371,3 +749,11 @@ class AngelOneAdapter(BrokerBase):
         except Exception as e:
             logger.error(f"Failed to fetch positions: {e}")
             return []
+
+    def get_available_margin(self) -> float:
+        # rmsLimit reports failures in the payload rather than raising
+        resp = self._obj.rmsLimit() or {}
+        data = resp.get("data")
+        if not data:
+            raise RuntimeError(f"rmsLimit failed: {resp.get('message') or resp}")
+        return float(data.get("net") or 0)
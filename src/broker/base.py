@@ -12,7 +12,7 @@ from datetime import datetime
 import pandas as pd
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Instrument:
     symbol: str
     token: int
@@ -21,7 +21,7 @@ class Instrument:
     tick_size: float = 0.05
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Quote:
     symbol: str
     last_price: float
@@ -82,6 +82,10 @@ class BrokerBase(ABC):
     def get_positions(self) -> list[dict]:
         """Return intraday / short-term positions."""
 
+    @abstractmethod
+    def get_available_margin(self) -> float:
+        """Return available net margin in INR (raises if the broker call fails)."""
+
     def compute_quantity(
         self, capital: float, entry: float, stop: float, risk_pct: float
     ) -> int:
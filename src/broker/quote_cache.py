@@ -0,0 +1,58 @@
+"""
+Short-lived in-process quote cache shared by the pipelines.
+
+The hourly monitor, post-market run and ad-hoc commands often ask for
+overlapping symbols within a minute of each other. `get_quotes` serves
+what it already holds and fetches only the missing symbols, in a single
+`broker.get_quote` call. `invalidate()` drops everything — broker sync
+calls it after reconciling, so the next pass sees fresh prices.
+"""
+
+import threading
+import time
+
+from src.broker.base import BrokerBase, Quote
+
+_DEFAULT_TTL = 45  # seconds
+
+_lock = threading.Lock()
+_quotes: dict[tuple[str, str], tuple[float, Quote]] = {}  # (exchange, symbol) → (fetched, quote)
+
+
+def get_quotes(
+    broker: BrokerBase,
+    symbols: list[str],
+    ttl: float = _DEFAULT_TTL,
+    exchange: str = "NSE",
+) -> dict[str, Quote]:
+    """
+    Quotes for `symbols` no older than `ttl` seconds, keyed by symbol.
+    Symbols the broker returns nothing for are simply absent, as with
+    `get_quote`; broker errors propagate to the caller.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    now = time.monotonic()
+    result: dict[str, Quote] = {}
+    missing: list[str] = []
+    with _lock:
+        for symbol in symbols:
+            hit = _quotes.get((exchange, symbol))
+            if hit is not None and now - hit[0] < ttl:
+                result[symbol] = hit[1]
+            else:
+                missing.append(symbol)
+
+    if missing:
+        # Fetched outside the lock; a concurrent miss costs one extra call at worst
+        fetched = broker.get_quote(missing, exchange=exchange)
+        fetched_at = time.monotonic()
+        with _lock:
+            for symbol, quote in fetched.items():
+                _quotes[(exchange, symbol)] = (fetched_at, quote)
+        result.update(fetched)
+    return result
+
+
+def invalidate() -> None:
+    with _lock:
+        _quotes.clear()
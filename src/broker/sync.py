@@ -21,9 +21,16 @@ Both Angel One and Zerodha field names are handled; the code tries both.
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import TYPE_CHECKING
+from itertools import chain
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import load_only, raiseload
 
 from src.db.models import Position, PositionStatus, ExitReason
 
@@ -33,6 +40,19 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Defaults for positions opened outside the bot: 6% stop, 10% target
+_DEFAULT_STOP_FACTOR = 0.94
+_DEFAULT_TARGET_FACTOR = 1.10
+
+# A sync younger than this is reused rather than hitting the broker again
+_SYNC_FRESH_SECONDS = 60
+
+# Single-flight state, keyed by id(broker): callers arriving while a sync is
+# running wait for it; callers arriving shortly after reuse its result.
+_sync_lock = threading.Lock()
+_sync_inflight: dict[int, Future] = {}
+_last_sync: dict[int, tuple[float, "SyncResult"]] = {}
+
 
 @dataclass
 class SyncResult:
@@ -47,6 +67,7 @@ class SyncResult:
     fund_balance_inr: float = 0.0
     fund_change_inr: float = 0.0  # positive = added, negative = withdrawn
     errors: list[str] = field(default_factory=list)
+    as_of: Optional[datetime] = None  # UTC; stamped on every row this sync wrote
 
     @property
     def has_position_changes(self) -> bool:
@@ -66,13 +87,67 @@ def run_sync(
     Full broker sync — positions then funds.
     Always call this at the start of each monitor run so the DB reflects
     real broker state before any new suggestions are evaluated.
+
+    Concurrent calls for the same broker share one sync, and a call within
+    _SYNC_FRESH_SECONDS of the last one reuses it. Only the caller that ran
+    the sync gets its position and fund changes; the others get the balance
+    alone, so alerts and fund additions are not applied twice.
     """
-    result = SyncResult()
-    _sync_positions(broker, session, result)
+    key = id(broker)
+    with _sync_lock:
+        last = _last_sync.get(key)
+        if last is not None and time.monotonic() - last[0] < _SYNC_FRESH_SECONDS:
+            return _shared(last[1])
+        inflight = _sync_inflight.get(key)
+        if inflight is None:
+            future: Future = Future()
+            _sync_inflight[key] = future
+
+    if inflight is not None:
+        logger.info("Sync: joining the sync already in flight")
+        return _shared(inflight.result())
+
+    try:
+        result = _run_sync(broker, session, last_known_balance)
+    except BaseException as e:
+        with _sync_lock:
+            del _sync_inflight[key]
+        future.set_exception(e)
+        raise
+    with _sync_lock:
+        del _sync_inflight[key]
+        _last_sync[key] = (time.monotonic(), result)
+    future.set_result(result)
+    return result
+
+
+def _run_sync(
+    broker: "BrokerBase",
+    session: "Session",
+    last_known_balance: float,
+) -> SyncResult:
+    # One as-of time for the whole run, reused for every entry/exit date
+    now = datetime.utcnow()
+    result = SyncResult(as_of=now)
+    _sync_positions(broker, session, result, now)
     _sync_funds(broker, result, last_known_balance)
     return result
 
 
+def _shared(result: SyncResult) -> SyncResult:
+    """
+    A coalesced caller's view of another caller's sync: the balance, with no
+    position or fund changes. The leader already alerted on and recorded
+    those; a caller that read its last balance before the leader committed
+    would otherwise report (and add to fund_added_inr) the same deposit again.
+    """
+    return SyncResult(
+        fund_balance_inr=result.fund_balance_inr,
+        errors=list(result.errors),
+        as_of=result.as_of,
+    )
+
+
 # ── Position sync ─────────────────────────────────────────────────────────────
 
 
@@ -80,6 +155,7 @@ def _sync_positions(
     broker: "BrokerBase",
     session: "Session",
     result: SyncResult,
+    now: datetime,
 ) -> None:
     """Compare broker holdings/positions against open DB positions."""
 
@@ -97,7 +173,7 @@ def _sync_positions(
     # Angel One fields: tradingsymbol, authorisedquantity, averageprice, ltp
     # Zerodha fields:   tradingsymbol, quantity, average_price, last_price
     broker_map: dict[str, dict] = {}
-    for raw in broker_holdings + broker_positions:
+    for raw in chain(broker_holdings, broker_positions):
         symbol = raw.get("tradingsymbol") or raw.get("symbol", "")
         qty = int(raw.get("authorisedquantity") or raw.get("quantity") or 0)
         if not symbol or qty <= 0:
@@ -110,32 +186,62 @@ def _sync_positions(
             "ltp": float(raw.get("ltp") or raw.get("last_price") or 0),
         }
 
-    # All positions currently marked open in the DB
-    db_open: list[Position] = (
-        session.query(Position).filter(Position.status == PositionStatus.OPEN).all()
+    # All positions currently marked open in the DB. Only the columns
+    # reconciliation reads are selected, and any relationship access raises
+    # instead of lazy-loading per row.
+    stmt = (
+        select(Position)
+        .where(Position.is_open)
+        .options(
+            load_only(
+                Position.id,
+                Position.symbol,
+                Position.entry_price,
+                Position.entry_date,
+                Position.quantity,
+                Position.target,
+            ),
+            raiseload("*"),
+        )
     )
+    db_open: list[Position] = list(session.execute(stmt).scalars())
     db_map: dict[str, Position] = {p.symbol: p for p in db_open}
 
-    # ── Case 1: In broker but not in DB — external buy ────────────────────
+    # Holdings/positions payloads often carry a stale or zero LTP (Zerodha's
+    # positions()["net"] especially), so price everything with one batched
+    # quote call. The payload value stays as the fallback.
+    ltps = _fetch_ltps(broker, sorted(set(broker_map) | set(db_map)), result)
     for symbol, bp in broker_map.items():
-        if symbol in db_map:
-            continue
+        bp["ltp"] = ltps.get(symbol) or bp["ltp"]
+
+    # Rows are collected and written in one flush at the end rather than one
+    # round-trip per symbol.
+    new_rows: list[Position] = []
+    close_updates: list[dict] = []
+
+    # broker_map only holds quantities > 0, so a plain key difference each way
+    # gives the external buys and the external sells (sorted for stable output).
+    broker_only = sorted(broker_map.keys() - db_map.keys())
+    db_only = sorted(db_map.keys() - broker_map.keys())
+
+    # ── Case 1: In broker but not in DB — external buy ────────────────────
+    for symbol in broker_only:
+        bp = broker_map[symbol]
         avg = bp["avg_price"] or bp["ltp"]
         try:
             new_pos = Position(
                 symbol=symbol,
                 action="BUY",
                 entry_price=avg,
-                # Defaults: 6% stop, 10% target — user should review and adjust
-                current_stop=round(avg * 0.94, 2),
-                target=round(avg * 1.10, 2),
+                # Default stop/target — user should review and adjust
+                current_stop=round(avg * _DEFAULT_STOP_FACTOR, 2),
+                target=round(avg * _DEFAULT_TARGET_FACTOR, 2),
                 quantity=bp["quantity"],
-                entry_date=datetime.utcnow(),
+                entry_date=now,
                 status=PositionStatus.OPEN,
                 is_externally_created=True,
             )
-            session.add(new_pos)
-            session.flush()
+            new_rows.append(new_pos)
             result.new_positions.append(
                 {
                     "symbol": symbol,
@@ -153,23 +259,26 @@ def _sync_positions(
             result.errors.append(msg)
 
     # ── Case 2: In DB but gone from broker — external sell ────────────────
-    for symbol, db_pos in db_map.items():
-        broker_pos = broker_map.get(symbol)
-        if broker_pos and broker_pos["quantity"] > 0:
-            continue  # Still held — nothing to do
-        exit_price = float((broker_pos["ltp"] if broker_pos else 0) or db_pos.target or db_pos.entry_price)
+    for symbol in db_only:
+        db_pos = db_map[symbol]
+        exit_price = float(ltps.get(symbol) or db_pos.target or db_pos.entry_price)
         try:
             pnl_inr = (exit_price - db_pos.entry_price) * db_pos.quantity
             pnl_pct = (exit_price - db_pos.entry_price) / db_pos.entry_price * 100
+            held_days = (now - db_pos.entry_date).days
 
-            db_pos.status = PositionStatus.CLOSED
-            db_pos.exit_price = exit_price
-            db_pos.exit_date = datetime.utcnow()
-            db_pos.exit_reason = ExitReason.MANUAL
-            db_pos.pnl_inr = round(pnl_inr, 2)
-            db_pos.pnl_pct = round(pnl_pct, 2)
-            db_pos.held_days = (datetime.utcnow() - db_pos.entry_date).days
-
+            close_updates.append(
+                {
+                    "id": db_pos.id,
+                    "status": PositionStatus.CLOSED,
+                    "exit_price": exit_price,
+                    "exit_date": now,
+                    "exit_reason": ExitReason.MANUAL,
+                    "pnl_inr": round(pnl_inr, 2),
+                    "pnl_pct": round(pnl_pct, 2),
+                    "held_days": held_days,
+                }
+            )
             result.closed_positions.append(
                 {
                     "symbol": symbol,
@@ -177,7 +286,7 @@ def _sync_positions(
                     "exit_price": exit_price,
                     "pnl_inr": round(pnl_inr, 2),
                     "pnl_pct": round(pnl_pct, 2),
-                    "held_days": db_pos.held_days,
+                    "held_days": held_days,
                 }
             )
             logger.info(
@@ -189,9 +298,29 @@ def _sync_positions(
             logger.error(msg)
             result.errors.append(msg)
 
+    session.add_all(new_rows)
+    if close_updates:
+        # ORM bulk UPDATE by primary key: one executemany for every close
+        session.execute(update(Position), close_updates)
     session.commit()
 
 
+def _fetch_ltps(
+    broker: "BrokerBase", symbols: list[str], result: SyncResult
+) -> dict[str, float]:
+    """Last traded prices for `symbols` in one get_quote call (empty on failure)."""
+    if not symbols:
+        return {}
+    try:
+        quotes = broker.get_quote(symbols)
+    except Exception as e:
+        msg = f"Failed to fetch quotes for sync: {e}"
+        logger.warning(msg)
+        result.errors.append(msg)
+        return {}
+    return {s: q.last_price for s, q in quotes.items() if q.last_price}
+
+
 # ── Fund balance sync ─────────────────────────────────────────────────────────
 
 
@@ -202,7 +331,8 @@ def _sync_funds(
 ) -> None:
     """Check current available margin against last known balance."""
     try:
-        balance = _fetch_balance(broker)
+        # Whole rupees: paise-level jitter between broker reads is not a change
+        balance = float(round(broker.get_available_margin()))
         result.fund_balance_inr = balance
         result.fund_change_inr = balance - last_known_balance
         if result.has_fund_change:
@@ -216,22 +346,3 @@ def _sync_funds(
         msg = f"Could not fetch fund balance: {e}"
         logger.warning(msg)
         result.errors.append(msg)
-
-
-def _fetch_balance(broker: "BrokerBase") -> float:
-    """Available net margin. Handles both Angel One and Zerodha."""
-    # Angel One — SmartAPI rmsLimit → data.net
-    if hasattr(broker, "_obj"):
-        try:
-            resp = broker._obj.rmsLimit()
-            return float((resp.get("data") or {}).get("net", 0))
-        except Exception:
-            pass
-    # Zerodha — margins()["equity"]["net"]
-    if hasattr(broker, "_kite"):
-        try:
-            margins = broker._kite.margins()
-            return float((margins.get("equity") or {}).get("net", 0))
-        except Exception:
-            pass
-    return 0.0
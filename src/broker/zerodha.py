@@ -2,9 +2,16 @@
 Zerodha Kite Connect adapter.
 """
 
+import json
 import logging
+import threading
+import time
 from datetime import datetime
+from datetime import time as dt_time
+from typing import Optional
+from zoneinfo import ZoneInfo
 
+import boto3
 import pandas as pd
 from kiteconnect import KiteConnect
 
@@ -13,12 +20,25 @@ from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_QUOTE_BATCH = 500
+_CANDLE_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+_IST = ZoneInfo("Asia/Kolkata")
+_NO_OHLC: dict = {}
+_MARKET_OPEN_TTL = 60  # seconds an in-session quote probe stays valid
+
 
 class ZerodhaAdapter(BrokerBase):
     def __init__(self):
         settings = get_settings()
         self._kite = KiteConnect(api_key=settings.zerodha_api_key)
-        self._instruments_cache: dict[str, Instrument] = {}
+        # exchange → tradingsymbol → Instrument, loaded once per exchange
+        self._instruments_by_exchange: dict[str, dict[str, Instrument]] = {}
+        self._instruments_lock = threading.Lock()
+        self._s3 = None
+        self._session_open = dt_time.fromisoformat(settings.market_open)
+        self._session_close = dt_time.fromisoformat(settings.market_close)
+        # (monotonic time of last probe, its answer)
+        self._market_open_cache: tuple[float, bool] = (float("-inf"), False)
 
         if settings.zerodha_access_token:
             self.set_access_token(settings.zerodha_access_token)
@@ -63,24 +83,30 @@ class ZerodhaAdapter(BrokerBase):
             logger.error(f"Failed to fetch historical data for {symbol}: {e}")
             raise
 
-        df = pd.DataFrame(records)
-        if df.empty:
-            return df
-        df["date"] = pd.to_datetime(df["date"])
-        df = df.set_index("date").sort_index()
-        df = df[["open", "high", "low", "close", "volume"]]
+        if not records:
+            return pd.DataFrame()
+        # One frame with the OHLCV columns only, indexed by the parsed dates
+        df = pd.DataFrame.from_records(records, columns=_CANDLE_COLUMNS, index="date")
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.index), name="date")
+        # Kite returns candles in order; only sort if it ever doesn't
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
         return df
 
     def get_quote(self, symbols: list[str], exchange: str = "NSE") -> dict[str, Quote]:
         keys = [f"{exchange}:{s}" for s in symbols]
-        raw = self._kite.quote(keys)
+        # Kite accepts at most 500 instruments per quote call
+        raw = {}
+        for i in range(0, len(keys), _QUOTE_BATCH):
+            raw.update(self._kite.quote(keys[i : i + _QUOTE_BATCH]))
+        # One timestamp for the whole batch — it is a single snapshot anyway
+        now = datetime.now()
         result = {}
-        for symbol in symbols:
-            key = f"{exchange}:{symbol}"
-            if key not in raw:
+        for symbol, key in zip(symbols, keys):
+            d = raw.get(key)
+            if d is None:
                 continue
-            d = raw[key]
-            ohlc = d.get("ohlc", {})
+            ohlc = d.get("ohlc") or _NO_OHLC
             result[symbol] = Quote(
                 symbol=symbol,
                 last_price=d["last_price"],
@@ -89,40 +115,116 @@ class ZerodhaAdapter(BrokerBase):
                 low=ohlc.get("low", 0),
                 close=ohlc.get("close", 0),
                 volume=d.get("volume", 0),
-                timestamp=datetime.now(),
+                timestamp=now,
             )
         return result
 
     def get_instrument(self, symbol: str, exchange: str = "NSE") -> Instrument:
-        if symbol in self._instruments_cache:
-            return self._instruments_cache[symbol]
-
-        instruments = self._kite.instruments(exchange)
-        for inst in instruments:
-            if inst["tradingsymbol"] == symbol and inst["exchange"] == exchange:
-                result = Instrument(
-                    symbol=symbol,
-                    token=inst["instrument_token"],
-                    exchange=exchange,
-                    lot_size=inst.get("lot_size", 1),
-                    tick_size=inst.get("tick_size", 0.05),
-                )
-                self._instruments_cache[symbol] = result
-                return result
-
-        raise ValueError(f"Instrument not found: {exchange}:{symbol}")
+        instrument = self._load_instruments(exchange).get(symbol)
+        if instrument is None:
+            raise ValueError(f"Instrument not found: {exchange}:{symbol}")
+        return instrument
+
+    def _load_instruments(self, exchange: str) -> dict[str, Instrument]:
+        """
+        The exchange's instrument list, keyed by tradingsymbol. Kite publishes
+        it once a day, so it is fetched at most once per exchange per day and
+        shared through S3 across restarts (key includes the IST date).
+        """
+        instruments = self._instruments_by_exchange.get(exchange)
+        if instruments is not None:
+            return instruments
+
+        with self._instruments_lock:
+            instruments = self._instruments_by_exchange.get(exchange)
+            if instruments is not None:
+                return instruments
+
+            key = f"instruments-{exchange}-{datetime.now(_IST):%Y%m%d}.json"
+            rows = self._read_instruments_s3(key)
+            if rows is None:
+                rows = [
+                    {
+                        "symbol": inst["tradingsymbol"],
+                        "token": inst["instrument_token"],
+                        "lot_size": inst.get("lot_size", 1),
+                        "tick_size": inst.get("tick_size", 0.05),
+                    }
+                    for inst in self._kite.instruments(exchange)
+                    if inst["exchange"] == exchange
+                ]
+                self._write_instruments_s3(key, rows)
+
+            instruments = {
+                r["symbol"]: Instrument(exchange=exchange, **r) for r in rows
+            }
+            self._instruments_by_exchange[exchange] = instruments
+            logger.info(f"Loaded {len(instruments)} Zerodha instruments for {exchange}.")
+            return instruments
+
+    def _s3_client(self):
+        if self._s3 is None:
+            settings = get_settings()
+            self._s3 = boto3.client(
+                "s3",
+                region_name=settings.aws_region,
+                aws_access_key_id=settings.aws_access_key_id or None,
+                aws_secret_access_key=settings.aws_secret_access_key or None,
+            )
+        return self._s3
+
+    def _read_instruments_s3(self, key: str) -> Optional[list[dict]]:
+        bucket = get_settings().s3_bucket_name
+        try:
+            obj = self._s3_client().get_object(Bucket=bucket, Key=key)
+            return json.loads(obj["Body"].read())
+        except Exception as e:
+            # Missing key (first run of the day) or S3 unreachable — refetch
+            logger.debug(f"No cached instrument list at s3://{bucket}/{key}: {e}")
+            return None
+
+    def _write_instruments_s3(self, key: str, rows: list[dict]) -> None:
+        try:
+            self._s3_client().put_object(
+                Bucket=get_settings().s3_bucket_name,
+                Key=key,
+                Body=json.dumps(rows).encode(),
+                ContentType="application/json",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache instrument list to S3: {e}")
 
     # ── Portfolio ─────────────────────────────────────────────────────────
 
     def is_market_open(self) -> bool:
+        """
+        Outside the configured IST session (or at weekends) this is decided
+        from the clock alone; inside it, a NIFTY 50 quote probe is reused
+        for up to a minute.
+        """
+        now = datetime.now(_IST)
+        if now.weekday() >= 5:  # Saturday / Sunday
+            return False
+        if not self._session_open <= now.time() <= self._session_close:
+            return False
+
+        checked_at, is_open = self._market_open_cache
+        mono = time.monotonic()
+        if mono - checked_at < _MARKET_OPEN_TTL:
+            return is_open
         try:
-            quote = self._kite.quote(["NSE:NIFTY 50"])
-            return bool(quote)
+            is_open = bool(self._kite.quote(["NSE:NIFTY 50"]))
         except Exception:
-            return False
+            is_open = False
+        self._market_open_cache = (mono, is_open)
+        return is_open
 
     def get_holdings(self) -> list[dict]:
         return self._kite.holdings()
 
     def get_positions(self) -> list[dict]:
         return self._kite.positions().get("net", [])
+
+    def get_available_margin(self) -> float:
+        margins = self._kite.margins()
+        return float((margins.get("equity") or {}).get("net", 0))
@@ -4,7 +4,7 @@ All secrets and settings come through here — never hardcoded elsewhere.
 """
 
 from functools import lru_cache
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     angel_one_password: str = ""  # Your Angel One login PIN
     angel_one_totp_secret: str = ""  # Base32 secret from your TOTP authenticator setup
     angel_one_jwt_token: str = ""  # Populated automatically after daily auth
+    angel_master_cache: str = "~/.cache/fund-bot/angel_master.json"  # Instrument index; "" disables
 
     # ── Zerodha (kept for optional use) ───────────────────────────────────
     zerodha_api_key: str = ""
@@ -51,6 +52,12 @@ class Settings(BaseSettings):
     max_open_positions: int = 5
     min_risk_reward: float = 2.0  # Minimum R:R to take a trade
 
+    # ── Screener ──────────────────────────────────────────────────────────
+    screener_max_workers: int = 32  # Candle fetch threads for brokers without a bulk history call
+    ohlcv_cache_dir: str = "~/.cache/fund-bot/ohlcv"  # Parquet cache of daily bars; "" disables
+    screener_engine: str = "numpy"  # "numpy" | "polars" (one indicator pass for the watchlist)
+    nifty200_cache: str = "~/.cache/fund-bot/nifty200.json"  # Constituent list; "" disables
+
     # ── Stock universe ────────────────────────────────────────────────────
     # Nifty 50 + Midcap 50 — editable without code changes
     watchlist: list[str] = [
@@ -137,9 +144,14 @@ class Settings(BaseSettings):
         "volume_breakout": 1.0,
     }
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    # Frozen: settings are read once per process and shared, so nothing may
+    # reassign a field.
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        frozen=True,
+        extra="ignore",
+    )
 
 
 @lru_cache()
@@ -1,22 +1,40 @@
 """Database connection and session management."""
 
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.config import get_settings
 from src.db.models import Base
 
 
+@lru_cache(maxsize=1)
 def get_engine():
+    """Process-wide engine; every caller shares one connection pool."""
     settings = get_settings()
+    url = make_url(settings.database_url)
+    dialect_kwargs = {}
+    if url.get_driver_name() == "psycopg2":
+        # executemany UPDATEs (broker sync closes) go out via execute_batch
+        # in pages, not one round trip per row; INSERTs already batch.
+        dialect_kwargs["executemany_mode"] = "values_plus_batch"
     return create_engine(
-        settings.database_url,
+        url,
         pool_pre_ping=True,  # Detect stale connections
+        pool_recycle=1800,  # Recycle before server-side idle timeouts
+        # 5 kept warm; a burst can reach 2 scheduler threads plus Socket Mode's
+        # 10 handler workers, so overflow covers all of them at once
         pool_size=5,
         max_overflow=10,
+        # Checkouts normally take milliseconds; a caller still waiting after
+        # 5s is behind a stuck holder, so fail fast rather than queue
+        pool_timeout=5,
+        query_cache_size=1200,  # Compiled-statement cache; default is 500
+        **dialect_kwargs,
     )
 
 
@@ -26,13 +44,16 @@ def create_tables():
     Base.metadata.create_all(engine)
 
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+@lru_cache(maxsize=1)
+def _session_local() -> sessionmaker:
+    """Session factory, built on first use so importing this module opens no pool."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
 
 
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
     """Context manager for DB sessions with automatic rollback on error."""
-    session = SessionLocal()
+    session = _session_local()()
     try:
         yield session
         session.commit()
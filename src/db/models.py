@@ -14,23 +14,51 @@ from typing import Any, Optional
 
 from sqlalchemy import (
     Boolean,
+    CheckConstraint,
+    Computed,
     DateTime,
-    Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
+    Numeric,
     String,
     Text,
+    TypeDecorator,
     UniqueConstraint,
+    true,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import FunctionElement
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class utcnow(FunctionElement):
+    """
+    Current UTC time as a naive timestamp, evaluated by the database.
+    Matches the datetime.utcnow() values the app writes elsewhere; plain
+    now() would follow the server's TimeZone setting on PostgreSQL.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"  # SQLite: already UTC
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
 # ── Enums ─────────────────────────────────────────────────────────────────
 
 
@@ -54,6 +82,51 @@ class ExitReason(str, enum.Enum):
     EXPIRED = "expired"  # Held past allowed duration
 
 
+class EnumStr(TypeDecorator):
+    """
+    A Python Enum stored as its plain string value in VARCHAR(16).
+    No server-side enum type, so adding a member needs no type migration;
+    the allowed values are enforced by a CHECK built with `enum_check()`.
+    """
+
+    impl = String(16)
+    cache_ok = True
+
+    def __init__(self, enum_cls: type[enum.Enum]):
+        super().__init__()
+        self.enum_cls = enum_cls
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else self.enum_cls(value).value
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self.enum_cls(value)
+
+
+class SymbolList(TypeDecorator):
+    """
+    A list of ticker symbols stored as one comma-separated TEXT value.
+    Symbols never contain commas, so this round-trips without the JSON
+    encode/decode; an empty list is stored as "".
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else ",".join(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.split(",") if value else []
+
+
+def enum_check(column: str, enum_cls: type[enum.Enum], table: str) -> CheckConstraint:
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({values})", name=f"ck_{table}_{column}")
+
+
 # ── Models ────────────────────────────────────────────────────────────────
 
 
@@ -92,18 +165,29 @@ class TradeSuggestion(Base):
 
     # Slack threading
     slack_ts: Mapped[Optional[str]] = mapped_column(
-        String(50), index=True
+        String(50), index=True, unique=True
     )  # Message timestamp (used to update/thread)
     slack_channel: Mapped[Optional[str]] = mapped_column(String(50))
 
     status: Mapped[SuggestionStatus] = mapped_column(
-        Enum(SuggestionStatus), default=SuggestionStatus.PENDING, nullable=False
+        EnumStr(SuggestionStatus), default=SuggestionStatus.PENDING, nullable=False
     )
     user_response_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     user_notes: Mapped[Optional[str]] = mapped_column(Text)  # Optional user comment
 
-    position: Mapped[Optional["Position"]] = relationship("Position", back_populates="suggestion", uselist=False)
-    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    # Not read on any hot path; lazy="raise" makes an accidental N+1 fail loudly.
+    # Load it explicitly (selectinload / joinedload) where it is needed.
+    position: Mapped[Optional["Position"]] = relationship(
+        "Position", back_populates="suggestion", uselist=False, lazy="raise"
+    )
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow())
+
+    # Pending-today and expire-stale filter on status, then a date range;
+    # symbol makes it covering for the monitor's already-suggested lookup
+    __table_args__ = (
+        Index("ix_sugg_status_date", "status", "date", "symbol"),
+        enum_check("status", SuggestionStatus, "trade_suggestions"),
+    )
 
 
 class Position(Base):
@@ -113,6 +197,14 @@ class Position(Base):
     """
 
     __tablename__ = "positions"
+    __table_args__ = (
+        # Sync and the swing monitor filter on status, then match by symbol
+        Index("ix_positions_status_symbol", "status", "symbol"),
+        # Learning reads positions closed since its last run, oldest first
+        Index("ix_positions_status_updated_at", "status", "updated_at"),
+        enum_check("status", PositionStatus, "positions"),
+        enum_check("exit_reason", ExitReason, "positions"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     suggestion_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("trade_suggestions.id"), unique=True)
@@ -131,23 +223,36 @@ class Position(Base):
     # Set on close
     exit_price: Mapped[Optional[float]] = mapped_column(Float)
     exit_date: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    exit_reason: Mapped[Optional[ExitReason]] = mapped_column(Enum(ExitReason))
+    exit_reason: Mapped[Optional[ExitReason]] = mapped_column(EnumStr(ExitReason))
     pnl_inr: Mapped[Optional[float]] = mapped_column(Float)
     pnl_pct: Mapped[Optional[float]] = mapped_column(Float)
     held_days: Mapped[Optional[int]] = mapped_column(Integer)
 
-    status: Mapped[PositionStatus] = mapped_column(Enum(PositionStatus), default=PositionStatus.OPEN, nullable=False)
+    status: Mapped[PositionStatus] = mapped_column(EnumStr(PositionStatus), default=PositionStatus.OPEN, nullable=False)
+    # Maintained by the database; hot-path filters use this instead of status
+    is_open: Mapped[bool] = mapped_column(Boolean, Computed("status = 'open'", persisted=True))
 
     # Slack thread for updates
-    slack_thread_ts: Mapped[Optional[str]] = mapped_column(String(50))
+    slack_thread_ts: Mapped[Optional[str]] = mapped_column(String(50), index=True)
 
     # True when the position was detected via broker sync — the user opened
     # this trade directly in the broker app without going through the bot.
     is_externally_created: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
 
-    suggestion: Mapped[Optional["TradeSuggestion"]] = relationship("TradeSuggestion", back_populates="position")
-    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Every reader of a position wants its suggestion; load them in one IN batch
+    suggestion: Mapped[Optional["TradeSuggestion"]] = relationship(
+        "TradeSuggestion", back_populates="position", lazy="selectin"
+    )
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
+
+
+# Partial index over just the open positions (the monitor's working set).
+# DDL renders a bare boolean column as-is, so spell out the comparison:
+# SQLite then gets "is_open = 1", exactly what `.where(Position.is_open)`
+# renders there; PostgreSQL folds "is_open = true" to "is_open" itself.
+_open_only = Position.is_open == true()
+Index("ix_positions_open", Position.is_open, postgresql_where=_open_only, sqlite_where=_open_only)
 
 
 class SignalPerformance(Base):
@@ -179,7 +284,7 @@ class SignalPerformance(Base):
     signal_weight: Mapped[float] = mapped_column(Float, default=1.0)
 
     last_calibrated: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
 
 class DailyJournal(Base):
@@ -200,7 +305,7 @@ class DailyJournal(Base):
     vix_level: Mapped[Optional[float]] = mapped_column(Float)
     sgx_nifty_gap: Mapped[Optional[float]] = mapped_column(Float)  # Overnight gap %
     key_levels: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON)  # {"support": 22100, "resistance": 22400}
-    watchlist_snapshot: Mapped[Optional[list[str]]] = mapped_column(JSON)  # Stocks flagged for swing setups today
+    watchlist_snapshot: Mapped[Optional[list[str]]] = mapped_column(SymbolList)  # Stocks flagged for swing setups today
     pre_market_summary: Mapped[Optional[str]] = mapped_column(Text)  # Human-readable brief
 
     # Live (updated each hourly monitor run)
@@ -209,7 +314,9 @@ class DailyJournal(Base):
     suggestions_skipped: Mapped[int] = mapped_column(Integer, default=0)
 
     # Broker sync tracking
-    fund_balance_inr: Mapped[float] = mapped_column(Float, default=0.0)  # Available margin at last sync
+    fund_balance_inr: Mapped[float] = mapped_column(
+        Numeric(12, 2, asdecimal=False), default=0.0
+    )  # Available margin at last sync, whole rupees
     fund_added_inr: Mapped[float] = mapped_column(Float, default=0.0)  # Net funds added today
     last_sync_at: Mapped[Optional[datetime]] = mapped_column(DateTime)  # Timestamp of most recent broker sync
 
@@ -219,5 +326,5 @@ class DailyJournal(Base):
     open_positions_count: Mapped[int] = mapped_column(Integer, default=0)
     post_market_review: Mapped[Optional[str]] = mapped_column(Text)  # What worked, what didn't
 
-    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
@@ -1,32 +1,83 @@
 """CRUD operations for SignalPerformance and DailyJournal."""
 
+from collections import Counter, defaultdict
 from datetime import datetime, date
+from functools import cached_property
+from typing import Any, Iterable, Protocol, Union
 
+from sqlalchemy import Float, bindparam, cast, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from src.db.models import DailyJournal, SignalPerformance
 
+# Smoothing factor for the rolling averages on SignalPerformance
+_ALPHA = 0.1
+
+_SIGNAL = (
+    select(SignalPerformance)
+    .where(
+        SignalPerformance.signal_name == bindparam("signal_name"),
+        SignalPerformance.timeframe == bindparam("timeframe"),
+    )
+    .limit(1)
+)
+# Best win rate first, as the stats command lists them
+_ALL_SIGNALS = select(SignalPerformance).order_by(
+    SignalPerformance.win_rate.desc(), SignalPerformance.id
+)
+
+# Today's DailyJournal id, keyed by its midnight
+_today_journal_id: dict[datetime, int] = {}
+
+
+class _UpsertInsert(Protocol):
+    """A dialect's `insert()`, whose statements support ON CONFLICT."""
+
+    def __call__(self, table: Any) -> Union[postgresql.Insert, sqlite.Insert]: ...
+
+
+# Dialects with INSERT … ON CONFLICT DO UPDATE; others take the ORM path
+_UPSERT_INSERT: dict[str, _UpsertInsert] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 
 class PerformanceRepository:
     def __init__(self, session: Session):
         self.session = session
 
+    @cached_property
+    def _today_midnight(self) -> datetime:
+        # Repositories live for one session, so this is fixed per unit of work
+        return datetime.combine(date.today(), datetime.min.time())
+
     # ── SignalPerformance ──────────────────────────────────────────────────
 
     def get_or_create_signal(
         self, signal_name: str, timeframe: str
     ) -> SignalPerformance:
-        sp = (
-            self.session.query(SignalPerformance)
-            .filter_by(signal_name=signal_name, timeframe=timeframe)
-            .first()
-        )
+        sp = self.session.scalars(
+            _SIGNAL, {"signal_name": signal_name, "timeframe": timeframe}
+        ).first()
         if not sp:
             sp = SignalPerformance(signal_name=signal_name, timeframe=timeframe)
             self.session.add(sp)
             self.session.flush()
         return sp
 
+    def get_signals_bulk(
+        self, pairs: Iterable[tuple[str, str]]
+    ) -> dict[tuple[str, str], SignalPerformance]:
+        """Existing rows for the given (signal_name, timeframe) pairs, in one query."""
+        pairs = list(pairs)
+        if not pairs:
+            return {}
+        key = tuple_(SignalPerformance.signal_name, SignalPerformance.timeframe)
+        rows = self.session.query(SignalPerformance).filter(key.in_(pairs)).all()
+        return {(sp.signal_name, sp.timeframe): sp for sp in rows}
+
     def record_signal_outcome(
         self,
         signal_name: str,
@@ -37,38 +88,110 @@ class PerformanceRepository:
         held_days: int,
     ) -> SignalPerformance:
         sp = self.get_or_create_signal(signal_name, timeframe)
-        sp.total_signals += 1
-        if was_executed:
-            sp.executed_signals += 1
-            if pnl_pct > 0:
-                sp.winning_trades += 1
-            # Rolling averages (exponential smoothing, alpha=0.1)
-            alpha = 0.1
-            sp.avg_pnl_pct = (1 - alpha) * sp.avg_pnl_pct + alpha * pnl_pct
-            sp.avg_risk_reward = (1 - alpha) * sp.avg_risk_reward + alpha * risk_reward
-            sp.avg_held_days = (1 - alpha) * sp.avg_held_days + alpha * held_days
-
-        if sp.executed_signals > 0:
-            sp.win_rate = sp.winning_trades / sp.executed_signals
-        sp.updated_at = datetime.utcnow()
+        _apply_outcome(sp, was_executed, pnl_pct, risk_reward, held_days)
         return sp
 
-    def get_all_signal_stats(self) -> list[SignalPerformance]:
-        return self.session.query(SignalPerformance).all()
+    def record_signal_outcomes(
+        self,
+        keys: Iterable[tuple[str, str]],
+        was_executed: bool,
+        pnl_pct: float = 0.0,
+        risk_reward: float = 0.0,
+        held_days: int = 0,
+    ) -> None:
+        """
+        `record_signal_outcome` for every (signal_name, timeframe) in `keys`,
+        as one INSERT … ON CONFLICT DO UPDATE instead of a SELECT + UPDATE
+        per signal. A key listed n times is applied n times, as the loop would.
+        """
+        counts = Counter(keys)
+        if not counts:
+            return
+        insert = _UPSERT_INSERT.get(self.session.get_bind().dialect.name)
+        if insert is None:
+            # No upsert: resolve every row in one SELECT, create the missing
+            # ones in one flush, then update in memory
+            found = self.get_signals_bulk(counts)
+            missing = [
+                SignalPerformance(signal_name=name, timeframe=timeframe)
+                for name, timeframe in counts
+                if (name, timeframe) not in found
+            ]
+            if missing:
+                self.session.add_all(missing)
+                self.session.flush()
+                found |= {(sp.signal_name, sp.timeframe): sp for sp in missing}
+            for key, n in counts.items():
+                for _ in range(n):
+                    _apply_outcome(
+                        found[key], was_executed, pnl_pct, risk_reward, held_days
+                    )
+            return
+
+        # One statement per repeat count: the smoothing decay depends on it
+        by_repeat: dict[int, list[tuple[str, str]]] = defaultdict(list)
+        for key, n in counts.items():
+            by_repeat[n].append(key)
+
+        self.session.flush()
+        now = datetime.utcnow()
+        for n, group in by_repeat.items():
+            self.session.execute(
+                _outcome_upsert(
+                    insert, group, n, was_executed, pnl_pct, risk_reward, held_days, now
+                )
+            )
+        # The statement bypassed the unit of work; drop any stale copies
+        for obj in list(self.session.identity_map.values()):
+            if isinstance(obj, SignalPerformance):
+                self.session.expire(obj)
+
+    def get_all_signal_stats(self) -> Iterable[SignalPerformance]:
+        """
+        Every signal's stats, best win rate first, streamed in batches
+        (a server-side cursor on PostgreSQL). Iterate it once.
+        """
+        return self.session.scalars(_ALL_SIGNALS, execution_options={"yield_per": 200})
 
     # ── DailyJournal ──────────────────────────────────────────────────────
 
     def get_or_create_today(self) -> DailyJournal:
-        today = date.today()
-        journal = (
-            self.session.query(DailyJournal)
-            .filter(DailyJournal.date >= datetime.combine(today, datetime.min.time()))
-            .first()
-        )
-        if not journal:
-            journal = DailyJournal(date=datetime.combine(today, datetime.min.time()))
-            self.session.add(journal)
-            self.session.flush()
+        """
+        Today's journal row, created on first use. Its id is remembered for
+        the process, so later calls are a primary-key get — free when the
+        row is already in this session's identity map.
+        """
+        midnight = self._today_midnight
+        journal_id = _today_journal_id.get(midnight)
+        if journal_id is not None:
+            cached = self.session.get(DailyJournal, journal_id)
+            # Gone if the transaction that created it rolled back
+            if cached is not None and cached.date >= midnight:
+                return cached
+
+        insert = _UPSERT_INSERT.get(self.session.get_bind().dialect.name)
+        if insert is not None:
+            # One race-free round-trip; the no-op DO UPDATE (rather than DO
+            # NOTHING) makes RETURNING yield the row when it already exists
+            stmt = insert(DailyJournal).values(date=midnight)
+            upsert = stmt.on_conflict_do_update(
+                index_elements=[DailyJournal.date], set_={"date": stmt.excluded.date}
+            ).returning(DailyJournal)
+            journal = self.session.scalars(upsert).one()
+        else:
+            existing = (
+                self.session.query(DailyJournal)
+                .filter(DailyJournal.date >= midnight)
+                .first()
+            )
+            if existing is not None:
+                journal = existing
+            else:
+                journal = DailyJournal(date=midnight)
+                self.session.add(journal)
+                self.session.flush()
+        _today_journal_id.clear()  # only today's id is ever worth keeping
+        _today_journal_id[midnight] = journal.id
         return journal
 
     def update_pre_market(
@@ -89,13 +212,26 @@ class PerformanceRepository:
         journal.pre_market_summary = summary
         return journal
 
-    def increment_suggestion_count(self, executed: bool = False, skipped: bool = False):
-        journal = self.get_or_create_today()
-        journal.suggestions_sent += 1
-        if executed:
-            journal.suggestions_executed += 1
-        if skipped:
-            journal.suggestions_skipped += 1
+    def increment_suggestion_count(
+        self, executed: bool = False, skipped: bool = False, sent: int = 1
+    ):
+        """
+        Atomic in-database increment (no read-modify-write), so concurrent
+        Slack actions cannot lose counts. Today's row is created on first use.
+        `sent` lets a batch of suggestions be counted in one UPDATE.
+        """
+        stmt = (
+            update(DailyJournal)
+            .where(DailyJournal.date >= self._today_midnight)
+            .values(
+                suggestions_sent=DailyJournal.suggestions_sent + sent,
+                suggestions_executed=DailyJournal.suggestions_executed + int(executed),
+                suggestions_skipped=DailyJournal.suggestions_skipped + int(skipped),
+            )
+        )
+        if self.session.execute(stmt).rowcount == 0:
+            self.get_or_create_today()
+            self.session.execute(stmt)
 
     def update_post_market(
         self, pnl_inr: float, pnl_pct: float, open_positions: int, review: str
@@ -106,3 +242,80 @@ class PerformanceRepository:
         journal.open_positions_count = open_positions
         journal.post_market_review = review
         return journal
+
+
+def _apply_outcome(
+    sp: SignalPerformance,
+    was_executed: bool,
+    pnl_pct: float,
+    risk_reward: float,
+    held_days: int,
+) -> None:
+    sp.total_signals += 1
+    if was_executed:
+        sp.executed_signals += 1
+        if pnl_pct > 0:
+            sp.winning_trades += 1
+        # Rolling averages (exponential smoothing)
+        alpha = _ALPHA
+        sp.avg_pnl_pct = (1 - alpha) * sp.avg_pnl_pct + alpha * pnl_pct
+        sp.avg_risk_reward = (1 - alpha) * sp.avg_risk_reward + alpha * risk_reward
+        sp.avg_held_days = (1 - alpha) * sp.avg_held_days + alpha * held_days
+
+    if sp.executed_signals > 0:
+        sp.win_rate = sp.winning_trades / sp.executed_signals
+    sp.updated_at = datetime.utcnow()
+
+
+def _outcome_upsert(
+    insert,
+    keys: list[tuple[str, str]],
+    n: int,
+    was_executed: bool,
+    pnl_pct: float,
+    risk_reward: float,
+    held_days: int,
+    now: datetime,
+):
+    """
+    Upsert applying one outcome `n` times to each key. Inserted rows hold
+    what `record_signal_outcome` would leave on a fresh row; conflicting rows
+    get the same increments, and the averages decay by (1 - alpha) ** n.
+    """
+    row = {"total_signals": n, "updated_at": now}
+    if was_executed:
+        wins = n if pnl_pct > 0 else 0
+        gain = 1 - (1 - _ALPHA) ** n
+        row |= {
+            "executed_signals": n,
+            "winning_trades": wins,
+            "win_rate": wins / n,
+            "avg_pnl_pct": gain * pnl_pct,
+            "avg_risk_reward": gain * risk_reward,
+            "avg_held_days": gain * held_days,
+        }
+    stmt = insert(SignalPerformance).values(
+        [{"signal_name": name, "timeframe": timeframe} | row for name, timeframe in keys]
+    )
+
+    col = SignalPerformance.__table__.c
+    new = stmt.excluded
+    set_ = {
+        "total_signals": col.total_signals + new.total_signals,
+        "updated_at": new.updated_at,
+    }
+    if was_executed:
+        keep = (1 - _ALPHA) ** n
+        executed = col.executed_signals + new.executed_signals
+        winning = col.winning_trades + new.winning_trades
+        set_ |= {
+            "executed_signals": executed,
+            "winning_trades": winning,
+            "win_rate": cast(winning, Float) / executed,
+            "avg_pnl_pct": keep * col.avg_pnl_pct + new.avg_pnl_pct,
+            "avg_risk_reward": keep * col.avg_risk_reward + new.avg_risk_reward,
+            "avg_held_days": keep * col.avg_held_days + new.avg_held_days,
+        }
+    return stmt.on_conflict_do_update(
+        index_elements=["signal_name", "timeframe"], set_=set_
+    )
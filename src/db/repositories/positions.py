@@ -1,11 +1,84 @@
 """CRUD operations for Position."""
 
 from datetime import datetime
+from typing import Mapping, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Float,
+    Integer,
+    Numeric,
+    and_,
+    bindparam,
+    case,
+    cast,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.functions import FunctionElement
 
 from src.db.models import Position, PositionStatus, ExitReason
 
+# The columns the monitor, post-market close and Slack commands read; others
+# (exit details, timestamps) load on access. suggestion_id feeds the selectin.
+_OPEN_OPTIONS = (
+    load_only(
+        Position.id,
+        Position.suggestion_id,
+        Position.symbol,
+        Position.action,
+        Position.entry_price,
+        Position.quantity,
+        Position.current_stop,
+        Position.target,
+        Position.slack_thread_ts,
+    ),
+    selectinload(Position.suggestion),
+)
+_OPEN = select(Position).where(Position.is_open).options(*_OPEN_OPTIONS)
+_OPEN_SYMBOLS = select(Position.symbol).where(Position.is_open)
+_OPEN_TOTALS = select(
+    func.count(Position.id),
+    func.coalesce(func.sum(Position.entry_price * Position.quantity), 0.0),
+).where(Position.is_open)
+_OPEN_ROWS = select(
+    Position.symbol,
+    Position.action,
+    Position.quantity,
+    Position.entry_price,
+    Position.current_stop,
+    Position.target,
+    Position.is_externally_created,
+).where(Position.is_open)
+_OPEN_BY_SYMBOL = select(Position).where(
+    Position.symbol == bindparam("symbol"), Position.is_open
+)
+# Float columns of a position, as loaded by close_many's RETURNING
+_FLOAT_COLUMNS = tuple(c.key for c in Position.__table__.c if isinstance(c.type, Float))
+
+
+class _days_between(FunctionElement):
+    """Whole days from the first timestamp to the second, like timedelta.days."""
+
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(_days_between)
+def _days_between_default(element, compiler, **kw):
+    start, end = (compiler.process(c, **kw) for c in element.clauses)
+    return f"CAST(julianday({end}) - julianday({start}) AS INTEGER)"
+
+
+@compiles(_days_between, "postgresql")
+def _days_between_postgresql(element, compiler, **kw):
+    start, end = (compiler.process(c, **kw) for c in element.clauses)
+    return f"CAST(EXTRACT(DAY FROM {end} - {start}) AS INTEGER)"
+
 
 class PositionRepository:
     def __init__(self, session: Session):
@@ -66,27 +139,136 @@ class PositionRepository:
         self.session.flush()
         return position
 
+    def get_by_id(self, position_id: int) -> Optional[Position]:
+        return self.session.get(Position, position_id)
+
     def get_open(self) -> list[Position]:
-        return (
-            self.session.query(Position)
-            .filter(Position.status == PositionStatus.OPEN)
-            .all()
+        return list(self.session.scalars(_OPEN))
+
+    def get_open_symbols(self) -> list[str]:
+        """Symbol of every open position (one entry per position), without loading rows."""
+        return list(self.session.scalars(_OPEN_SYMBOLS))
+
+    def get_exits(
+        self, prices: Mapping[str, float]
+    ) -> list[tuple[Position, float, bool]]:
+        """
+        `(position, price, hit_target)` for each open position whose symbol's
+        price in `prices` has reached its target or stop; target wins if both
+        are crossed. The comparison runs in SQL so only triggered positions
+        are loaded. Positions without a price, or missing a stop or target,
+        are never returned.
+        """
+        if not prices:
+            return []
+        price = case(dict(prices), value=Position.symbol)
+        is_buy = Position.action == "BUY"
+        hit_target = or_(
+            and_(is_buy, price >= Position.target),
+            and_(~is_buy, price <= Position.target),
         )
+        hit_stop = or_(
+            and_(is_buy, price <= Position.current_stop),
+            and_(~is_buy, price >= Position.current_stop),
+        )
+        stmt = (
+            select(Position, price.label("price"), hit_target.label("hit_target"))
+            .where(
+                Position.is_open,
+                Position.symbol.in_(list(prices)),
+                Position.target.is_not(None),
+                Position.current_stop.is_not(None),
+                or_(hit_target, hit_stop),
+            )
+            .options(*_OPEN_OPTIONS)
+            .order_by(Position.id)
+        )
+        return [
+            (pos, float(p), bool(target))
+            for pos, p, target in self.session.execute(stmt)
+        ]
 
     def get_by_symbol(self, symbol: str) -> list[Position]:
+        return list(self.session.scalars(_OPEN_BY_SYMBOL, {"symbol": symbol}))
+
+    def get_closed_since(self, since: datetime) -> list[Position]:
+        """Positions closed (or edited after closing) after `since`, oldest first."""
         return (
             self.session.query(Position)
-            .filter(Position.symbol == symbol, Position.status == PositionStatus.OPEN)
+            .filter(Position.status == PositionStatus.CLOSED, Position.updated_at > since)
+            .order_by(Position.updated_at)
             .all()
         )
 
-    def close(
-        self, position_id: int, exit_price: float, reason: ExitReason
-    ) -> Position:
+    def close_many(
+        self, items: list[tuple[int, float, ExitReason]]
+    ) -> list[Position]:
+        """
+        Close several open positions at once from (id, exit price, reason).
+        One UPDATE … RETURNING computes exit, P&L and held days in SQL;
+        positions that are missing or already closed (e.g. by a concurrent
+        broker sync) are left alone and omitted from the result, which
+        otherwise follows the order of `items`.
+        """
+        if not items:
+            return []
+        exit_date = datetime.utcnow()
+        if not self.session.get_bind().dialect.update_returning:
+            closed = (self._close_one(*item, exit_date) for item in items)
+            return [p for p in closed if p is not None]
+
+        ids = [position_id for position_id, _, _ in items]
+        exit_price = case(
+            {position_id: price for position_id, price, _ in items},
+            value=Position.id,
+        )
+        cost = Position.entry_price * Position.quantity
+        pnl_inr = case(
+            (Position.action == "BUY", (exit_price - Position.entry_price) * Position.quantity),
+            else_=(Position.entry_price - exit_price) * Position.quantity,
+        )
+        pnl_pct = cast(func.round(cast(pnl_inr / cost * 100, Numeric), 2), Float)
+        stmt = (
+            update(Position)
+            .where(Position.id.in_(ids), Position.is_open)
+            .values(
+                exit_price=exit_price,
+                exit_date=exit_date,
+                exit_reason=case(
+                    {position_id: reason.value for position_id, _, reason in items},
+                    value=Position.id,
+                ),
+                status=PositionStatus.CLOSED,
+                held_days=_days_between(Position.entry_date, exit_date),
+                pnl_inr=pnl_inr,
+                pnl_pct=pnl_pct,
+            )
+            .returning(Position)
+        )
+        by_id = {
+            p.id: p
+            for p in self.session.scalars(
+                stmt, execution_options={"populate_existing": True}
+            )
+        }
+        if self.session.get_bind().dialect.name == "sqlite":
+            # SQLite's RETURNING hands whole-number REALs back as ints (-6, not
+            # -6.0); restore the floats any other read of these columns gives
+            for p in by_id.values():
+                for key in _FLOAT_COLUMNS:
+                    value = p.__dict__.get(key)
+                    if isinstance(value, int):
+                        set_committed_value(p, key, float(value))
+        return [by_id[i] for i in ids if i in by_id]
+
+    def _close_one(
+        self, position_id: int, exit_price: float, reason: ExitReason, exit_date: datetime
+    ) -> Optional[Position]:
         p = self.session.get(Position, position_id)
-        assert p is not None, f"Position {position_id} not found"
+        if p is None or p.status != PositionStatus.OPEN:
+            return None
         p.exit_price = exit_price
-        p.exit_date = datetime.utcnow()
+        p.exit_date = exit_date
         p.exit_reason = reason
         p.status = PositionStatus.CLOSED
         p.held_days = (p.exit_date - p.entry_date).days
@@ -105,21 +287,26 @@ class PositionRepository:
         p.current_stop = new_stop
         return p
 
+    def get_portfolio_totals(self) -> dict:
+        """Count and capital invested across open positions, aggregated in SQL."""
+        count, invested = self.session.execute(_OPEN_TOTALS).one()
+        return {"count": count, "total_invested_inr": float(invested)}
+
     def get_portfolio_summary(self) -> dict:
-        open_positions = self.get_open()
-        total_invested = sum(p.entry_price * p.quantity for p in open_positions)
-        return {
-            "count": len(open_positions),
-            "positions": [
-                {
-                    "symbol": p.symbol,
-                    "action": p.action,
-                    "qty": p.quantity,
-                    "entry": p.entry_price,
-                    "stop": p.current_stop,
-                    "target": p.target,
-                }
-                for p in open_positions
-            ],
-            "total_invested_inr": total_invested,
-        }
+        """`get_portfolio_totals()` plus the open positions as plain rows."""
+        return self.get_portfolio_totals() | {"positions": self.get_open_rows()}
+
+    def get_open_rows(self) -> list[dict]:
+        """Open positions as plain dicts, straight from the columns — no ORM objects."""
+        return [
+            {
+                "symbol": r.symbol,
+                "action": r.action,
+                "qty": r.quantity,
+                "entry": r.entry_price,
+                "stop": r.current_stop,
+                "target": r.target,
+                "is_externally_created": r.is_externally_created,
+            }
+            for r in self.session.execute(_OPEN_ROWS)
+        ]
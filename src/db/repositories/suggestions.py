@@ -1,69 +1,144 @@
 """CRUD operations for TradeSuggestion."""
 
 from datetime import datetime, date
+from functools import cached_property
 from typing import Optional
 
+from sqlalchemy import bindparam, case, insert, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
 
 from src.db.models import TradeSuggestion, SuggestionStatus
 
+# A suggestion by the Slack message it was posted as
+_BY_SLACK_TS = (
+    select(TradeSuggestion)
+    .where(TradeSuggestion.slack_ts == bindparam("slack_ts"))
+    .limit(1)
+)
+# Today's pending suggestions, as rows or just their symbols; "since" is midnight
+_PENDING_SINCE_CLAUSE = (
+    TradeSuggestion.status == SuggestionStatus.PENDING,
+    TradeSuggestion.date >= bindparam("since"),
+)
+_PENDING_SINCE = select(TradeSuggestion).where(*_PENDING_SINCE_CLAUSE)
+_PENDING_SYMBOLS_SINCE = select(TradeSuggestion.symbol).where(*_PENDING_SINCE_CLAUSE)
+
 
 class SuggestionRepository:
     def __init__(self, session: Session):
         self.session = session
 
+    @cached_property
+    def _today_midnight(self) -> datetime:
+        # Shared by the pending-today lookups and expire_stale within one session
+        return datetime.combine(date.today(), datetime.min.time())
+
     def create(self, **kwargs) -> TradeSuggestion:
         suggestion = TradeSuggestion(**kwargs)
         self.session.add(suggestion)
         self.session.flush()
         return suggestion
 
+    def create_many(self, rows: list[dict]) -> list[int]:
+        """
+        Insert several suggestions (column → value dicts) in one round-trip.
+        Returns the new ids in the order of `rows`; no ORM objects are built.
+        """
+        if not rows:
+            return []
+        stmt = insert(TradeSuggestion).returning(
+            TradeSuggestion.id, sort_by_parameter_order=True
+        )
+        return list(self.session.scalars(stmt, rows))
+
+    def set_slack_ts(self, ts_by_id: dict[int, str]) -> None:
+        """Record the Slack message ts of several suggestions with one UPDATE."""
+        if not ts_by_id:
+            return
+        self.session.execute(
+            update(TradeSuggestion)
+            .where(TradeSuggestion.id.in_(list(ts_by_id)))
+            .values(slack_ts=case(ts_by_id, value=TradeSuggestion.id)),
+            execution_options={"synchronize_session": False},
+        )
+
     def get_by_id(self, suggestion_id: int) -> Optional[TradeSuggestion]:
         return self.session.get(TradeSuggestion, suggestion_id)
 
     def get_by_slack_ts(self, slack_ts: str) -> Optional[TradeSuggestion]:
-        return (
-            self.session.query(TradeSuggestion)
-            .filter(TradeSuggestion.slack_ts == slack_ts)
-            .first()
-        )
+        return self.session.scalars(_BY_SLACK_TS, {"slack_ts": slack_ts}).first()
 
     def get_pending_today(self) -> list[TradeSuggestion]:
-        today = date.today()
-        return (
-            self.session.query(TradeSuggestion)
-            .filter(
-                TradeSuggestion.status == SuggestionStatus.PENDING,
-                TradeSuggestion.date >= datetime.combine(today, datetime.min.time()),
-            )
-            .all()
+        return list(
+            self.session.scalars(_PENDING_SINCE, {"since": self._today_midnight})
+        )
+
+    def get_pending_today_symbols(self) -> set[str]:
+        """Symbols with a pending suggestion today — read from the index, no ORM rows."""
+        return set(
+            self.session.scalars(_PENDING_SYMBOLS_SINCE, {"since": self._today_midnight})
         )
 
     def mark_executed(self, suggestion_id: int, notes: str = "") -> TradeSuggestion:
-        s = self.get_by_id(suggestion_id)
-        assert s is not None, f"TradeSuggestion {suggestion_id} not found"
-        s.status = SuggestionStatus.EXECUTED
-        s.user_response_at = datetime.utcnow()
-        s.user_notes = notes
-        return s
+        return self._mark(suggestion_id, SuggestionStatus.EXECUTED, notes)
 
     def mark_skipped(self, suggestion_id: int, notes: str = "") -> TradeSuggestion:
-        s = self.get_by_id(suggestion_id)
+        return self._mark(suggestion_id, SuggestionStatus.SKIPPED, notes)
+
+    def _mark(
+        self, suggestion_id: int, status: SuggestionStatus, notes: str
+    ) -> TradeSuggestion:
+        """
+        Record the user's response. A suggestion not already in the session
+        is updated with one UPDATE … RETURNING instead of SELECT then UPDATE.
+        """
+        values = {
+            "status": status,
+            "user_response_at": datetime.utcnow(),
+            "user_notes": notes,
+        }
+        key = identity_key(TradeSuggestion, suggestion_id)
+        if (
+            key in self.session.identity_map
+            or not self.session.get_bind().dialect.update_returning
+        ):
+            s = self.get_by_id(suggestion_id)
+            assert s is not None, f"TradeSuggestion {suggestion_id} not found"
+            for name, value in values.items():
+                setattr(s, name, value)
+            return s
+
+        stmt = (
+            update(TradeSuggestion)
+            .where(TradeSuggestion.id == suggestion_id)
+            .values(values)
+            .returning(TradeSuggestion)
+        )
+        s = self.session.scalars(
+            stmt, execution_options={"synchronize_session": False}
+        ).first()
         assert s is not None, f"TradeSuggestion {suggestion_id} not found"
-        s.status = SuggestionStatus.SKIPPED
-        s.user_response_at = datetime.utcnow()
-        s.user_notes = notes
         return s
 
     def expire_stale(self) -> int:
-        """Mark all pending suggestions from previous days as expired."""
-        today = date.today()
+        """
+        Mark all pending suggestions from previous days as expired, in one
+        UPDATE. Loaded TradeSuggestion objects are not synchronised — call
+        `session.expire_all()` first if you hold references to them.
+        """
         result = (
             self.session.query(TradeSuggestion)
             .filter(
                 TradeSuggestion.status == SuggestionStatus.PENDING,
-                TradeSuggestion.date < datetime.combine(today, datetime.min.time()),
+                TradeSuggestion.date < self._today_midnight,
+            )
+            .update(
+                {
+                    TradeSuggestion.status: SuggestionStatus.EXPIRED,
+                    TradeSuggestion.user_response_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
             )
-            .update({"status": SuggestionStatus.EXPIRED})
         )
         return result
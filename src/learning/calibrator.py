@@ -11,7 +11,12 @@ Weights are written to SignalPerformance table and loaded into config at startup
 """
 
 import logging
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy import case, select, update
 
 from src.db.connection import get_session
 from src.db.models import SignalPerformance
@@ -26,6 +31,9 @@ _LOW_AVG_PNL = -1.0  # %
 _WEIGHT_STEP = 0.1
 _MAX_WEIGHT = 2.0
 _MIN_WEIGHT = 0.1
+_WEIGHTS_TTL = 3600  # seconds; weights only change when run() calibrates
+
+_weights_lock = threading.Lock()
 
 
 def run() -> dict[str, float]:
@@ -36,8 +44,20 @@ def run() -> dict[str, float]:
     logger.info("Running signal calibrator")
     updated_weights: dict[str, float] = {}
 
+    calibrated: dict[int, float] = {}
+
     with get_session() as session:
-        stats: list[SignalPerformance] = session.query(SignalPerformance).all()
+        # Only the columns the rules read; weights are written back in one UPDATE
+        stats = session.execute(
+            select(
+                SignalPerformance.id,
+                SignalPerformance.signal_name,
+                SignalPerformance.executed_signals,
+                SignalPerformance.win_rate,
+                SignalPerformance.avg_pnl_pct,
+                SignalPerformance.signal_weight,
+            )
+        ).all()
 
         for sp in stats:
             if sp.executed_signals < _MIN_TRADES_FOR_CALIBRATION:
@@ -71,19 +91,43 @@ def run() -> dict[str, float]:
                     f"(win_rate={sp.win_rate:.0%}, avg_pnl={sp.avg_pnl_pct:+.1f}%)"
                 )
 
-            sp.signal_weight = new_weight
-            sp.last_calibrated = datetime.utcnow()
+            calibrated[sp.id] = new_weight
             updated_weights[sp.signal_name] = new_weight
 
+        if calibrated:
+            session.execute(
+                update(SignalPerformance)
+                .where(SignalPerformance.id.in_(calibrated))
+                .values(
+                    signal_weight=case(calibrated, value=SignalPerformance.id),
+                    last_calibrated=datetime.utcnow(),
+                ),
+                execution_options={"synchronize_session": False},
+            )
+
+    _weights_cached.cache_clear()
     logger.info(f"Calibration complete: {updated_weights}")
     return updated_weights
 
 
 def get_current_weights() -> dict[str, float]:
-    """Load weights from DB for use in screener. Falls back to 1.0 if no data."""
+    """
+    Load weights from DB for use in screener. Falls back to 1.0 if no data.
+    Cached for up to an hour; `run()` drops the cache once it has committed.
+    """
+    with _weights_lock:
+        weights = _weights_cached(int(time.time() // _WEIGHTS_TTL))
+    return dict(weights)
+
+
+@lru_cache(maxsize=1)
+def _weights_cached(bucket: int) -> tuple[tuple[str, float], ...]:
+    """`bucket` is the current TTL window; a new window misses the cache."""
     with get_session() as session:
-        stats = session.query(SignalPerformance).all()
-        return {sp.signal_name: sp.signal_weight for sp in stats}
+        rows = session.execute(
+            select(SignalPerformance.signal_name, SignalPerformance.signal_weight)
+        ).all()
+    return tuple((name, weight) for name, weight in rows)
 
 
 if __name__ == "__main__":
@@ -36,11 +36,8 @@ class OutcomeTracker:
         if not position.suggestion_id:
             return
 
-        suggestion: Optional[TradeSuggestion] = (
-            self.session.query(TradeSuggestion)
-            .filter(TradeSuggestion.id == position.suggestion_id)
-            .first()
-        )
+        # Loaded with the position (Position.suggestion is selectin)
+        suggestion: Optional[TradeSuggestion] = position.suggestion
         if not suggestion or not suggestion.signals_fired:
             return
 
@@ -54,40 +51,40 @@ class OutcomeTracker:
         )
         actual_rr = round(realised / risk, 2) if risk > 0 else 0.0
 
-        for signal_dict in suggestion.signals_fired:
-            signal_name = signal_dict.get("signal_name")
-            timeframe = signal_dict.get("timeframe", suggestion.timeframe)
-            if not signal_name:
-                continue
-            try:
-                self.perf_repo.record_signal_outcome(
-                    signal_name=signal_name,
-                    timeframe=timeframe,
-                    was_executed=True,
-                    pnl_pct=pnl_pct,
-                    risk_reward=actual_rr,
-                    held_days=held_days,
-                )
-                logger.debug(
-                    f"Recorded outcome for {signal_name}: "
-                    f"P&L {pnl_pct:+.1f}%, R:R {actual_rr}, held {held_days}d"
-                )
-            except Exception as e:
-                logger.error(f"Failed to record outcome for signal {signal_name}: {e}")
+        keys = _signal_keys(suggestion)
+        try:
+            self.perf_repo.record_signal_outcomes(
+                keys,
+                was_executed=True,
+                pnl_pct=pnl_pct,
+                risk_reward=actual_rr,
+                held_days=held_days,
+            )
+            logger.debug(
+                f"Recorded outcome for {', '.join(name for name, _ in keys)}: "
+                f"P&L {pnl_pct:+.1f}%, R:R {actual_rr}, held {held_days}d"
+            )
+        except Exception as e:
+            logger.error(f"Failed to record outcomes for {position.symbol}: {e}")
 
     def record_skipped(self, suggestion: TradeSuggestion) -> None:
         """
         When a suggestion is skipped, still count it as a signal fired
         (so the denominator for execution rate is accurate).
         """
-        for signal_dict in suggestion.signals_fired or []:
-            signal_name = signal_dict.get("signal_name")
-            timeframe = signal_dict.get("timeframe", suggestion.timeframe)
-            if not signal_name:
-                continue
-            try:
-                sp = self.perf_repo.get_or_create_signal(signal_name, timeframe)
-                sp.total_signals += 1
-                # Not executed, so win metrics unchanged
-            except Exception as e:
-                logger.error(f"Failed to record skipped for {signal_name}: {e}")
+        try:
+            # Not executed, so win metrics unchanged
+            self.perf_repo.record_signal_outcomes(
+                _signal_keys(suggestion), was_executed=False
+            )
+        except Exception as e:
+            logger.error(f"Failed to record skipped for {suggestion.symbol}: {e}")
+
+
+def _signal_keys(suggestion: TradeSuggestion) -> list[tuple[str, str]]:
+    """(signal_name, timeframe) for each named signal behind a suggestion."""
+    return [
+        (d["signal_name"], d.get("timeframe", suggestion.timeframe))
+        for d in suggestion.signals_fired or []
+        if d.get("signal_name")
+    ]
@@ -0,0 +1,416 @@
+"""
+On-disk cache of daily OHLCV history, layered over a broker adapter.
+
+Completed daily candles never change, so each symbol's bars are kept in a
+parquet file under `settings.ohlcv_cache_dir` and only the missing tail is
+requested from the broker on later runs. Today's (possibly incomplete)
+candle is returned to the caller but never persisted.
+
+Each file records the window it covers in its schema metadata, so holidays
+and weekends at either end of the window are not mistaken for gaps.
+
+Intraday intervals are not merged incrementally. Instead, a request whose
+window ended before today is cached whole, keyed by (symbol, interval,
+window), so repeated identical requests (backtests, dev sessions) skip
+the broker.
+"""
+
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.broker.base import BrokerBase
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Only daily candles are immutable once the session closes.
+_CACHED_INTERVALS = {"day"}
+
+_META_FROM = b"covered_from"
+_META_TO = b"covered_to"
+
+
+@lru_cache(maxsize=512)
+def _read_cached(
+    path: str, mtime_ns: int
+) -> tuple[pd.DataFrame, datetime, datetime]:
+    """
+    Load one cache file. Keyed on mtime so a rewrite invalidates the entry;
+    repeated reads within a process hit memory instead of disk.
+    """
+    table = pq.read_table(path, memory_map=True)
+    meta = table.schema.metadata or {}
+    covered_from = datetime.fromisoformat(meta[_META_FROM].decode())
+    covered_to = datetime.fromisoformat(meta[_META_TO].decode())
+    return table.to_pandas(), covered_from, covered_to
+
+
+def _bound(ts: datetime, index: pd.Index) -> pd.Timestamp:
+    """Naive datetime as a Timestamp comparable with `index` (tz-aware or not)."""
+    stamp = pd.Timestamp(ts)
+    tz = getattr(index, "tz", None)
+    if tz is not None and stamp.tzinfo is None:
+        stamp = stamp.tz_localize(tz)
+    return stamp
+
+
+def _between(df: pd.DataFrame, from_date: datetime, to_date: datetime) -> pd.DataFrame:
+    if df.empty:
+        return df
+    lo, hi = _bound(from_date, df.index), _bound(to_date, df.index)
+    return df[(df.index >= lo) & (df.index <= hi)]
+
+
+def _bulk_fetch_fallback(
+    broker: BrokerBase,
+    symbols: list[str],
+    interval: str,
+    from_date: datetime,
+    to_date: datetime,
+    max_workers: int,
+    exchange: str = "NSE",
+) -> dict[str, pd.DataFrame]:
+    """
+    Per-symbol fetch for adapters without `get_historical_data_bulk`.
+    Calls are issued concurrently; failed symbols are logged and omitted.
+    """
+
+    def _fetch(symbol: str) -> pd.DataFrame:
+        return broker.get_historical_data(
+            symbol,
+            interval=interval,
+            from_date=from_date,
+            to_date=to_date,
+            exchange=exchange,
+        )
+
+    frames: dict[str, pd.DataFrame] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as pool:
+        futures = {pool.submit(_fetch, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                frames[symbol] = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to fetch data for {symbol}: {e}")
+    return frames
+
+
+class CachedOHLCVProvider:
+    """
+    Drop-in source of historical data for the screener. Mirrors the broker's
+    `get_historical_data` / `get_historical_data_bulk` signatures.
+
+    Pass `cache_dir=""` (or leave `settings.ohlcv_cache_dir` empty) to
+    disable the disk layer and go straight to the broker.
+    """
+
+    def __init__(
+        self,
+        broker: BrokerBase,
+        cache_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.broker = broker
+        cache_dir = settings.ohlcv_cache_dir if cache_dir is None else cache_dir
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.max_workers = max_workers or settings.screener_max_workers
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def get_historical_data(
+        self,
+        symbol: str,
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+        exchange: str = "NSE",
+        use_cache: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Single-symbol fetch. Broker errors propagate to the caller.
+        `use_cache=False` goes straight to the broker (live paths).
+        """
+        if not use_cache or self.cache_dir is None:
+            return self.broker.get_historical_data(
+                symbol, interval=interval, from_date=from_date, to_date=to_date,
+                exchange=exchange,
+            )
+        if not self._cacheable(interval):
+            return self._fetch_window(symbol, interval, from_date, to_date, exchange)
+        cached, covered_from, fetch_from = self._load(symbol, interval, exchange, from_date)
+        fresh = None
+        if fetch_from < to_date:
+            fresh = self.broker.get_historical_data(
+                symbol, interval=interval, from_date=fetch_from, to_date=to_date,
+                exchange=exchange,
+            )
+        return self._merge(
+            symbol, interval, exchange, cached, covered_from, fresh, from_date, to_date
+        )
+
+    def get_historical_data_bulk(
+        self,
+        symbols: list[str],
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+        exchange: str = "NSE",
+    ) -> dict[str, pd.DataFrame]:
+        """
+        History for many symbols. Only symbols whose cache is stale reach the
+        broker, grouped by the date their missing tail starts. Symbols that
+        could not be fetched are absent from the result.
+        """
+        if self.cache_dir is None:
+            return self._fetch_many(symbols, interval, from_date, to_date, exchange)
+        if not self._cacheable(interval):
+            return self._fetch_windows(symbols, interval, from_date, to_date, exchange)
+
+        loaded: dict[str, tuple[Optional[pd.DataFrame], datetime]] = {}
+        stale: dict[datetime, list[str]] = {}
+        for symbol in symbols:
+            cached, covered_from, fetch_from = self._load(symbol, interval, exchange, from_date)
+            loaded[symbol] = (cached, covered_from)
+            if fetch_from < to_date:
+                stale.setdefault(fetch_from, []).append(symbol)
+
+        fresh: dict[str, pd.DataFrame] = {}
+        for fetch_from, group in stale.items():
+            fresh.update(self._fetch_many(group, interval, fetch_from, to_date, exchange))
+
+        n_stale = sum(len(group) for group in stale.values())
+        logger.info(
+            f"OHLCV cache: {len(symbols) - n_stale} warm, {n_stale} fetched from broker"
+        )
+
+        failed = {s for group in stale.values() for s in group} - fresh.keys()
+        frames: dict[str, pd.DataFrame] = {}
+        for symbol in symbols:
+            # A failed tail fetch skips the symbol rather than screening on
+            # history that silently stops short.
+            if symbol in failed:
+                continue
+            cached, covered_from = loaded[symbol]
+            frames[symbol] = self._merge(
+                symbol, interval, exchange, cached, covered_from,
+                fresh.get(symbol), from_date, to_date,
+            )
+        return frames
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _cacheable(self, interval: str) -> bool:
+        return self.cache_dir is not None and interval in _CACHED_INTERVALS
+
+    def _path(self, symbol: str, interval: str, exchange: str) -> Path:
+        assert self.cache_dir is not None  # only reached once _cacheable() passed
+        key = hashlib.sha1(f"{exchange}:{symbol}:{interval}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.parquet"
+
+    def _window_path(
+        self, symbol: str, interval: str, exchange: str, from_date: datetime, to_date: datetime
+    ) -> Optional[Path]:
+        """
+        Cache file for an exact request window, or None if there is no cache
+        directory or the window is not yet complete.
+        """
+        if self.cache_dir is None:
+            return None
+        if to_date >= datetime.combine(date.today(), datetime.min.time()):
+            return None
+        key = hashlib.sha1(
+            f"{exchange}:{symbol}:{interval}:{from_date.isoformat()}:{to_date.isoformat()}".encode()
+        ).hexdigest()
+        return self.cache_dir / "windows" / f"{key}.parquet"
+
+    def _fetch_window(
+        self,
+        symbol: str,
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+        exchange: str,
+    ) -> pd.DataFrame:
+        path = self._window_path(symbol, interval, exchange, from_date, to_date)
+        cached = self._read_window(symbol, path)
+        if cached is not None:
+            return cached
+        df = self.broker.get_historical_data(
+            symbol, interval=interval, from_date=from_date, to_date=to_date,
+            exchange=exchange,
+        )
+        self._write_window(symbol, path, df, from_date, to_date)
+        return df
+
+    def _fetch_windows(
+        self,
+        symbols: list[str],
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+        exchange: str,
+    ) -> dict[str, pd.DataFrame]:
+        """Bulk form of `_fetch_window`: only uncached windows reach the broker."""
+        paths = {
+            s: self._window_path(s, interval, exchange, from_date, to_date) for s in symbols
+        }
+        frames: dict[str, pd.DataFrame] = {}
+        for symbol, path in paths.items():
+            cached = self._read_window(symbol, path)
+            if cached is not None:
+                frames[symbol] = cached
+        missing = [s for s in symbols if s not in frames]
+        if missing:
+            fresh = self._fetch_many(missing, interval, from_date, to_date, exchange)
+            for symbol, df in fresh.items():
+                self._write_window(symbol, paths[symbol], df, from_date, to_date)
+            frames.update(fresh)
+        return frames
+
+    def _read_window(self, symbol: str, path: Optional[Path]) -> Optional[pd.DataFrame]:
+        if path is None:
+            return None
+        try:
+            df, _, _ = _read_cached(str(path), path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable OHLCV cache for {symbol}: {e}")
+            return None
+        # The frame is shared with _read_cached's entry; callers may mutate theirs
+        return df.copy()
+
+    def _write_window(
+        self,
+        symbol: str,
+        path: Optional[Path],
+        df: pd.DataFrame,
+        from_date: datetime,
+        to_date: datetime,
+    ) -> None:
+        if path is not None and not df.empty:
+            self._write(symbol, path, df, from_date, to_date)
+
+    def _load(
+        self, symbol: str, interval: str, exchange: str, from_date: datetime
+    ) -> tuple[Optional[pd.DataFrame], datetime, datetime]:
+        """
+        Return (cached bars or None, start of the window they cover, date the
+        broker fetch should start from). A cache that does not reach back to
+        `from_date`, or that ends before it, is ignored and refetched whole.
+        """
+        path = self._path(symbol, interval, exchange)
+        try:
+            df, covered_from, covered_to = _read_cached(str(path), path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            return None, from_date, from_date
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable OHLCV cache for {symbol}: {e}")
+            return None, from_date, from_date
+        if covered_from > from_date or covered_to < from_date:
+            return None, from_date, from_date
+        return df, covered_from, covered_to
+
+    def _merge(
+        self,
+        symbol: str,
+        interval: str,
+        exchange: str,
+        cached: Optional[pd.DataFrame],
+        covered_from: datetime,
+        fresh: Optional[pd.DataFrame],
+        from_date: datetime,
+        to_date: datetime,
+    ) -> pd.DataFrame:
+        """Combine cached and freshly fetched bars, persist, and slice to the window."""
+        if fresh is None or fresh.empty:
+            merged = cached if cached is not None else fresh
+        elif cached is None or cached.empty:
+            merged = fresh
+        else:
+            merged = pd.concat([cached, fresh])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+        if fresh is not None:
+            self._store(symbol, interval, exchange, merged, covered_from, to_date)
+        return _between(merged, from_date, to_date)
+
+    def _store(
+        self,
+        symbol: str,
+        interval: str,
+        exchange: str,
+        merged: pd.DataFrame,
+        covered_from: datetime,
+        to_date: datetime,
+    ) -> None:
+        """Persist completed bars. Written to a temp file, then renamed into place."""
+        today = datetime.combine(date.today(), datetime.min.time())
+        covered_to = min(to_date, today)
+        if covered_to <= covered_from or merged.empty:
+            return
+
+        complete = merged[merged.index < _bound(covered_to, merged.index)]
+        self._write(
+            symbol, self._path(symbol, interval, exchange), complete, covered_from, covered_to
+        )
+
+    def _write(
+        self,
+        symbol: str,
+        path: Path,
+        df: pd.DataFrame,
+        from_date: datetime,
+        to_date: datetime,
+    ) -> None:
+        """Write bars plus their covered window. Temp file, then renamed into place."""
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _META_FROM: from_date.isoformat().encode(),
+            _META_TO: to_date.isoformat().encode(),
+        })
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, tmp, compression="zstd")
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Failed to write OHLCV cache for {symbol}: {e}")
+            tmp.unlink(missing_ok=True)
+
+    def _fetch_many(
+        self,
+        symbols: list[str],
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+        exchange: str,
+    ) -> dict[str, pd.DataFrame]:
+        """Prefer the adapter's bulk endpoint; otherwise fan out per symbol."""
+        if hasattr(self.broker, "get_historical_data_bulk"):
+            try:
+                return self.broker.get_historical_data_bulk(
+                    symbols,
+                    interval=interval,
+                    from_date=from_date,
+                    to_date=to_date,
+                    exchange=exchange,
+                )
+            except Exception as e:
+                logger.warning(f"Bulk historical fetch failed ({e}); fetching per symbol")
+        return _bulk_fetch_fallback(
+            self.broker, symbols, interval, from_date, to_date, self.max_workers, exchange
+        )
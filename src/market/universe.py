@@ -2,15 +2,21 @@
 Fetches the live Nifty 200 constituent list from NSE archives.
 Used by pipelines to build a fresh stock universe each trading day.
 
-Result is cached in-process (Nifty 200 rebalances quarterly, so one
-fetch per process startup is sufficient).
+Result is cached in-process, and on disk for a day (Nifty 200 rebalances
+quarterly). A stale disk copy is revalidated with a conditional GET and
+still beats the watchlist fallback if NSE is unreachable.
 """
 
+import csv
 import io
+import json
 import logging
+import os
+import time
 from functools import lru_cache
+from pathlib import Path
+from typing import Optional
 
-import pandas as pd
 import requests
 
 from src.config import get_settings
@@ -20,28 +26,99 @@ logger = logging.getLogger(__name__)
 _NSE_NIFTY200_CSV = (
     "https://archives.nseindia.com/content/indices/ind_nifty200list.csv"
 )
+_CACHE_MAX_AGE = 24 * 3600  # seconds
 
 
 @lru_cache(maxsize=1)
 def get_nifty200_symbols() -> list[str]:
     """
     Return current Nifty 200 constituents as a list of NSE symbols.
-    Falls back to settings.watchlist if the NSE fetch fails.
+    Falls back to the last cached list, then settings.watchlist, if the
+    NSE fetch fails.
     """
+    path = _cache_path()
+    cached = _read_cache(path)
+    # A cached list implies a cache path; the path checks narrow the type for mypy
+    if (
+        path is not None
+        and cached is not None
+        and time.time() - path.stat().st_mtime < _CACHE_MAX_AGE
+    ):
+        return cached["symbols"]
+
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
     try:
-        resp = requests.get(
-            _NSE_NIFTY200_CSV,
-            timeout=15,
-            headers={"User-Agent": "Mozilla/5.0"},
-        )
+        resp = requests.get(_NSE_NIFTY200_CSV, timeout=15, headers=headers)
+        if resp.status_code == 304 and path is not None and cached is not None:
+            path.touch()
+            return cached["symbols"]
         resp.raise_for_status()
-        df = pd.read_csv(io.StringIO(resp.text))
-        symbols = df["Symbol"].str.strip().tolist()
+        symbols = _parse_symbols(resp.text)
         logger.info(f"Loaded {len(symbols)} Nifty 200 constituents from NSE")
-        return symbols
     except Exception as e:
+        if cached is not None:
+            logger.warning(f"Failed to fetch Nifty 200 from NSE ({e}); using cached list")
+            return cached["symbols"]
         logger.warning(
             f"Failed to fetch Nifty 200 from NSE ({e}); "
             "falling back to config watchlist"
         )
         return get_settings().watchlist
+
+    _write_cache(path, {
+        "symbols": symbols,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    })
+    return symbols
+
+
+def _parse_symbols(text: str) -> list[str]:
+    """
+    The Symbol column of the NSE CSV, in one pass. Plain csv.reader rows
+    with the column looked up once, rather than a dict per row.
+    """
+    rows = csv.reader(io.StringIO(text))
+    header = [name.strip() for name in next(rows, [])]
+    col = header.index("Symbol")
+    return [
+        symbol
+        for row in rows
+        if len(row) > col and (symbol := row[col].strip())
+    ]
+
+
+def _cache_path() -> Optional[Path]:
+    setting = get_settings().nifty200_cache
+    return Path(setting).expanduser() if setting else None
+
+
+def _read_cache(path: Optional[Path]) -> Optional[dict]:
+    if path is None:
+        return None
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable Nifty 200 cache: {e}")
+        return None
+
+
+def _write_cache(path: Optional[Path], payload: dict) -> None:
+    """Written to a temp file, then renamed into place."""
+    if path is None:
+        return
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(payload))
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"Failed to write Nifty 200 cache: {e}")
+        tmp.unlink(missing_ok=True)
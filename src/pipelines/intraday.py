@@ -13,10 +13,12 @@ orders, not market orders. The bot suggests the zone; the user sets the order.
 
 import logging
 from datetime import date, datetime
+from typing import Optional
 
 from src.broker import get_broker
+from src.broker.quote_cache import get_quotes
 from src.broker.sync import run_sync
-from src.analysis.screener import Screener
+from src.analysis.screener import Screener, ScreenerResult
 from src.config import get_settings
 from src.market.universe import get_nifty200_symbols
 from src.db.connection import get_session
@@ -32,7 +34,8 @@ _ENTRY_ZONE_TOLERANCE = 0.015
 
 
 def _price_in_entry_zone(current_price: float, entry: float) -> bool:
-    return abs(current_price - entry) / entry <= _ENTRY_ZONE_TOLERANCE
+    # Scaled tolerance rather than a relative difference: no division per check
+    return abs(current_price - entry) <= entry * _ENTRY_ZONE_TOLERANCE
 
 
 def _check_position_exits(pos_repo: PositionRepository, quotes: dict) -> list[dict]:
@@ -41,35 +44,22 @@ def _check_position_exits(pos_repo: PositionRepository, quotes: dict) -> list[di
     For swing trades we alert and let the user decide — positions are not
     auto-closed (the user executes in the broker app).
     """
-    alerts = []
-    for pos in pos_repo.get_open():
-        quote = quotes.get(pos.symbol)
-        if not quote:
-            continue
-
-        price = quote.last_price
-        hit_stop = (pos.action == "BUY" and price <= pos.current_stop) or (
-            pos.action == "SELL" and price >= pos.current_stop
-        )
-        hit_target = (pos.action == "BUY" and price >= pos.target) or (
-            pos.action == "SELL" and price <= pos.target
+    return [
+        {
+            "position_id": pos.id,
+            "symbol": pos.symbol,
+            "action": pos.action,
+            "current_price": price,
+            "entry_price": pos.entry_price,
+            "stop": pos.current_stop,
+            "target": pos.target,
+            "reason": "target_hit" if hit_target else "stop_hit",
+            "slack_thread_ts": pos.slack_thread_ts,
+        }
+        for pos, price, hit_target in pos_repo.get_exits(
+            {symbol: q.last_price for symbol, q in quotes.items()}
         )
-
-        if hit_stop or hit_target:
-            alerts.append(
-                {
-                    "position_id": pos.id,
-                    "symbol": pos.symbol,
-                    "action": pos.action,
-                    "current_price": price,
-                    "entry_price": pos.entry_price,
-                    "stop": pos.current_stop,
-                    "target": pos.target,
-                    "reason": "target_hit" if hit_target else "stop_hit",
-                    "slack_thread_ts": pos.slack_thread_ts,
-                }
-            )
-    return alerts
+    ]
 
 
 def run() -> dict:
@@ -103,22 +93,26 @@ def run() -> dict:
             journal.last_sync_at = datetime.utcnow()
 
         # ── 2. Live quotes ───────────────────────────────────────────────────
+        screener = Screener(broker)
+        # Set by the recovery screen; otherwise step 4 screens the watchlist
+        setups: Optional[list[ScreenerResult]] = None
         watchlist = journal.watchlist_snapshot or []
         if not watchlist:
             logger.info("No pre-market watchlist; running recovery screen on prior-day data")
-            screener = Screener(broker)
             # BUY-only: Angel One CNC does not support overnight short-selling.
             setups = [
                 s for s in screener.run(symbols=get_nifty200_symbols(), to_date=closed_to_date)
                 if s.direction == "BUY"
-            ]
-            watchlist = [s.symbol for s in setups[:10]]
+            ][:10]
+            watchlist = [s.symbol for s in setups]
             # Persist so subsequent hourly runs skip this recovery screen
             journal.watchlist_snapshot = watchlist
             logger.info(f"Recovery screen saved {len(watchlist)} symbols to today's watchlist")
 
+        # One call covers the watchlist and every open position's exit check
+        open_symbols = pos_repo.get_open_symbols()
         try:
-            quotes = broker.get_quote(watchlist)
+            quotes = get_quotes(broker, [*watchlist, *open_symbols])
         except Exception as e:
             logger.error(f"Failed to get live quotes: {e}")
             return {"error": str(e), "sync": sync_result}
@@ -127,18 +121,23 @@ def run() -> dict:
         exit_alerts = _check_position_exits(pos_repo, quotes)
 
         # ── 4. New swing setups entering entry zone ──────────────────────────
-        open_count = len(pos_repo.get_open())
+        open_count = len(open_symbols)
         new_suggestions = []
 
         if open_count < settings.max_open_positions:
-            screener = Screener(broker)
-            # BUY-only: Angel One CNC does not support overnight short-selling.
-            setups = [
-                s for s in screener.run(symbols=watchlist, to_date=closed_to_date)
-                if s.direction == "BUY"
-            ]
-
-            already_suggested = {s.symbol for s in sugg_repo.get_pending_today()}
+            # The recovery screen already scored these symbols on the same
+            # closed candles (results are per-symbol), so reuse it as is.
+            if setups is None:
+                # BUY-only: Angel One CNC does not support overnight short-selling.
+                setups = [
+                    s for s in screener.run(symbols=watchlist, to_date=closed_to_date)
+                    if s.direction == "BUY"
+                ]
+
+            already_suggested = sugg_repo.get_pending_today_symbols()
+            # Fixed for the tick; compute_quantity itself is pure arithmetic
+            capital = settings.fund_size_inr
+            risk_pct = settings.max_risk_per_trade_pct / 100
 
             for setup in setups:
                 if setup.symbol in already_suggested:
@@ -148,10 +147,10 @@ def run() -> dict:
                     continue
                 if _price_in_entry_zone(quote.last_price, setup.entry):
                     qty = broker.compute_quantity(
-                        capital=settings.fund_size_inr,
+                        capital=capital,
                         entry=setup.entry,
                         stop=setup.stop_loss,
-                        risk_pct=settings.max_risk_per_trade_pct / 100,
+                        risk_pct=risk_pct,
                     )
                     new_suggestions.append(
                         {
@@ -177,7 +176,6 @@ def run() -> dict:
             "new_suggestions": new_suggestions,
             "open_positions": open_count,
             "sync": sync_result,
-            "quotes": {s: q.last_price for s, q in quotes.items()},
         }
 
 
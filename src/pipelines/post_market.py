@@ -14,6 +14,7 @@ import logging
 from datetime import date
 
 from src.broker import get_broker
+from src.broker.quote_cache import get_quotes
 from src.config import get_settings
 from src.db.connection import get_session
 from src.db.models import ExitReason
@@ -42,14 +43,13 @@ def _format_eod_review(
 
     if closed_today:
         lines.append("*Positions closed today:*")
-        for p in closed_today:
-            emoji = ":white_check_mark:" if p.pnl_inr > 0 else ":x:"
-            lines.append(
-                f"  {emoji} {p.symbol} ({p.action})  "
-                f"Entry ₹{p.entry_price} → Exit ₹{p.exit_price}  "
-                f"P&L: ₹{p.pnl_inr:+.0f} ({p.pnl_pct:+.1f}%)  "
-                f"[{p.exit_reason.value if p.exit_reason else 'manual'}]"
-            )
+        lines.extend(
+            f"  {':white_check_mark:' if p.pnl_inr > 0 else ':x:'} {p.symbol} ({p.action})  "
+            f"Entry ₹{p.entry_price} → Exit ₹{p.exit_price}  "
+            f"P&L: ₹{p.pnl_inr:+.0f} ({p.pnl_pct:+.1f}%)  "
+            f"[{p.exit_reason.value if p.exit_reason else 'manual'}]"
+            for p in closed_today
+        )
         lines.append("")
 
     pnl_emoji = ":moneybag:" if daily_pnl > 0 else ":chart_with_downwards_trend:"
@@ -58,11 +58,11 @@ def _format_eod_review(
 
     if open_positions:
         lines.append(f"*Open positions carrying overnight ({len(open_positions)}):*")
-        for p in open_positions:
-            lines.append(
-                f"  • {p['symbol']} ({p['action']})  "
-                f"Entry ₹{p['entry']}  SL ₹{p['stop']}  Target ₹{p['target']}"
-            )
+        lines.extend(
+            f"  • {p['symbol']} ({p['action']})  "
+            f"Entry ₹{p['entry']}  SL ₹{p['stop']}  Target ₹{p['target']}"
+            for p in open_positions
+        )
         lines.append("")
 
     lines += [
@@ -85,38 +85,25 @@ def run() -> dict:
         tracker = OutcomeTracker(session)
 
         # 1. Get live closing prices for open positions
-        open_positions = pos_repo.get_open()
-        symbols = [p.symbol for p in open_positions]
+        symbols = pos_repo.get_open_symbols()
         quotes = {}
         if symbols:
             try:
-                quotes = broker.get_quote(symbols)
+                quotes = get_quotes(broker, symbols)
             except Exception as e:
                 logger.warning(f"Could not fetch closing quotes: {e}")
 
         # 2. Auto-close positions that hit stop/target (belt-and-suspenders)
-        closed_today = []
-        for pos in open_positions:
-            quote = quotes.get(pos.symbol)
-            if not quote:
-                continue
-            price = quote.last_price
-            if pos.target is None or pos.current_stop is None:
-                continue
-            hit_target = (pos.action == "BUY" and price >= pos.target) or (
-                pos.action == "SELL" and price <= pos.target
-            )
-            hit_stop = (pos.action == "BUY" and price <= pos.current_stop) or (
-                pos.action == "SELL" and price >= pos.current_stop
+        to_close = [
+            (pos.id, price, ExitReason.TARGET_HIT if hit_target else ExitReason.STOP_HIT)
+            for pos, price, hit_target in pos_repo.get_exits(
+                {symbol: q.last_price for symbol, q in quotes.items()}
             )
-            if hit_target:
-                closed = pos_repo.close(pos.id, price, ExitReason.TARGET_HIT)
-                closed_today.append(closed)
-                tracker.record_close(closed)
-            elif hit_stop:
-                closed = pos_repo.close(pos.id, price, ExitReason.STOP_HIT)
-                closed_today.append(closed)
-                tracker.record_close(closed)
+        ]
+
+        closed_today = pos_repo.close_many(to_close)
+        for closed in closed_today:
+            tracker.record_close(closed)
 
         # 3. Calculate today's P&L
         daily_pnl = sum(p.pnl_inr or 0 for p in closed_today)
@@ -11,45 +11,59 @@ What it does:
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-import pandas_ta as ta
-
 from src.broker import get_broker
 from src.analysis.screener import Screener, ScreenerResult
 from src.db.connection import get_session
+from src.market.ohlcv_cache import CachedOHLCVProvider
 from src.market.universe import get_nifty200_symbols
 from src.db.repositories.performance import PerformanceRepository
 from src.db.repositories.suggestions import SuggestionRepository
 
 logger = logging.getLogger(__name__)
 
+# Calendar days of Nifty history for the trend EMAs; EMA(50) needs 50 sessions
+_TREND_LOOKBACK_DAYS = 120
+
+_TREND_EMOJI = {
+    "bullish": ":chart_with_upwards_trend:",
+    "bearish": ":chart_with_downwards_trend:",
+    "sideways": ":left_right_arrow:",
+}
+_DIRECTION_EMOJI = {"BUY": ":green_circle:", "SELL": ":red_circle:"}
+
 
 def _assess_nifty_trend(broker) -> tuple[str, float]:
     """
     Returns (trend_direction, vix_level).
     trend: "bullish" | "bearish" | "sideways"
     """
-    from datetime import datetime
+    # Deferred: pandas_ta pulls in scipy and is only needed once a day
+    import pandas_ta as ta
 
     try:
-        df = broker.get_historical_data(
+        # Through the on-disk daily cache: warm runs fetch only the new bar(s)
+        df = CachedOHLCVProvider(broker).get_historical_data(
             "NIFTY 50",
             interval="day",
-            from_date=datetime.now() - timedelta(days=60),
+            from_date=datetime.now() - timedelta(days=_TREND_LOOKBACK_DAYS),
             to_date=datetime.now(),
             exchange="NSE",
         )
         if df.empty:
             return "unknown", 0.0
 
-        df["ema20"] = ta.ema(df["close"], length=20)
-        df["ema50"] = ta.ema(df["close"], length=50)
-        last = df.iloc[-1]
+        # Not assigned back into df — it may share data with the cache
+        close = df["close"]
+        last_close = close.iloc[-1]
+        ema20 = ta.ema(close, length=20).iloc[-1]
+        ema50 = ta.ema(close, length=50).iloc[-1]
 
-        if last["close"] > last["ema20"] > last["ema50"]:
+        if last_close > ema20 > ema50:
             trend = "bullish"
-        elif last["close"] < last["ema20"] < last["ema50"]:
+        elif last_close < ema20 < ema50:
             trend = "bearish"
         else:
             trend = "sideways"
@@ -61,23 +75,18 @@ def _assess_nifty_trend(broker) -> tuple[str, float]:
 
 def _get_vix(broker) -> float:
     try:
-        quotes = broker.get_quote(["INDIA VIX"], exchange="NSE")
-        if quotes:
-            return list(quotes.values())[0].last_price
-        return 0.0
-    except Exception:
+        quote = broker.get_quote(["INDIA VIX"], exchange="NSE").get("INDIA VIX")
+    except Exception as e:
+        logger.warning(f"Failed to fetch India VIX: {e}")
         return 0.0
+    return quote.last_price if quote else 0.0
 
 
 def _build_morning_brief(
     trend: str, vix: float, top_setups: list[ScreenerResult]
 ) -> str:
     """Format the Slack morning briefing message."""
-    trend_emoji = {
-        "bullish": ":chart_with_upwards_trend:",
-        "bearish": ":chart_with_downwards_trend:",
-        "sideways": ":left_right_arrow:",
-    }.get(trend, ":question:")
+    trend_emoji = _TREND_EMOJI.get(trend, ":question:")
 
     lines = [
         f"*Good morning! Pre-market brief — {datetime.now().strftime('%d %b %Y')}*",
@@ -87,17 +96,14 @@ def _build_morning_brief(
         f"*Top {len(top_setups)} setups identified for today:*",
     ]
 
-    for i, setup in enumerate(top_setups, 1):
-        direction_emoji = (
-            ":green_circle:" if setup.direction == "BUY" else ":red_circle:"
-        )
-        signals = ", ".join(s["signal_name"] for s in setup.signals_fired)
-        lines.append(
-            f"{i}. {direction_emoji} *{setup.symbol}*  "
-            f"Entry: ₹{setup.entry}  Target: ₹{setup.target}  "
-            f"SL: ₹{setup.stop_loss}  R:R {setup.risk_reward}x  "
-            f"[{signals}]  Score: {setup.composite_score:.2f}"
-        )
+    lines.extend(
+        f"{i}. {_DIRECTION_EMOJI.get(setup.direction, ':red_circle:')} *{setup.symbol}*  "
+        f"Entry: ₹{setup.entry}  Target: ₹{setup.target}  "
+        f"SL: ₹{setup.stop_loss}  R:R {setup.risk_reward}x  "
+        f"[{', '.join(s['signal_name'] for s in setup.signals_fired)}]  "
+        f"Score: {setup.composite_score:.2f}"
+        for i, setup in enumerate(top_setups, 1)
+    )
 
     lines += [
         "",
@@ -113,17 +119,21 @@ def run():
     logger.info("Starting pre-market pipeline")
     broker = get_broker()
 
-    # 1. Market context
-    trend, vix = _assess_nifty_trend(broker)
-    logger.info(f"Nifty trend: {trend}, VIX: {vix}")
-
-    # 2. Screen full Nifty 200 universe
-    # Filter to BUY only — Angel One CNC mode does not support overnight short-selling.
-    # SELL direction is only valid for closing existing long positions (handled by exit alerts).
+    # 1–2. Market context and the full Nifty 200 screen are independent
+    # network fetches, so they run side by side.
     screener = Screener(broker)
-    all_setups = [
-        s for s in screener.run(symbols=get_nifty200_symbols()) if s.direction == "BUY"
-    ]
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        trend_future = pool.submit(_assess_nifty_trend, broker)
+        vix_future = pool.submit(_get_vix, broker)
+        setups_future = pool.submit(
+            lambda: screener.run(symbols=get_nifty200_symbols())
+        )
+        trend, _ = trend_future.result()
+        vix = vix_future.result()
+        logger.info(f"Nifty trend: {trend}, VIX: {vix}")
+        # Filter to BUY only — Angel One CNC mode does not support overnight short-selling.
+        # SELL direction is only valid for closing existing long positions (handled by exit alerts).
+        all_setups = [s for s in setups_future.result() if s.direction == "BUY"]
 
     # 3. Take top 10 for watchlist, top 5 for briefing
     top_10 = all_setups[:10]
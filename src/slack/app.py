@@ -17,12 +17,17 @@ Schedule (IST, Mon–Fri):
   15:35  — Post-market pipeline (EOD reconciliation + learning)
 """
 
+import functools
 import logging
+import threading
+from concurrent import futures
 
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
 
 from src.config import get_settings
 from src.db.connection import create_tables
@@ -34,10 +39,25 @@ from src.slack import notifier
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Seconds per Slack Web API call; the SDK default of 30 would stall a job
+_SLACK_TIMEOUT = 10
+_SLACK_LISTENER_WORKERS = 10
+
 app = App(
     token=settings.slack_bot_token,
     signing_secret=settings.slack_signing_secret,
+    # Listeners run here, not on Socket Mode's workers. Bolt's default of 5
+    # lets a few slow /fundbot run or sync commands stall button clicks;
+    # match Socket Mode's 10 workers (the DB pool is sized for both)
+    listener_executor=futures.ThreadPoolExecutor(
+        max_workers=_SLACK_LISTENER_WORKERS, thread_name_prefix="slack-listener"
+    ),
 )
+# Suggestions are posted in concurrent bursts; wait out a 429 (Slack sends
+# Retry-After) instead of dropping the message. Bolt copies these handlers
+# into the per-request clients it gives listeners.
+app.client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=2))
+app.client.timeout = _SLACK_TIMEOUT
 
 # ── Register all handlers ─────────────────────────────────────────────────
 register_commands(app)
@@ -48,9 +68,33 @@ register_position_actions(app)
 # ── Pipeline functions ────────────────────────────────────────────────────
 
 
+def _skip_if_running(job):
+    """
+    Run `job` only if no other call of this wrapper is in progress in this
+    process; an overlapping call is logged and dropped rather than queued.
+    max_instances=1 already bounds the scheduler's own firings, so this is a
+    backstop for that. It does not cover other processes, nor `/fundbot run`,
+    which calls the pipeline's run() directly.
+    """
+    lock = threading.Lock()
+
+    @functools.wraps(job)
+    def wrapper():
+        if not lock.acquire(blocking=False):
+            logger.warning(f"Skipping {job.__name__}: previous run still in progress")
+            return
+        try:
+            job()
+        finally:
+            lock.release()
+
+    return wrapper
+
+
+@_skip_if_running
 def _run_broker_sync():
     """Standalone broker sync — runs before the morning screen and on demand."""
-    from src.broker import get_broker
+    from src.broker import get_broker, quote_cache
     from src.broker.sync import run_sync
     from src.db.connection import get_session
     from src.db.repositories.performance import PerformanceRepository
@@ -67,12 +111,14 @@ def _run_broker_sync():
                 journal.fund_added_inr = (journal.fund_added_inr or 0.0) + max(
                     0.0, result.fund_change_inr
                 )
+        quote_cache.invalidate()
         if result.has_position_changes or result.has_fund_change:
             notifier.post_sync_alert(app.client, result)
     except Exception as e:
         logger.error(f"Broker sync failed: {e}", exc_info=True)
 
 
+@_skip_if_running
 def _run_pre_market():
     from src.pipelines.pre_market import run
 
@@ -85,6 +131,7 @@ def _run_pre_market():
         notifier.post_error(app.client, f"Pre-market pipeline error: {e}")
 
 
+@_skip_if_running
 def _run_swing_monitor():
     """Hourly swing monitor — broker sync + entry alerts + exit alerts."""
     from src.pipelines.intraday import run
@@ -97,12 +144,12 @@ def _run_swing_monitor():
             notifier.post_sync_alert(app.client, sync)
         for alert in result.get("exit_alerts", []):
             notifier.post_exit_alert(app.client, alert)
-        for suggestion in result.get("new_suggestions", []):
-            notifier.post_trade_suggestion(app.client, suggestion)
+        notifier.post_trade_suggestions(app.client, result.get("new_suggestions", []))
     except Exception as e:
         logger.error(f"Swing monitor failed: {e}", exc_info=True)
 
 
+@_skip_if_running
 def _run_post_market():
     from src.pipelines.post_market import run
 
@@ -115,7 +162,19 @@ def _run_post_market():
 
 
 def start_scheduler():
-    scheduler = BackgroundScheduler(timezone="Asia/Kolkata")
+    scheduler = BackgroundScheduler(
+        timezone="Asia/Kolkata",
+        # At most two jobs ever overlap (e.g. a long pre-market screen and the
+        # next sync); ten default threads only invite DB and broker contention.
+        executors={"default": ThreadPoolExecutor(2)},
+        job_defaults={
+            # After a sleep/suspend, fire a missed job once instead of replaying
+            # every missed tick, and only if it is less than 5 minutes late.
+            "coalesce": True,
+            "misfire_grace_time": 300,
+            "max_instances": 1,
+        },
+    )
 
     # NOTE: timezone must be set explicitly on each CronTrigger — APScheduler
     # does NOT inherit it from BackgroundScheduler; it defaults to the system
@@ -13,12 +13,37 @@ import logging
 
 from slack_bolt import App
 
+from src.broker import get_broker
+from src.broker.quote_cache import get_quotes
+from src.broker.sync import run_sync
 from src.db.connection import get_session
 from src.db.repositories.performance import PerformanceRepository
 from src.db.repositories.positions import PositionRepository
+from src.slack import notifier
 
 logger = logging.getLogger(__name__)
 
+# /fundbot positions shows "live" prices; repeated commands within this many
+# seconds (or right after a monitor tick) reuse the cached quotes
+_POSITIONS_QUOTE_TTL = 5
+
+
+def _position_line(p: dict, quote) -> str:
+    """One /fundbot positions row; `quote` may be None when the broker had no price."""
+    curr_price = quote.last_price if quote else None
+    ext_tag = " _(external)_" if p["is_externally_created"] else ""
+    price_str = f"₹{curr_price:,.2f}" if curr_price else "?"
+    pnl_str = ""
+    if curr_price:
+        unreal = (curr_price - p["entry"]) * p["qty"]
+        pnl_str = f"  Unrealised: ₹{unreal:+,.0f}"
+    return (
+        f"  • *{p['symbol']}* {p['action']}{ext_tag}  "
+        f"Entry ₹{p['entry']:,.2f}  Now {price_str}  "
+        f"SL ₹{p['stop']:,.2f}  Target ₹{p['target']:,.2f}"
+        f"{pnl_str}"
+    )
+
 
 def register_commands(app: App):
 
@@ -45,7 +70,7 @@ def register_commands(app: App):
             perf_repo = PerformanceRepository(session)
             pos_repo = PositionRepository(session)
             journal = perf_repo.get_or_create_today()
-            portfolio = pos_repo.get_portfolio_summary()
+            portfolio = pos_repo.get_portfolio_totals()
 
             sync_ts = (
                 journal.last_sync_at.strftime("%H:%M")
@@ -58,58 +83,41 @@ def register_commands(app: App):
             if journal.fund_balance_inr:
                 fund_line += f"  |  Available: ₹{journal.fund_balance_inr:,.0f}"
 
-            respond(
-                text=(
-                    f"*Today's status*\n"
-                    f"Market: {journal.nifty_trend or 'pending'}  |  "
-                    f"VIX: {journal.vix_level or 'N/A'}  |  "
-                    f"Last sync: {sync_ts}\n"
-                    f"Signals sent: {journal.suggestions_sent}  |  "
-                    f"Executed: {journal.suggestions_executed}  |  "
-                    f"Skipped: {journal.suggestions_skipped}\n"
-                    f"Open positions: {portfolio['count']}/{5}  |  "
-                    f"Invested: ₹{portfolio['total_invested_inr']:,.0f}\n"
-                    f"Today's P&L: ₹{journal.total_pnl_inr or 0:+,.0f}"
-                    f"{fund_line}"
-                ),
-                response_type="in_channel",
+            # Built inside the block: the journal expires once the session commits
+            text = (
+                f"*Today's status*\n"
+                f"Market: {journal.nifty_trend or 'pending'}  |  "
+                f"VIX: {journal.vix_level or 'N/A'}  |  "
+                f"Last sync: {sync_ts}\n"
+                f"Signals sent: {journal.suggestions_sent}  |  "
+                f"Executed: {journal.suggestions_executed}  |  "
+                f"Skipped: {journal.suggestions_skipped}\n"
+                f"Open positions: {portfolio['count']}/{5}  |  "
+                f"Invested: ₹{portfolio['total_invested_inr']:,.0f}\n"
+                f"Today's P&L: ₹{journal.total_pnl_inr or 0:+,.0f}"
+                f"{fund_line}"
             )
 
+        respond(text=text, response_type="in_channel")
+
     def _positions(respond):
+        # One read of plain rows; the session is released before the broker call
         with get_session() as session:
-            pos_repo = PositionRepository(session)
+            positions = PositionRepository(session).get_open_rows()
+        if not positions:
+            respond(text="No open positions.")
+            return
 
-            try:
-                from src.broker import get_broker
-
-                broker = get_broker()
-                symbols = [p.symbol for p in pos_repo.get_open()]
-                quotes = broker.get_quote(symbols) if symbols else {}
-            except Exception:
-                quotes = {}
-
-            portfolio = pos_repo.get_portfolio_summary()
-            if not portfolio["positions"]:
-                respond(text="No open positions.")
-                return
-
-            lines = ["*Open swing positions:*"]
-            for p in portfolio["positions"]:
-                quote = quotes.get(p["symbol"])
-                curr_price = quote.last_price if quote else None
-                ext_tag = " _(external)_" if p.get("is_externally_created") else ""
-                price_str = f"₹{curr_price:,.2f}" if curr_price else "?"
-                pnl_str = ""
-                if curr_price:
-                    unreal = (curr_price - p["entry"]) * p["qty"]
-                    pnl_str = f"  Unrealised: ₹{unreal:+,.0f}"
-                lines.append(
-                    f"  • *{p['symbol']}* {p['action']}{ext_tag}  "
-                    f"Entry ₹{p['entry']:,.2f}  Now {price_str}  "
-                    f"SL ₹{p['stop']:,.2f}  Target ₹{p['target']:,.2f}"
-                    f"{pnl_str}"
-                )
-            respond(text="\n".join(lines), response_type="in_channel")
+        try:
+            quotes = get_quotes(
+                get_broker(), [p["symbol"] for p in positions], ttl=_POSITIONS_QUOTE_TTL
+            )
+        except Exception:
+            quotes = {}
+
+        lines = ["*Open swing positions:*"]
+        lines.extend(_position_line(p, quotes.get(p["symbol"])) for p in positions)
+        respond(text="\n".join(lines), response_type="in_channel")
 
     def _sync(respond):
         """Manually trigger a broker sync and report what changed."""
@@ -118,10 +126,7 @@ def register_commands(app: App):
             response_type="ephemeral",
         )
         try:
-            from src.broker import get_broker
-            from src.broker.sync import run_sync
-            from src.db.repositories.performance import PerformanceRepository
-            from src.slack import notifier
+            # Lazy: src.slack.app imports this module
             from src.slack.app import app as slack_app
 
             broker = get_broker()
@@ -158,8 +163,8 @@ def register_commands(app: App):
             text=":hourglass: Running swing monitor now…", response_type="ephemeral"
         )
         try:
+            # Lazy: the screener stack is heavy, and src.slack.app imports this module
             from src.pipelines.intraday import run
-            from src.slack import notifier
             from src.slack.app import app as slack_app
 
             result = run()
@@ -167,8 +172,7 @@ def register_commands(app: App):
             if sync and (sync.has_position_changes or sync.has_fund_change):
                 notifier.post_sync_alert(slack_app.client, sync)
             if result.get("new_suggestions"):
-                for s in result["new_suggestions"]:
-                    notifier.post_trade_suggestion(slack_app.client, s)
+                notifier.post_trade_suggestions(slack_app.client, result["new_suggestions"])
                 respond(
                     text=f":white_check_mark: Found {len(result['new_suggestions'])} new swing setup(s).",
                     response_type="ephemeral",
@@ -183,23 +187,23 @@ def register_commands(app: App):
     def _stats(respond):
         with get_session() as session:
             perf_repo = PerformanceRepository(session)
-            stats = perf_repo.get_all_signal_stats()
-
-            if not stats:
-                respond(text="No signal performance data yet.")
-                return
-
-            lines = ["*Signal performance stats:*"]
-            for s in sorted(stats, key=lambda x: x.win_rate, reverse=True):
-                lines.append(
-                    f"  • *{s.signal_name}* ({s.timeframe})  "
-                    f"Win rate: {s.win_rate*100:.0f}%  "
-                    f"Avg P&L: {s.avg_pnl_pct:+.1f}%  "
-                    f"Avg hold: {s.avg_held_days:.0f}d  "
-                    f"Trades: {s.executed_signals}  "
-                    f"Weight: {s.signal_weight:.2f}"
-                )
-            respond(text="\n".join(lines), response_type="in_channel")
+            rows = [
+                f"  • *{s.signal_name}* ({s.timeframe})  "
+                f"Win rate: {s.win_rate*100:.0f}%  "
+                f"Avg P&L: {s.avg_pnl_pct:+.1f}%  "
+                f"Avg hold: {s.avg_held_days:.0f}d  "
+                f"Trades: {s.executed_signals}  "
+                f"Weight: {s.signal_weight:.2f}"
+                for s in perf_repo.get_all_signal_stats()  # best win rate first
+            ]
+
+        if not rows:
+            respond(text="No signal performance data yet.")
+            return
+        respond(
+            text="\n".join(["*Signal performance stats:*", *rows]),
+            response_type="in_channel",
+        )
 
     def _help(respond):
         respond(
@@ -8,8 +8,9 @@ import logging
 
 from slack_bolt import App
 
+from src.broker import get_broker
 from src.db.connection import get_session
-from src.db.models import ExitReason
+from src.db.models import ExitReason, PositionStatus
 from src.db.repositories.positions import PositionRepository
 from src.learning.tracker import OutcomeTracker
 
@@ -26,59 +27,65 @@ def register_position_actions(app: App):
         channel = body["channel"]["id"]
         message_ts = body["message"]["ts"]
 
+        # The session is held for DB work only; the broker quote and the
+        # Slack calls happen while no connection is checked out
         with get_session() as session:
-            pos_repo = PositionRepository(session)
-            tracker = OutcomeTracker(session)
+            pos = PositionRepository(session).get_by_id(position_id)
+            if pos is not None and pos.status == PositionStatus.OPEN:
+                symbol, fallback_price = pos.symbol, pos.target
+            else:
+                symbol = None
+        if symbol is None:
+            say(text=":x: Position not found or already closed.", thread_ts=message_ts)
+            return
+
+        # Use last alert price as exit price (user confirmed)
+        # In production, prompt user for actual fill price
+        try:
+            quotes = get_broker().get_quote([symbol])
+            exit_price = quotes[symbol].last_price
+        except Exception:
+            exit_price = fallback_price  # Fallback
 
-            pos = (
-                session.get(
-                    type(pos_repo.get_open()[0]) if pos_repo.get_open() else None,
-                    position_id,
-                )
-                if pos_repo.get_open()
-                else None
-            )
-
-            # Use last alert price as exit price (user confirmed)
-            # In production, prompt user for actual fill price
-            from src.broker import get_broker
-
-            broker = get_broker()
-            try:
-                quotes = broker.get_quote([pos.symbol])
-                exit_price = quotes[pos.symbol].last_price
-            except Exception:
-                exit_price = pos.target  # Fallback
-
-            closed = pos_repo.close(position_id, exit_price, ExitReason.MANUAL)
-            tracker.record_close(closed)
-
-            pnl_emoji = ":moneybag:" if closed.pnl_inr > 0 else ":x:"
-            client.chat_update(
-                channel=channel,
-                ts=message_ts,
-                text=f"✅ Position closed: {closed.symbol}",
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": (
-                                f"{pnl_emoji} *{closed.symbol} closed* by @{user}\n"
-                                f"Exit: ₹{closed.exit_price}  "
-                                f"P&L: ₹{closed.pnl_inr:+,.0f} ({closed.pnl_pct:+.1f}%)"
-                            ),
-                        },
-                    }
-                ],
-            )
-            say(
-                text=f"Got it! Position recorded as closed. P&L: ₹{closed.pnl_inr:+,.0f}",
-                thread_ts=message_ts,
+        with get_session() as session:
+            closed = PositionRepository(session).close_many(
+                [(position_id, exit_price, ExitReason.MANUAL)]
             )
+            if closed:
+                OutcomeTracker(session).record_close(closed[0])
+                exit_price = closed[0].exit_price
+                pnl_inr, pnl_pct = closed[0].pnl_inr, closed[0].pnl_pct
+        if not closed:
+            # Closed by a broker sync while the quote was in flight
+            say(text=":x: Position not found or already closed.", thread_ts=message_ts)
+            return
+
+        pnl_emoji = ":moneybag:" if pnl_inr > 0 else ":x:"
+        client.chat_update(
+            channel=channel,
+            ts=message_ts,
+            text=f"✅ Position closed: {symbol}",
+            blocks=[
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": (
+                            f"{pnl_emoji} *{symbol} closed* by @{user}\n"
+                            f"Exit: ₹{exit_price}  "
+                            f"P&L: ₹{pnl_inr:+,.0f} ({pnl_pct:+.1f}%)"
+                        ),
+                    },
+                }
+            ],
+        )
+        say(
+            text=f"Got it! Position recorded as closed. P&L: ₹{pnl_inr:+,.0f}",
+            thread_ts=message_ts,
+        )
 
         logger.info(
-            f"Position {position_id} closed by {user}, P&L ₹{closed.pnl_inr:+,.0f}"
+            f"Position {position_id} closed by {user}, P&L ₹{pnl_inr:+,.0f}"
         )
 
     @app.action("hold_position")
@@ -27,61 +27,68 @@ def register_suggestion_actions(app: App):
         channel = body["channel"]["id"]
         message_ts = body["message"]["ts"]
 
+        # Slack calls go out after the session has committed and released
+        # its connection, so only plain values leave the block
         with get_session() as session:
             sugg_repo = SuggestionRepository(session)
             pos_repo = PositionRepository(session)
             perf_repo = PerformanceRepository(session)
 
             s = sugg_repo.mark_executed(suggestion_id)
-            if not s:
-                say(text=":x: Suggestion not found.", thread_ts=message_ts)
-                return
-
-            # Create position record
-            pos = pos_repo.create(
-                suggestion_id=s.id,
-                symbol=s.symbol,
-                action=s.action,
-                entry_price=s.entry_price,
-                quantity=s.suggested_qty,
-                target=s.target_price,
-                stop=s.stop_loss,
-                slack_thread_ts=message_ts,
-            )
-
-            perf_repo.increment_suggestion_count(executed=True)
-
-            # Update the original message to reflect execution
-            client.chat_update(
-                channel=channel,
-                ts=message_ts,
-                text=f"✅ *{s.symbol} {s.action}* — Executed by @{user}",
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": (
-                                f"✅ *{s.symbol} {s.action}* executed by @{user}\n"
-                                f"Entry: ₹{s.entry_price}  Target: ₹{s.target_price}  "
-                                f"SL: ₹{s.stop_loss}  Qty: {s.suggested_qty}"
-                            ),
-                        },
-                    }
-                ],
-            )
-
-            say(
-                text=(
-                    f"Position #{pos.id} opened: *{s.symbol} {s.action}* "
-                    f"@ ₹{s.entry_price}  |  SL: ₹{s.stop_loss}  Target: ₹{s.target_price}\n"
-                    f"I'll alert you when price hits target or stop."
-                ),
-                thread_ts=message_ts,
-                mrkdwn=True,
-            )
-
-            logger.info(f"Trade executed: {s.symbol} {s.action} by {user}")
+            if s:
+                # Create position record
+                pos = pos_repo.create(
+                    suggestion_id=s.id,
+                    symbol=s.symbol,
+                    action=s.action,
+                    entry_price=s.entry_price,
+                    quantity=s.suggested_qty,
+                    target=s.target_price,
+                    stop=s.stop_loss,
+                    slack_thread_ts=message_ts,
+                )
+                perf_repo.increment_suggestion_count(executed=True)
+                pos_id = pos.id
+                symbol, action = s.symbol, s.action
+                entry, target, stop, qty = (
+                    s.entry_price, s.target_price, s.stop_loss, s.suggested_qty
+                )
+
+        if not s:
+            say(text=":x: Suggestion not found.", thread_ts=message_ts)
+            return
+
+        # Update the original message to reflect execution
+        client.chat_update(
+            channel=channel,
+            ts=message_ts,
+            text=f"✅ *{symbol} {action}* — Executed by @{user}",
+            blocks=[
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": (
+                            f"✅ *{symbol} {action}* executed by @{user}\n"
+                            f"Entry: ₹{entry}  Target: ₹{target}  "
+                            f"SL: ₹{stop}  Qty: {qty}"
+                        ),
+                    },
+                }
+            ],
+        )
+
+        say(
+            text=(
+                f"Position #{pos_id} opened: *{symbol} {action}* "
+                f"@ ₹{entry}  |  SL: ₹{stop}  Target: ₹{target}\n"
+                f"I'll alert you when price hits target or stop."
+            ),
+            thread_ts=message_ts,
+            mrkdwn=True,
+        )
+
+        logger.info(f"Trade executed: {symbol} {action} by {user}")
 
     @app.action("skip_trade")
     def handle_skip(ack, body, say, client):
@@ -97,23 +104,24 @@ def register_suggestion_actions(app: App):
 
             s = sugg_repo.mark_skipped(suggestion_id)
             perf_repo.increment_suggestion_count(skipped=True)
-
-            client.chat_update(
-                channel=channel,
-                ts=message_ts,
-                text=f"⏭️ *{s.symbol}* — Skipped by @{user}",
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"⏭️ *{s.symbol} {s.action}* skipped by @{user}",
-                        },
-                    }
-                ],
-            )
-
-            logger.info(f"Trade skipped: {s.symbol} by {user}")
+            symbol, action = s.symbol, s.action
+
+        client.chat_update(
+            channel=channel,
+            ts=message_ts,
+            text=f"⏭️ *{symbol}* — Skipped by @{user}",
+            blocks=[
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": f"⏭️ *{symbol} {action}* skipped by @{user}",
+                    },
+                }
+            ],
+        )
+
+        logger.info(f"Trade skipped: {symbol} by {user}")
 
     @app.action("more_info")
     def handle_more_info(ack, body, say):
@@ -127,14 +135,16 @@ def register_suggestion_actions(app: App):
             if not s:
                 return
 
-            signals_text = "\n".join(
-                f"  • *{sig['signal_name']}*: strength {sig['strength']:.2f}, "
-                f"R:R {sig.get('risk_reward', '?')}x"
-                for sig in (s.signals_fired or [])
-            )
-
-            say(
-                text=f"Signal details for {s.symbol}:\n{signals_text}",
-                thread_ts=message_ts,
-                mrkdwn=True,
-            )
+            # signals_fired is a JSON column, already loaded with the row
+            symbol, signals = s.symbol, list(s.signals_fired or [])
+
+        signals_text = "\n".join(
+            f"  • *{sig['signal_name']}*: strength {sig['strength']:.2f}, "
+            f"R:R {sig.get('risk_reward', '?')}x"
+            for sig in signals
+        )
+        say(
+            text=f"Signal details for {symbol}:\n{signals_text}",
+            thread_ts=message_ts,
+            mrkdwn=True,
+        )
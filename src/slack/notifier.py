@@ -4,18 +4,65 @@ All message building lives here — handlers call these, never build blocks inli
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Iterable
 
 from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
+# Settings are frozen and cached, so the channel is fixed for the process
+_CHANNEL = settings.slack_trading_channel
+
+# Slack rejects a section whose text exceeds 3000 characters
+_SECTION_TEXT_LIMIT = 3000
+# Concurrent chat_postMessage calls for a batch of suggestions; Slack
+# tolerates short bursts above its ~1 message/second channel limit
+_SLACK_POST_WORKERS = 8
+
+# Static pieces of the interactive messages, built once. Slack only
+# serialises blocks, so sharing these dicts across messages is safe.
+_DIVIDER = {"type": "divider"}
+_DIRECTION_EMOJI = {"BUY": ":green_circle:", "SELL": ":red_circle:"}
+_LIMIT_ORDER_HINT = (
+    ":pushpin: Place a *limit order* at ₹{entry:,.2f} in your broker app. "
+    "Confirm below once placed."
+)
+_CLOSE_IN_BROKER_HINT = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": ":pushpin: Close the position in your broker app, then confirm below.",
+        }
+    ],
+}
 
 
-def _channel() -> str:
-    return settings.slack_trading_channel
+# ── Message builders ──────────────────────────────────────────────────────
 
 
-# ── Message builders ──────────────────────────────────────────────────────
+def _mrkdwn_sections(lines: Iterable[str]) -> list[dict]:
+    """
+    Join `lines` into as few mrkdwn sections as fit Slack's text limit.
+    Consumed once, so callers can pass a generator rather than build a list.
+    """
+    sections: list[str] = []
+    chunk: list[str] = []
+    size = 0
+    for line in lines:
+        if chunk and size + len(line) + 1 > _SECTION_TEXT_LIMIT:
+            sections.append("\n".join(chunk))
+            chunk, size = [], 0
+        chunk.append(line)
+        size += len(line) + 1
+    if chunk:
+        sections.append("\n".join(chunk))
+    return [
+        {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+        for text in sections
+    ]
 
 
 def _suggestion_blocks(suggestion: dict, suggestion_db_id: int) -> list[dict]:
@@ -28,7 +75,7 @@ def _suggestion_blocks(suggestion: dict, suggestion_db_id: int) -> list[dict]:
     qty = suggestion["quantity"]
     risk = suggestion["risk_inr"]
     signals = ", ".join(s["signal_name"] for s in setup.signals_fired)
-    dir_emoji = ":green_circle:" if setup.direction == "BUY" else ":red_circle:"
+    dir_emoji = _DIRECTION_EMOJI.get(setup.direction, ":red_circle:")
 
     return [
         {
@@ -57,16 +104,10 @@ def _suggestion_blocks(suggestion: dict, suggestion_db_id: int) -> list[dict]:
         {
             "type": "context",
             "elements": [
-                {
-                    "type": "mrkdwn",
-                    "text": (
-                        ":pushpin: Place a *limit order* at ₹{entry:,.2f} in your broker app. "
-                        "Confirm below once placed."
-                    ).format(entry=setup.entry),
-                }
+                {"type": "mrkdwn", "text": _LIMIT_ORDER_HINT.format(entry=setup.entry)}
             ],
         },
-        {"type": "divider"},
+        _DIVIDER,
         {
             "type": "actions",
             "elements": [
@@ -99,7 +140,7 @@ def _exit_alert_blocks(alert: dict) -> list[dict]:
     reason_text = (
         "🎯 Target Hit!" if alert["reason"] == "target_hit" else "🛑 Stop Loss Hit!"
     )
-    dir_emoji = ":green_circle:" if alert["action"] == "BUY" else ":red_circle:"
+    dir_emoji = _DIRECTION_EMOJI.get(alert["action"], ":red_circle:")
 
     entry = alert.get("entry_price", 0)
     curr = alert["current_price"]
@@ -124,16 +165,8 @@ def _exit_alert_blocks(alert: dict) -> list[dict]:
                 {"type": "mrkdwn", "text": f"*Unrealised:*\n{pnl_pct:+.1f}%"},
             ],
         },
-        {
-            "type": "context",
-            "elements": [
-                {
-                    "type": "mrkdwn",
-                    "text": ":pushpin: Close the position in your broker app, then confirm below.",
-                }
-            ],
-        },
-        {"type": "divider"},
+        _CLOSE_IN_BROKER_HINT,
+        _DIVIDER,
         {
             "type": "actions",
             "elements": [
@@ -158,7 +191,8 @@ def _exit_alert_blocks(alert: dict) -> list[dict]:
 def _sync_alert_blocks(sync_result) -> list[dict]:
     """
     Notification posted when the broker sync detects positions or fund changes
-    that weren't reported through the Slack bot.
+    that weren't reported through the Slack bot. Every change from one sync
+    goes into this single message; long lists are split across sections.
     """
     blocks = [
         {
@@ -168,29 +202,31 @@ def _sync_alert_blocks(sync_result) -> list[dict]:
     ]
 
     if sync_result.new_positions:
-        lines = ["*New positions found in broker (not via bot):*"]
-        for p in sync_result.new_positions:
-            lines.append(
-                f"  • *{p['symbol']}* ×{p['quantity']} shares  "
-                f"Avg ₹{p['avg_price']:,.2f}  LTP ₹{p['ltp']:,.2f}\n"
-                f"    _Default SL/target set — please review and adjust_"
+        lines = (
+            f"  • *{p['symbol']}* ×{p['quantity']} shares  "
+            f"Avg ₹{p['avg_price']:,.2f}  LTP ₹{p['ltp']:,.2f}\n"
+            f"    _Default SL/target set — please review and adjust_"
+            for p in sync_result.new_positions
+        )
+        blocks.extend(
+            _mrkdwn_sections(
+                chain(["*New positions found in broker (not via bot):*"], lines)
             )
-        blocks.append(
-            {"type": "section", "text": {"type": "mrkdwn", "text": "\n".join(lines)}}
         )
 
     if sync_result.closed_positions:
-        lines = ["*Positions closed in broker (not via bot):*"]
-        for p in sync_result.closed_positions:
-            pnl_sign = "+" if p["pnl_inr"] >= 0 else ""
-            lines.append(
-                f"  • *{p['symbol']}*  "
-                f"Entry ₹{p['entry_price']:,.2f} → Exit ₹{p['exit_price']:,.2f}  "
-                f"P&L ₹{pnl_sign}{p['pnl_inr']:,.0f} ({p['pnl_pct']:+.1f}%)  "
-                f"Held {p['held_days']}d"
+        lines = (
+            f"  • *{p['symbol']}*  "
+            f"Entry ₹{p['entry_price']:,.2f} → Exit ₹{p['exit_price']:,.2f}  "
+            f"P&L ₹{'+' if p['pnl_inr'] >= 0 else ''}{p['pnl_inr']:,.0f} "
+            f"({p['pnl_pct']:+.1f}%)  "
+            f"Held {p['held_days']}d"
+            for p in sync_result.closed_positions
+        )
+        blocks.extend(
+            _mrkdwn_sections(
+                chain(["*Positions closed in broker (not via bot):*"], lines)
             )
-        blocks.append(
-            {"type": "section", "text": {"type": "mrkdwn", "text": "\n".join(lines)}}
         )
 
     if sync_result.has_fund_change:
@@ -218,7 +254,7 @@ def post_pre_market_brief(client, brief_text: str) -> str:
     """Post morning briefing. Returns message ts."""
     try:
         resp = client.chat_postMessage(
-            channel=_channel(),
+            channel=_CHANNEL,
             text=brief_text,
             mrkdwn=True,
         )
@@ -228,50 +264,76 @@ def post_pre_market_brief(client, brief_text: str) -> str:
         return ""
 
 
+def _suggestion_row(suggestion: dict) -> dict:
+    """TradeSuggestion column values for a screener suggestion."""
+    setup = suggestion["setup"]
+    return {
+        "symbol": setup.symbol,
+        "action": setup.direction,
+        "entry_price": float(setup.entry),
+        "target_price": float(setup.target),
+        "stop_loss": float(setup.stop_loss),
+        "suggested_qty": suggestion["quantity"],
+        "risk_amount_inr": float(suggestion["risk_inr"]),
+        "risk_reward": float(setup.risk_reward),
+        "signals_fired": setup.signals_fired,
+        "composite_score": float(setup.composite_score),
+        "timeframe": setup.timeframe,
+        "slack_channel": _CHANNEL,
+    }
+
+
 def post_trade_suggestion(client, suggestion: dict) -> str:
-    """Persist suggestion to DB, then post interactive Slack message."""
+    """Persist one suggestion to DB, then post its interactive Slack message."""
+    return post_trade_suggestions(client, [suggestion])[0]
+
+
+def post_trade_suggestions(client, suggestions: list[dict]) -> list[str]:
+    """
+    Persist a batch of suggestions, then post one Slack message per suggestion.
+    The rows and the daily counter are written in one session that is closed
+    before any Slack call; messages are posted concurrently, so they may land
+    slightly out of order, and their timestamps are stored afterwards in a
+    single UPDATE. Returns the ts of each message ("" if posting failed).
+    """
     from src.db.connection import get_session
     from src.db.repositories.suggestions import SuggestionRepository
     from src.db.repositories.performance import PerformanceRepository
 
-    setup = suggestion["setup"]
+    if not suggestions:
+        return []
 
+    rows = [_suggestion_row(suggestion) for suggestion in suggestions]
     with get_session() as session:
-        sugg_repo = SuggestionRepository(session)
-        perf_repo = PerformanceRepository(session)
-
-        record = sugg_repo.create(
-            symbol=setup.symbol,
-            action=setup.direction,
-            entry_price=float(setup.entry),
-            target_price=float(setup.target),
-            stop_loss=float(setup.stop_loss),
-            suggested_qty=suggestion["quantity"],
-            risk_amount_inr=float(suggestion["risk_inr"]),
-            risk_reward=float(setup.risk_reward),
-            signals_fired=setup.signals_fired,
-            composite_score=float(setup.composite_score),
-            timeframe=setup.timeframe,
-            slack_channel=_channel(),
-        )
-        db_id = record.id
+        db_ids = SuggestionRepository(session).create_many(rows)
+        PerformanceRepository(session).increment_suggestion_count(sent=len(db_ids))
 
-        blocks = _suggestion_blocks(suggestion, db_id)
+    def post(suggestion: dict, db_id: int) -> str:
+        setup = suggestion["setup"]
         try:
             resp = client.chat_postMessage(
-                channel=_channel(),
-                blocks=blocks,
+                channel=_CHANNEL,
+                blocks=_suggestion_blocks(suggestion, db_id),
                 text=f"Swing setup: {setup.symbol} {setup.direction} @ ₹{setup.entry:,.2f}",
             )
-            record.slack_ts = resp["ts"]
-            ts = resp["ts"]
+            return resp["ts"]
         except Exception as e:
             logger.error(f"Failed to post trade suggestion: {e}")
-            ts = ""
+            return ""
 
-        perf_repo.increment_suggestion_count()
+    # Independent HTTP round-trips: post them side by side
+    if len(suggestions) == 1:
+        timestamps = [post(suggestions[0], db_ids[0])]
+    else:
+        workers = min(_SLACK_POST_WORKERS, len(suggestions))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            timestamps = list(pool.map(post, suggestions, db_ids))
 
-    return ts
+    ts_by_id = {db_id: ts for db_id, ts in zip(db_ids, timestamps) if ts}
+    if ts_by_id:
+        with get_session() as session:
+            SuggestionRepository(session).set_slack_ts(ts_by_id)
+    return timestamps
 
 
 def post_suggestions(client, setups: list, context: dict):
@@ -281,21 +343,24 @@ def post_suggestions(client, setups: list, context: dict):
 
     s = get_settings()
     b = get_broker()
+    capital = s.fund_size_inr
+    risk_pct = s.max_risk_per_trade_pct / 100
+    suggestions = []
     for setup in setups:
         qty = b.compute_quantity(
-            capital=s.fund_size_inr,
+            capital=capital,
             entry=setup.entry,
             stop=setup.stop_loss,
-            risk_pct=s.max_risk_per_trade_pct / 100,
+            risk_pct=risk_pct,
         )
-        post_trade_suggestion(
-            client,
+        suggestions.append(
             {
                 "setup": setup,
                 "quantity": qty,
                 "risk_inr": abs(setup.entry - setup.stop_loss) * qty,
-            },
+            }
         )
+    post_trade_suggestions(client, suggestions)
 
 
 def post_exit_alert(client, alert: dict) -> str:
@@ -303,7 +368,7 @@ def post_exit_alert(client, alert: dict) -> str:
     blocks = _exit_alert_blocks(alert)
     try:
         kwargs = dict(
-            channel=_channel(),
+            channel=_CHANNEL,
             blocks=blocks,
             text=f"Exit alert: {alert['symbol']} — {alert['reason'].replace('_', ' ')}",
         )
@@ -321,7 +386,7 @@ def post_sync_alert(client, sync_result) -> str:
     blocks = _sync_alert_blocks(sync_result)
     try:
         resp = client.chat_postMessage(
-            channel=_channel(),
+            channel=_CHANNEL,
             blocks=blocks,
             text="Broker sync: changes detected in your account",
         )
@@ -334,7 +399,7 @@ def post_sync_alert(client, sync_result) -> str:
 def post_eod_review(client, review_text: str) -> str:
     try:
         resp = client.chat_postMessage(
-            channel=_channel(),
+            channel=_CHANNEL,
             text=review_text,
             mrkdwn=True,
         )
@@ -347,7 +412,7 @@ def post_eod_review(client, review_text: str) -> str:
 def post_error(client, message: str):
     try:
         client.chat_postMessage(
-            channel=_channel(),
+            channel=_CHANNEL,
             text=f":warning: *Bot error:* {message}",
         )
     except Exception:
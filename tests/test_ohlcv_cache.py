@@ -0,0 +1,71 @@
+"""
+Tests for the whole-window cache of intraday requests.
+The broker is a stub that counts calls; files go under pytest's tmp_path.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from src.market.ohlcv_cache import CachedOHLCVProvider
+
+FROM = datetime(2026, 1, 5, 9, 15)
+TO = datetime(2026, 1, 5, 15, 30)
+
+
+class _Broker:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def get_historical_data(self, symbol, interval, from_date, to_date, exchange="NSE"):
+        self.calls.append(symbol)
+        index = pd.date_range(from_date, to_date, freq="75min")
+        return pd.DataFrame({"close": range(len(index))}, index=index, dtype=float)
+
+
+def _provider(tmp_path):
+    broker = _Broker()
+    return CachedOHLCVProvider(broker, cache_dir=str(tmp_path), max_workers=1), broker
+
+
+def test_completed_window_is_fetched_once(tmp_path):
+    provider, broker = _provider(tmp_path)
+
+    first = provider.get_historical_data("INFY", "FIVE_MINUTE", FROM, TO)
+    assert broker.calls == ["INFY"]
+    assert list((tmp_path / "windows").glob("*.parquet"))
+
+    hit = provider.get_historical_data("INFY", "FIVE_MINUTE", FROM, TO)
+    assert broker.calls == ["INFY"]
+    pd.testing.assert_frame_equal(hit, first, check_freq=False)
+
+    # Callers get their own frame, not the one held in memory
+    hit["close"] = -1.0
+    again = provider.get_historical_data("INFY", "FIVE_MINUTE", FROM, TO)
+    pd.testing.assert_frame_equal(again, first, check_freq=False)
+
+    # A different window is a different entry
+    provider.get_historical_data("INFY", "FIVE_MINUTE", FROM, TO + timedelta(days=1))
+    assert broker.calls == ["INFY", "INFY"]
+
+
+def test_window_reaching_today_is_not_cached(tmp_path):
+    provider, broker = _provider(tmp_path)
+    today = datetime.combine(date.today(), datetime.min.time())
+
+    for _ in range(2):
+        provider.get_historical_data("INFY", "FIVE_MINUTE", today, today + timedelta(hours=6))
+    assert broker.calls == ["INFY", "INFY"]
+    assert not (tmp_path / "windows").exists()
+
+
+def test_bulk_fetches_only_uncached_windows(tmp_path):
+    provider, broker = _provider(tmp_path)
+    provider.get_historical_data("INFY", "FIVE_MINUTE", FROM, TO)
+
+    frames = provider.get_historical_data_bulk(["INFY", "TCS"], "FIVE_MINUTE", FROM, TO)
+    assert broker.calls == ["INFY", "TCS"]
+    assert set(frames) == {"INFY", "TCS"}
+
+    provider.get_historical_data_bulk(["INFY", "TCS"], "FIVE_MINUTE", FROM, TO)
+    assert broker.calls == ["INFY", "TCS"]
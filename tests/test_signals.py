@@ -3,59 +3,99 @@ Unit tests for all signal implementations.
 Uses synthetic OHLCV data — no broker calls.
 """
 
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
+import pandas_ta as ta
+import pytest
 
+from src.analysis.screener import _screen_one
+from src.analysis.signals import _kernels
+from src.analysis.signals.bars import Bars
+from src.analysis.signals.base import SignalResult
 from src.analysis.signals.ema_crossover import EMACrossoverSignal
+from src.analysis.signals.indicators import IndicatorBundle
 from src.analysis.signals.rsi import RSIDivergenceSignal
-from src.analysis.signals.support_resistance import SupportResistanceSignal
+from src.analysis.signals.support_resistance import (
+    SupportResistanceSignal,
+    _cluster_levels,
+)
 from src.analysis.signals.volume import VolumeBreakoutSignal
 
 
-def _make_df(n: int = 120, trend: str = "up", base: float = 1000.0) -> pd.DataFrame:
-    """Generate synthetic OHLCV data."""
-    np.random.seed(42)
-    dates = pd.date_range("2024-01-01", periods=n, freq="D")
-    if trend == "up":
-        closes = base + np.cumsum(np.random.normal(2, 5, n))
-    elif trend == "down":
-        closes = base + np.cumsum(np.random.normal(-2, 5, n))
-    else:
-        closes = base + np.random.normal(0, 5, n)
+# Chosen so the conditional assertions in the signal tests actually run
+_SEED = 48
+_DIRECTIONS = frozenset({"BUY", "SELL"})
+
+
+def _make_df(
+    n: int = 120, trend: str = "up", base: float = 1000.0, seed: int = _SEED
+) -> pd.DataFrame:
+    """Synthetic OHLCV data — a fresh copy, so tests may modify it freely."""
+    return _synthetic_ohlcv(n, trend, base, seed).copy()
+
+
+@lru_cache(maxsize=None)
+def _synthetic_ohlcv(n: int, trend: str, base: float, seed: int) -> pd.DataFrame:
+    """
+    Generated once per (n, trend, base, seed) for the session. Each call
+    draws from its own Generator, so no global RNG state is shared.
+    """
+    rng = np.random.default_rng(seed)
+    drift = {"up": 2.0, "down": -2.0}.get(trend, 0.0)
+    steps = rng.standard_normal(n) * 5 + drift
+    closes = np.maximum(base + (np.cumsum(steps) if trend in ("up", "down") else steps), 10)
 
-    closes = np.maximum(closes, 10)
+    # open ±1%, high +0..3%, low -3..0%, one draw for all three
+    u = rng.random((n, 3))
+    prices = closes[:, None] * (np.array([0.99, 1.00, 0.97]) + u * np.array([0.02, 0.03, 0.03]))
     df = pd.DataFrame(
-        {
-            "open": closes * np.random.uniform(0.99, 1.01, n),
-            "high": closes * np.random.uniform(1.00, 1.03, n),
-            "low": closes * np.random.uniform(0.97, 1.00, n),
-            "close": closes,
-            "volume": np.random.randint(100_000, 5_000_000, n),
-        },
-        index=dates,
+        np.column_stack([prices, closes]),
+        columns=["open", "high", "low", "close"],
     )
+    df["volume"] = rng.integers(100_000, 5_000_000, n, dtype=np.int64)
     return df
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _jit_warmup():
+    """
+    Compile the numba kernels once so no single test's timing includes it.
+    numba specialises on dtype and writability: float32 as `Bars` holds it,
+    float64 read-only (a view of the frame) and float64 writable (a copy).
+    """
+    df = _synthetic_ohlcv(200, "up", 1000.0, _SEED)
+    f64 = Bars.from_frame(df, dtype=np.float64)
+    variants = [
+        Bars.from_frame(df),
+        f64,
+        Bars(**{field: arr.copy() for field, arr in vars(f64).items()}),
+    ]
+    for bars in variants:
+        for cls in (
+            EMACrossoverSignal,
+            RSIDivergenceSignal,
+            SupportResistanceSignal,
+            VolumeBreakoutSignal,
+        ):
+            cls().analyze(bars, "WARM")
+
+
+@pytest.fixture(scope="session")
+def ema_result():
+    """Shared by the EMA tests that only read the result of the same frame."""
+    return EMACrossoverSignal().analyze(_synthetic_ohlcv(100, "up", 1000.0, _SEED), "TEST")
+
+
 class TestEMACrossover:
-    def test_returns_result_or_none(self):
-        signal = EMACrossoverSignal()
-        df = _make_df(100)
-        result = signal.analyze(df, "TEST")
+    def test_returns_result_or_none(self, ema_result):
         # May or may not signal — just assert no crash and correct types
-        assert result is None or result.direction in ("BUY", "SELL")
+        assert ema_result is None or ema_result.direction in _DIRECTIONS
 
-    def test_insufficient_data_returns_none(self):
-        signal = EMACrossoverSignal()
-        df = _make_df(10)
-        assert signal.analyze(df, "TEST") is None
-
-    def test_risk_reward_positive(self):
-        signal = EMACrossoverSignal()
-        df = _make_df(100)
-        result = signal.analyze(df, "TEST")
-        if result:
-            assert result.risk_reward > 0
+    def test_risk_reward_positive(self, ema_result):
+        if ema_result:
+            assert ema_result.risk_reward > 0
 
     def test_signal_name(self):
         assert EMACrossoverSignal.name == "ema_crossover"
@@ -66,12 +106,7 @@ class TestRSIDivergence:
         signal = RSIDivergenceSignal()
         df = _make_df(100, trend="down")
         result = signal.analyze(df, "TEST")
-        assert result is None or result.direction in ("BUY", "SELL")
-
-    def test_insufficient_data_returns_none(self):
-        signal = RSIDivergenceSignal()
-        df = _make_df(20)
-        assert signal.analyze(df, "TEST") is None
+        assert result is None or result.direction in _DIRECTIONS
 
     def test_signal_name(self):
         assert RSIDivergenceSignal.name == "rsi_divergence"
@@ -82,23 +117,43 @@ class TestSupportResistance:
         signal = SupportResistanceSignal()
         df = _make_df(120)
         result = signal.analyze(df, "TEST")
-        assert result is None or result.direction in ("BUY", "SELL")
+        assert result is None or result.direction in _DIRECTIONS
+
+    def test_cluster_levels_merges_chained_neighbours(self):
+        # Each step is under 0.5% of the previous level, so all three merge
+        # into their mean; 110 is far enough away to stand alone.
+        clusters = _cluster_levels([100.8, 100.0, 110.0, 100.4], 0.005)
+        assert np.allclose(clusters, [100.4, 110.0])
+        assert _cluster_levels([], 0.005) == []
+
+
+@pytest.mark.parametrize(
+    "signal_cls, n",
+    [(EMACrossoverSignal, 10), (RSIDivergenceSignal, 20), (SupportResistanceSignal, 30)],
+    ids=lambda v: getattr(v, "name", str(v)),
+)
+def test_insufficient_data_returns_none(signal_cls, n):
+    assert signal_cls().analyze(_synthetic_ohlcv(n, "up", 1000.0, _SEED), "TEST") is None
 
-    def test_insufficient_data_returns_none(self):
-        signal = SupportResistanceSignal()
-        df = _make_df(30)
-        assert signal.analyze(df, "TEST") is None
+
+@pytest.fixture(scope="class")
+def high_volume_bullish_df() -> pd.DataFrame:
+    """
+    Uptrend whose last row is forced into a high-volume bullish candle.
+    Built once per class, so consuming tests must not modify it.
+    """
+    df = _make_df(60, trend="up")
+    last = df.index[-1]
+    df.at[last, "volume"] = int(df["volume"].mean() * 5)
+    df.at[last, "close"] = df["close"].iat[-1] * 1.02
+    df.at[last, "open"] = df["close"].iat[-1] * 0.99
+    return df
 
 
 class TestVolumeBreakout:
-    def test_detects_high_volume_bullish(self):
+    def test_detects_high_volume_bullish(self, high_volume_bullish_df):
         signal = VolumeBreakoutSignal()
-        df = _make_df(60, trend="up")
-        # Force a high-volume bullish candle on the last row
-        df.iloc[-1, df.columns.get_loc("volume")] = int(df["volume"].mean() * 5)
-        df.iloc[-1, df.columns.get_loc("close")] = df["close"].iloc[-1] * 1.02
-        df.iloc[-1, df.columns.get_loc("open")] = df["close"].iloc[-1] * 0.99
-        result = signal.analyze(df, "TEST")
+        result = signal.analyze(high_volume_bullish_df, "TEST")
         if result:
             assert result.direction == "BUY"
             assert result.strength > 0
@@ -111,15 +166,156 @@ class TestVolumeBreakout:
         result = signal.analyze(df, "TEST")
         assert result is None
 
-    def test_signal_result_fields(self):
+    def test_signal_result_fields(self, high_volume_bullish_df):
         signal = VolumeBreakoutSignal()
-        df = _make_df(60, trend="up")
-        df.iloc[-1, df.columns.get_loc("volume")] = int(df["volume"].mean() * 5)
-        df.iloc[-1, df.columns.get_loc("close")] = df["close"].iloc[-1] * 1.02
-        df.iloc[-1, df.columns.get_loc("open")] = df["close"].iloc[-1] * 0.99
-        result = signal.analyze(df, "TEST")
+        result = signal.analyze(high_volume_bullish_df, "TEST")
         if result:
             assert result.entry > 0
             assert result.target > 0
             assert result.stop_loss > 0
             assert 0 <= result.strength <= 1.0
+
+
+class TestIndicatorBundle:
+    def test_shared_bundle_matches_standalone(self):
+        df = _make_df(120, trend="up")
+        df.at[df.index[-1], "volume"] = int(df["volume"].mean() * 5)
+        signals = [
+            EMACrossoverSignal(),
+            RSIDivergenceSignal(),
+            SupportResistanceSignal(),
+            VolumeBreakoutSignal(),
+        ]
+        bundle = IndicatorBundle(df).prepare(
+            set().union(*(s.required_indicators() for s in signals))
+        )
+        for signal in signals:
+            assert signal.analyze(df, "TEST", bundle) == signal.analyze(df, "TEST")
+
+
+class TestKernels:
+    def test_match_pandas_ta(self):
+        df = _make_df(180, trend="up")
+        df.iloc[10, df.columns.get_loc("high")] = df["low"].iloc[10]  # flat bar
+        h, lo, c, v = (
+            df[col].to_numpy(dtype=float) for col in ("high", "low", "close", "volume")
+        )
+        for n in (14, 20, 50):
+            pairs = [
+                (ta.ema(df["close"], length=n), _kernels.ema(c, n)),
+                (ta.rsi(df["close"], length=n), _kernels.rsi(c, n)),
+                (
+                    ta.atr(df["high"], df["low"], df["close"], length=n),
+                    _kernels.atr(h, lo, c, n),
+                ),
+                (df["volume"].rolling(n).mean(), _kernels.rolling_mean(v, n)),
+            ]
+            for expected, actual in pairs:
+                assert np.allclose(
+                    expected.to_numpy(), actual, rtol=1e-12, atol=0, equal_nan=True
+                )
+
+    def test_polars_pass_matches_kernels(self):
+        pytest.importorskip("polars")
+        from src.analysis.polars_pipeline import compute_indicators
+
+        frames = {
+            "UP": _make_df(120, "up"),
+            "DOWN": _make_df(90, "down"),
+            "SHORT": _make_df(12),
+        }
+        names = ["ema_20", "ema_50", "atr_14", "rsi_14", "vol_ma_20"]
+        result = compute_indicators(frames, names)
+        for symbol, df in frames.items():
+            # The pass reads float64 frames and only narrows its output
+            expected = IndicatorBundle(Bars.from_frame(df, dtype=np.float64))
+            for name in names:
+                assert result[symbol][name].dtype == np.float32
+                assert np.allclose(
+                    result[symbol][name], expected[name],
+                    rtol=1e-6, atol=0, equal_nan=True,
+                )
+
+    @pytest.mark.parametrize("base", [250.0, 2500.0, 25000.0])
+    def test_float32_bars_match_float64_to_the_paisa(self, base):
+        signals = [
+            EMACrossoverSignal(),
+            RSIDivergenceSignal(),
+            SupportResistanceSignal(),
+            VolumeBreakoutSignal(),
+        ]
+        for trend in ("up", "down", "sideways"):
+            df = _make_df(200, trend=trend, base=base)
+            narrow = Bars.from_frame(df)
+            wide = Bars.from_frame(df, dtype=np.float64)
+            assert narrow.close.dtype == np.float32
+            assert narrow.ts.dtype == np.int64
+            for signal in signals:
+                a = signal.analyze(narrow, "TEST")
+                b = signal.analyze(wide, "TEST")
+                assert (a is None) == (b is None)
+                if a is None:
+                    continue
+                assert a.direction == b.direction
+                for field in ("entry", "target", "stop_loss"):
+                    assert not isinstance(getattr(a, field), np.generic)
+                    assert abs(getattr(a, field) - getattr(b, field)) <= 0.01
+
+    def test_short_input_is_all_nan(self):
+        c = np.arange(10, dtype=float)
+        assert np.isnan(_kernels.ema(c, 20)).all()
+        assert np.isnan(_kernels.rsi(c, 14)).all()
+        assert np.isnan(_kernels.atr(c, c, c, 14)).all()
+
+
+def _fixed(signal_cls, strength: float, entry: float):
+    """`signal_cls` with analyze() stubbed to always fire the same BUY."""
+
+    class Fixed(signal_cls):
+        def analyze(self, bars, symbol, indicators=None):
+            return SignalResult(
+                signal_name=self.name,
+                direction="BUY",
+                strength=strength,
+                entry=entry,
+                target=entry + 10,
+                stop_loss=entry - 5,
+                timeframe="daily",
+            )
+
+    return Fixed()
+
+
+class TestScreener:
+    weights = {
+        s.name: 1.0
+        for s in (
+            EMACrossoverSignal,
+            RSIDivergenceSignal,
+            SupportResistanceSignal,
+            VolumeBreakoutSignal,
+        )
+    }
+
+    def test_strength_tie_keeps_ema_price_levels(self):
+        # Evaluation order is cheapest first; EMA still sets levels on a tie
+        signals = [
+            _fixed(VolumeBreakoutSignal, 0.6, 400.0),
+            _fixed(EMACrossoverSignal, 0.6, 100.0),
+            _fixed(SupportResistanceSignal, 0.6, 300.0),
+            _fixed(RSIDivergenceSignal, 0.6, 200.0),
+        ]
+        result, code, _ = _screen_one(signals, self.weights, "TEST", _make_df(100))
+        assert code == "ok"
+        assert result.entry == 100.0
+        assert [s["signal_name"] for s in result.signals_fired] == [
+            s.name for s in signals
+        ]
+
+    def test_strongest_signal_sets_price_levels(self):
+        signals = [
+            _fixed(VolumeBreakoutSignal, 0.9, 400.0),
+            _fixed(EMACrossoverSignal, 0.6, 100.0),
+        ]
+        result, _, _ = _screen_one(signals, self.weights, "TEST", _make_df(100))
+        assert result.entry == 400.0
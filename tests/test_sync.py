@@ -0,0 +1,148 @@
+"""
+Tests for run_sync's single-flight and reuse window.
+The broker reconciliation itself is replaced, so no broker or DB is needed.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.broker import sync
+from src.broker.sync import SyncResult, run_sync
+
+
+def _result(balance: float = 100_000.0) -> SyncResult:
+    return SyncResult(
+        new_positions=[{"symbol": "INFY"}],
+        closed_positions=[{"symbol": "TCS"}],
+        fund_balance_inr=balance,
+        fund_change_inr=5_000.0,
+        errors=["partial quote failure"],
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock for the reuse window; advance with clock[0] += s."""
+    now = [1_000.0]
+    monkeypatch.setattr(sync, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(sync, "_sync_inflight", {})
+    monkeypatch.setattr(sync, "_last_sync", {})
+
+
+def _stub_sync(monkeypatch, impl):
+    calls = []
+
+    def fake(broker, session, last_known_balance):
+        calls.append(broker)
+        return impl()
+
+    monkeypatch.setattr(sync, "_run_sync", fake)
+    return calls
+
+
+def test_joiner_shares_the_leaders_sync(monkeypatch, clock):
+    release = threading.Event()
+    leader_result = _result()
+
+    def slow():
+        release.wait(5)
+        return leader_result
+
+    calls = _stub_sync(monkeypatch, slow)
+    # Without a reuse window, only joining the in-flight sync gives one call
+    monkeypatch.setattr(sync, "_SYNC_FRESH_SECONDS", 0)
+    broker = object()
+    results = {}
+    leader = threading.Thread(
+        target=lambda: results.setdefault("leader", run_sync(broker, None))
+    )
+    leader.start()
+    while not sync._sync_inflight:
+        time.sleep(0.001)
+    joiner = threading.Thread(
+        target=lambda: results.setdefault("joiner", run_sync(broker, None))
+    )
+    joiner.start()
+    joiner.join(0.2)  # parks on the leader's future
+    release.set()
+    leader.join(5)
+    joiner.join(5)
+
+    assert len(calls) == 1
+    assert results["leader"] is leader_result
+    shared = results["joiner"]
+    # Changes are reported once, by the leader; joiners only see the balance
+    assert shared.new_positions == [] and shared.closed_positions == []
+    assert shared.fund_change_inr == 0.0
+    assert shared.fund_balance_inr == leader_result.fund_balance_inr
+    assert shared.errors == leader_result.errors
+    assert not sync._sync_inflight
+
+
+def test_leader_exception_reaches_joiners_and_clears_inflight(monkeypatch, clock):
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ConnectionError("broker down")
+
+    calls = _stub_sync(monkeypatch, failing)
+    broker = object()
+    errors = {}
+
+    def call(name):
+        try:
+            run_sync(broker, None)
+        except ConnectionError as e:
+            errors[name] = e
+
+    leader = threading.Thread(target=call, args=("leader",))
+    leader.start()
+    while not sync._sync_inflight:
+        time.sleep(0.001)
+    joiner = threading.Thread(target=call, args=("joiner",))
+    joiner.start()
+    joiner.join(0.2)
+    release.set()
+    leader.join(5)
+    joiner.join(5)
+
+    assert len(calls) == 1
+    assert errors["joiner"] is errors["leader"]
+    # A failed sync is neither in flight nor reused
+    assert not sync._sync_inflight and not sync._last_sync
+    with pytest.raises(ConnectionError):
+        run_sync(broker, None)
+    assert len(calls) == 2
+
+
+def test_recent_sync_is_reused_within_the_window(monkeypatch, clock):
+    results = iter([_result(100_000.0), _result(110_000.0), _result(120_000.0)])
+    calls = _stub_sync(monkeypatch, lambda: next(results))
+    broker = object()
+
+    first = run_sync(broker, None)
+    assert first.new_positions
+
+    clock[0] += sync._SYNC_FRESH_SECONDS - 1
+    reused = run_sync(broker, None)
+    assert len(calls) == 1
+    assert reused.new_positions == [] and reused.fund_change_inr == 0.0
+    assert reused.fund_balance_inr == 100_000.0
+
+    # Another broker object has its own window
+    run_sync(object(), None)
+    assert len(calls) == 2
+
+    clock[0] += 1
+    fresh = run_sync(broker, None)
+    assert len(calls) == 3
+    assert fresh.new_positions and fresh.fund_balance_inr == 120_000.0